@@ -0,0 +1,12 @@
+# ============================================================
+#       SUÍTE DE BENCHMARKS DO GERENCIADOR DE ESTOQUES
+# ============================================================
+#
+# python -m benchmarks [--escala pequena|media|grande] [--saida resultados.json]
+#     gera (ou reaproveita do cache) um banco sintético determinístico, roda os
+#     cenários de cenarios.py e grava os tempos em JSON.
+#
+# python -m benchmarks.comparar antes.json depois.json
+#     compara dois resultados (ex.: de dois commits).
+#
+# Os scripts bench_*.py desta pasta são benchmarks pontuais de cada mudança.
@@ -0,0 +1,145 @@
+# ============================================================
+#          EXECUTOR DA SUÍTE DE BENCHMARKS (JSON)
+# ============================================================
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco, esquema  # noqa: E402
+from benchmarks import cenarios, gerador  # noqa: E402
+
+PASTA_CACHE = os.path.join(tempfile.gettempdir(), "estoque_bench_cache")
+
+
+def banco_gerado(escala, semente, regerar=False):
+
+    #Caminho do banco sintético para esta escala/semente/versão do esquema,
+    #gerando-o (uma vez) se ainda não estiver no cache.
+
+    chave = "_".join(str(escala[c]) for c in sorted(escala))
+    caminho = os.path.join(PASTA_CACHE, f"estoque_v{esquema.VERSAO_ESQUEMA}_{chave}_s{semente}.db")
+
+    if os.path.exists(caminho) and not regerar:
+        return caminho
+
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    provisorio = caminho + ".gerando"
+    if os.path.exists(provisorio):
+        os.remove(provisorio)
+
+    print(f"Gerando banco sintético {escala} ...", file=sys.stderr)
+    t0 = time.perf_counter()
+    usar_banco(provisorio)
+    conn = banco.conexao()
+    contagens = gerador.gerar(conn, semente=semente, **escala)
+    banco.fechar_conexoes()
+    os.replace(provisorio, caminho)
+    print(f"  {contagens} em {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+
+    return caminho
+
+
+def usar_banco(caminho):
+    banco.configurar_banco(caminho)
+
+
+def medir(funcao, ctx, repeticoes, aquecimento=2):
+    for _ in range(aquecimento):
+        funcao(ctx)
+
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao(ctx)
+        tempos.append((time.perf_counter() - t0) * 1000)
+
+    tempos.sort()
+    return {
+        "repeticoes": repeticoes,
+        "min_ms": round(tempos[0], 4),
+        "mediana_ms": round(statistics.median(tempos), 4),
+        "p95_ms": round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))], 4),
+        "media_ms": round(statistics.fmean(tempos), 4),
+    }
+
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Suíte de benchmarks")
+    parser.add_argument("--escala", choices=sorted(gerador.ESCALAS), default="pequena")
+    for campo in gerador.ESCALAS["pequena"]:
+        parser.add_argument(f"--{campo.replace('_', '-')}", type=int, dest=campo, help="sobrescreve a escala")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--repeticoes", type=int, default=30)
+    parser.add_argument("--cenarios", nargs="+", help="roda só estes cenários")
+    parser.add_argument("--saida", help="arquivo JSON de resultados (padrão: imprime na tela)")
+    parser.add_argument("--regerar", action="store_true", help="ignora o banco em cache")
+    args = parser.parse_args()
+
+    escala = dict(gerador.ESCALAS[args.escala])
+    for campo in escala:
+        if getattr(args, campo) is not None:
+            escala[campo] = getattr(args, campo)
+
+    origem = banco_gerado(escala, args.semente, args.regerar)
+
+    # Cada execução mede uma cópia, para começar sempre do mesmo estado
+    trabalho = os.path.join(_pasta, "trabalho.db")
+    shutil.copyfile(origem, trabalho)
+    usar_banco(trabalho)
+
+    ctx = cenarios.Contexto(args.semente)
+    resultados = {}
+    for nome, funcao in cenarios.CENARIOS.items():
+        if args.cenarios and nome not in args.cenarios:
+            continue
+        resultados[nome] = medir(funcao, ctx, args.repeticoes)
+        print(f"{nome:<34} mediana {resultados[nome]['mediana_ms']:>10.3f} ms   "
+              f"p95 {resultados[nome]['p95_ms']:>10.3f} ms", file=sys.stderr)
+
+    saida = {
+        "meta": {
+            "commit": commit_atual(),
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "versao_esquema": esquema.VERSAO_ESQUEMA,
+            "escala": escala,
+            "semente": args.semente,
+        },
+        "cenarios": resultados,
+    }
+
+    texto = json.dumps(saida, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+    banco.fechar_conexoes()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,78 @@
+# ============================================================
+#   BENCHMARK: ANÁLISE DE VENDAS COM 1, 2, 4 ... N PROCESSOS
+# ============================================================
+#
+# Gera um banco sintético (gerador.py) e roda analisar_vendas sobre todo o
+# histórico com cada número de processos, conferindo que o resultado é o
+# mesmo da execução com um processo só. Mostra o tempo e o ganho (speedup)
+# em relação a 1 processo.
+#
+# Uso:  python benchmarks/bench_analise.py [--escala media] [--processos 1 2 4 8] [--repeticoes 3]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco  # noqa: E402
+from estoque.analise import analisar_vendas  # noqa: E402
+from benchmarks import gerador  # noqa: E402
+
+
+def preparar(escala):
+    banco.configurar_banco(os.path.join(_pasta, "bench_analise.db"))
+    conn = banco.conexao()
+    contagens = gerador.gerar(conn, **gerador.ESCALAS[escala])
+    banco.fechar_conexoes()
+    return contagens
+
+
+def medir(processos, repeticoes):
+
+    #Melhor tempo de "repeticoes" execuções (o pool é criado a cada uma, como no menu).
+
+    melhor, resultado = None, None
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        resultado = analisar_vendas(processos=processos)
+        duracao = time.perf_counter() - t0
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    return melhor, resultado
+
+
+def main_bench():
+    nucleos = os.cpu_count() or 1
+    padrao = sorted({1, *(n for n in (2, 4, 8, 16) if n < nucleos), nucleos})
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--escala", choices=gerador.ESCALAS, default="media")
+    parser.add_argument("--processos", type=int, nargs="+", default=padrao)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Gerando banco ({args.escala}) ...")
+    print(f"  {preparar(args.escala)}")
+
+    base = referencia = None
+    print(f"\n{'Processos':>9} | {'Tempo (s)':>9} | {'Speedup':>7} | {'Fatias':>6} | Confere")
+    for processos in args.processos:
+        duracao, resultado = medir(processos, args.repeticoes)
+        if referencia is None:
+            base, referencia = duracao, resultado
+        confere = (resultado.num_vendas == referencia.num_vendas
+                   and resultado.quantidade == referencia.quantidade
+                   and resultado.receita == referencia.receita
+                   and [p[0] for p in resultado.mais_vendidos()] == [p[0] for p in referencia.mais_vendidos()])
+        print(f"{processos:>9} | {duracao:>9.3f} | {base / duracao:>6.2f}x | {resultado.fatias:>6} | {'sim' if confere else 'NÃO'}")
+
+    banco.fechar_conexoes()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,166 @@
+# ============================================================
+#   BENCHMARK: LATÊNCIA DAS VENDAS DURANTE O BACKUP ONLINE
+# ============================================================
+#
+# Gera um banco sintético (gerador.py) ou usa um já existente (--banco) e
+# registra vendas num ritmo fixo (--taxa por segundo), medindo a latência de
+# cada uma:
+#
+#   1. sem backup, por --segundos (depois de alguns segundos de aquecimento)
+#   2. durante um backup (estoque.backup) para cada configuração de
+#      "páginas:pausa" (-1:0 copia tudo num passo só)
+#
+# --lastro-gb acrescenta uma tabela de blobs aleatórios para o arquivo chegar
+# a alguns GB sem gerar anos de vendas. A última cópia é descomprimida e
+# conferida com integrity_check no fim.
+#
+# Atenção: com --banco as vendas do benchmark ficam gravadas nesse arquivo.
+#
+# Uso:  python benchmarks/bench_backup.py [--escala grande] [--lastro-gb 2] [--taxa 100]
+#                                         [--configs -1:0 1024:0.005 256:0.02]
+
+import argparse
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco  # noqa: E402
+from estoque.backup import PAGINAS_POR_PASSO, PAUSA_PASSO, Backup, verificar_backup  # noqa: E402
+from estoque.vendas import vender_itens  # noqa: E402
+from benchmarks import gerador  # noqa: E402
+
+# Produtos usados nas vendas (com estoque de sobra)
+PRODUTOS_VENDIDOS = 500
+
+# Segundos de vendas antes de medir
+AQUECIMENTO = 3
+
+# Tamanho de cada blob do lastro (bytes)
+TAMANHO_BLOB = 3000
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def inflar(conn, gb):
+
+    #Acrescenta ~gb GB de blobs aleatórios (incomprimíveis: o pior caso do gzip).
+
+    linhas = int(gb * 1e9 / TAMANHO_BLOB)
+    conn.execute("CREATE TABLE IF NOT EXISTS bench_lastro (dados BLOB)")
+    for inicio in range(0, linhas, 100_000):
+        conn.executemany("INSERT INTO bench_lastro VALUES (randomblob(?))",
+                         ((TAMANHO_BLOB,) for _ in range(min(100_000, linhas - inicio))))
+        conn.commit()
+
+
+def vender_ate(parar, taxa, ids, rnd):
+
+    #Uma venda a cada 1/taxa segundos até parar() ser verdadeiro. Retorna as latências (s).
+
+    latencias = []
+    intervalo = 1 / taxa
+    proxima = time.perf_counter()
+    while not parar():
+        t0 = time.perf_counter()
+        vender_itens([(rnd.choice(ids), 1) for _ in range(rnd.randint(1, 3))], "pix", "Cliente 1")
+        latencias.append(time.perf_counter() - t0)
+
+        proxima += intervalo
+        espera = proxima - time.perf_counter()
+        if espera > 0:
+            time.sleep(espera)
+        else:
+            proxima = time.perf_counter()     # atrasado: não acumula vendas em rajada
+    return latencias
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Latência das vendas durante o backup online")
+    parser.add_argument("--escala", choices=gerador.ESCALAS, default="grande")
+    parser.add_argument("--banco", help="usa este banco em vez de gerar um")
+    parser.add_argument("--lastro-gb", type=float, default=0, help="GB de blobs acrescentados ao banco")
+    parser.add_argument("--taxa", type=float, default=100, help="vendas por segundo")
+    parser.add_argument("--segundos", type=float, default=10, help="duração da medição sem backup")
+    parser.add_argument("--configs", nargs="+", default=["-1:0", f"{PAGINAS_POR_PASSO}:{PAUSA_PASSO}", "256:0.02"],
+                        help="páginas:pausa de cada backup medido")
+    args = parser.parse_args()
+
+    if args.banco:
+        banco.configurar_banco(args.banco)
+        conn = banco.conexao()
+    else:
+        banco.configurar_banco(os.path.join(_pasta, "bench_backup.db"))
+        conn = banco.conexao()
+        print(f"Gerando banco ({args.escala}) ...")
+        t0 = time.perf_counter()
+        print(f"  {gerador.gerar(conn, **gerador.ESCALAS[args.escala])} em {time.perf_counter() - t0:.1f}s")
+
+    if args.lastro_gb:
+        print(f"Acrescentando {args.lastro_gb} GB de lastro ...")
+        inflar(conn, args.lastro_gb)
+
+    ids = [linha[0] for linha in conn.execute("SELECT id FROM produtos ORDER BY id LIMIT ?", (PRODUTOS_VENDIDOS,))]
+    conn.execute(f"UPDATE produtos SET quantidade = 1000000 WHERE id IN ({', '.join(map(str, ids))})")
+    conn.commit()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    tamanho = os.path.getsize(banco.DB_FILE)
+    print(f"Banco: {banco.DB_FILE} ({tamanho / 1e9:.2f} GB), vendas a {args.taxa:.0f}/s")
+
+    rnd = random.Random(42)
+    copias = os.path.join(_pasta, "copias")
+    resultados = []
+
+    # Aquecimento: catálogo em memória e páginas dos índices no cache
+    fim = time.perf_counter() + AQUECIMENTO
+    vender_ate(lambda: time.perf_counter() > fim, args.taxa, ids, rnd)
+
+    fim = time.perf_counter() + args.segundos
+    resultados.append(("sem backup", vender_ate(lambda: time.perf_counter() > fim, args.taxa, ids, rnd), None))
+
+    ultimo = None
+    for config in args.configs:
+        paginas, pausa = config.split(":")
+        backup = Backup(copias, int(paginas), float(pausa), guardar=1)
+        latencias = vender_ate(lambda: not backup.em_andamento(), args.taxa, ids, rnd)
+        r = backup.aguardar()
+        wal = os.path.getsize(banco.DB_FILE + "-wal") if os.path.exists(banco.DB_FILE + "-wal") else 0
+        resultados.append((f"backup {config}", latencias, (r, wal)))
+        ultimo = r["arquivo"]
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    print(f"\n{'Execução':<22} | {'Vendas':>6} | {'p50 ms':>7} | {'p99 ms':>7} | {'Máx ms':>7} | "
+          f"{'Cópia (s)':>9} | {'Total (s)':>9} | {'Reinícios':>9} | {'WAL (MB)':>8} | {'.gz (MB)':>8}")
+    print("-" * 122)
+    for nome, latencias, backup in resultados:
+        p50, p99, maximo = (percentil(latencias, p) * 1000 for p in (50, 99, 100))
+        linha = f"{nome:<22} | {len(latencias):>6} | {p50:>7.2f} | {p99:>7.2f} | {maximo:>7.2f} | "
+        if backup is None:
+            linha += f"{'-':>9} | {'-':>9} | {'-':>9} | {'-':>8} | {'-':>8}"
+        else:
+            r, wal = backup
+            linha += f"{r['segundos_copia']:>9.1f} | {r['segundos']:>9.1f} | {r['reinicios']:>9} | {wal / 1e6:>8.1f} | {r['bytes'] / 1e6:>8.1f}"
+        print(linha)
+
+    if ultimo:
+        t0 = time.perf_counter()
+        v = verificar_backup(ultimo)
+        estado = "íntegra" if v["ok"] else f"COM DEFEITO: {v['erros'][:3]}"
+        print(f"\nÚltima cópia {estado} (verificada em {time.perf_counter() - t0:.1f}s)")
+
+    banco.fechar_conexoes()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,78 @@
+# ============================================================
+#      BENCHMARK: VENDA ITEM A ITEM x CARRINHO NUMA TRANSAÇÃO
+# ============================================================
+#
+# Compara um checkout de N itens feito como N vendas separadas (um commit,
+# e portanto um fsync, por item: o caminho antigo do registrar_venda) com a
+# mesma compra numa única chamada de vender_itens (um commit só).
+#
+# Uso:  python benchmarks/bench_carrinho.py [--itens 30] [--checkouts 20]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco, vendas  # noqa: E402
+
+
+def preparar(itens):
+
+    #Cadastra produtos com estoque de sobra para todos os checkouts.
+
+    conn = banco.conexao()
+    conn.executemany(
+        "INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Bench {i}", 990, 500, 10_000_000, 1.0, "Bench") for i in range(itens)],
+    )
+    conn.commit()
+    return [linha[0] for linha in conn.execute("SELECT id FROM produtos WHERE marca = 'Bench' ORDER BY id")]
+
+
+def item_a_item(ids):
+    for pid in ids:
+        vendas.vender_itens([(pid, 1)], "pix", "bench")
+
+
+def carrinho(ids):
+    vendas.vender_itens([(pid, 1) for pid in ids], "pix", "bench")
+
+
+def medir(funcao, ids, checkouts):
+    t0 = time.perf_counter()
+    for _ in range(checkouts):
+        funcao(ids)
+    return (time.perf_counter() - t0) / checkouts
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Venda item a item x carrinho")
+    parser.add_argument("--itens", type=int, default=30)
+    parser.add_argument("--checkouts", type=int, default=20)
+    args = parser.parse_args()
+
+    banco.configurar_banco(os.path.join(_pasta, "bench.db"))
+    ids = preparar(args.itens)
+
+    # Aquecimento
+    carrinho(ids)
+
+    por_item = medir(item_a_item, ids, args.checkouts)
+    unico = medir(carrinho, ids, args.checkouts)
+
+    print(f"Checkout com {args.itens} itens ({args.checkouts} repetições, banco em {banco.DB_FILE}):")
+    print(f"  item a item (1 commit por item): {por_item * 1000:8.2f} ms/checkout")
+    print(f"  carrinho (1 commit):             {unico * 1000:8.2f} ms/checkout")
+    print(f"  ganho: {por_item / unico:.1f}x")
+
+    banco.fechar_conexoes()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
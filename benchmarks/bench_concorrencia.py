@@ -0,0 +1,122 @@
+# ============================================================
+#   BENCHMARK: VENDAS POR SEGUNDO COM VÁRIOS TERMINAIS AO MESMO TEMPO
+# ============================================================
+#
+# Simula N terminais de caixa (um processo cada) vendendo no mesmo arquivo,
+# enquanto um processo leitor roda um relatório pesado sem parar. Mede as
+# vendas por segundo e as falhas "database is locked" com o journal
+# tradicional (DELETE) e com WAL, para 1, 2, 4, ... escritores.
+#
+# Uso:  python benchmarks/bench_concorrencia.py [--escritores 1 2 4 8] [--segundos 5]
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco  # noqa: E402
+from estoque.vendas import vender_itens  # noqa: E402
+
+PRODUTOS = 500
+
+
+def preparar(modo, historico):
+
+    #Cria um banco novo no modo de journal pedido, com produtos e um histórico
+    #de vendas para o relatório do leitor ter o que somar.
+
+    banco.configurar_banco(os.path.join(_pasta, f"bench_{modo.lower()}.db"))
+    banco.MODO_JOURNAL = modo
+
+    conn = banco.conexao()
+    conn.executemany(
+        "INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Bench {i}", 990, 500, 10_000_000, 1.0, "Bench") for i in range(PRODUTOS)],
+    )
+    conn.executemany("""
+        INSERT INTO vendas (produto_id, nome_produto, quantidade, data, unitario_centavos, total_centavos, forma_pagamento, consumidor)
+        VALUES (?, 'Bench', 1, '2024-01-01 00:00:00', 990, 990, 'pix', 'bench')
+    """, ((i % PRODUTOS + 1,) for i in range(historico)))
+    conn.commit()
+    banco.fechar_conexoes()
+
+
+def escritor(fim, resultados):
+    rnd = random.Random(os.getpid())
+    vendas = falhas = 0
+    while time.time() < fim:
+        try:
+            vender_itens([(rnd.randint(1, PRODUTOS), 1)], "pix", "bench")
+            vendas += 1
+        except sqlite3.OperationalError:
+            falhas += 1
+    resultados.put((vendas, falhas))
+
+
+def leitor(fim, resultados):
+    relatorios = 0
+    while time.time() < fim:
+        banco.conexao_leitura().execute(
+            "SELECT produto_id, SUM(total_centavos) FROM vendas GROUP BY produto_id"
+        ).fetchall()
+        relatorios += 1
+    resultados.put(relatorios)
+
+
+def rodada(escritores, segundos, com_leitor):
+    fim = time.time() + segundos
+    fila_escrita = multiprocessing.Queue()
+    fila_leitura = multiprocessing.Queue()
+
+    processos = [multiprocessing.Process(target=escritor, args=(fim, fila_escrita)) for _ in range(escritores)]
+    if com_leitor:
+        processos.append(multiprocessing.Process(target=leitor, args=(fim, fila_leitura)))
+
+    for p in processos:
+        p.start()
+
+    vendas = falhas = 0
+    for _ in range(escritores):
+        v, f = fila_escrita.get()
+        vendas += v
+        falhas += f
+    relatorios = fila_leitura.get() if com_leitor else 0
+
+    for p in processos:
+        p.join()
+
+    return vendas / segundos, falhas, relatorios
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Vendas/s com vários escritores")
+    parser.add_argument("--escritores", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--historico", type=int, default=200_000, help="vendas pré-existentes")
+    parser.add_argument("--sem-leitor", action="store_true", help="não roda o relatório concorrente")
+    args = parser.parse_args()
+
+    # fork: os filhos herdam o módulo e abrem as próprias conexões
+    multiprocessing.set_start_method("fork")
+
+    print(f"{'Journal':<8} | {'Escritores':>10} | {'Vendas/s':>10} | {'Falhas':>7} | Relatórios")
+    print("-" * 58)
+    for modo in ("DELETE", "WAL"):
+        preparar(modo, args.historico)
+        for n in args.escritores:
+            por_segundo, falhas, relatorios = rodada(n, args.segundos, not args.sem_leitor)
+            print(f"{modo:<8} | {n:>10} | {por_segundo:>10.1f} | {falhas:>7} | {relatorios}")
+
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,164 @@
+# ============================================================
+#   BENCHMARK: SOMA DE VALORES EM REAL x CENTAVOS (INTEGER) x VETORES
+# ============================================================
+#
+# Gera um banco temporário na versão 9 do esquema (valores em reais, REAL),
+# com um histórico sintético de vendas, e mede a receita e o custo por
+# produto e o total geral:
+#
+#   1. SUM do SQLite sobre as colunas REAL
+#   2. SUM do SQLite sobre as colunas em centavos (depois da migração 10)
+#   3. leitura em blocos + soma vetorizada (dinheiro.somar_por_produto;
+#      numpy se instalado, senão o mesmo laço em Python)
+#
+# Cada total é comparado com o valor exato (soma em inteiros feita na geração):
+# a coluna "Diferença" mostra quanto a soma em REAL derivou.
+#
+# Uso:  python benchmarks/bench_dinheiro.py [--linhas 1000000] [--produtos 2000] [--repeticoes 3]
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import esquema  # noqa: E402
+from estoque.dinheiro import reais, somar_por_produto  # noqa: E402
+
+# Versão do esquema com os valores ainda em REAL
+VERSAO_REAL = 9
+
+CONSULTA_REAL = """
+    SELECT produto_id, COUNT(*), SUM(quantidade), SUM(valor_total), SUM(quantidade * COALESCE(custo_unitario, 0))
+    FROM vendas GROUP BY produto_id
+"""
+
+CONSULTA_CENTAVOS = """
+    SELECT produto_id, COUNT(*), SUM(quantidade), SUM(total_centavos), SUM(quantidade * COALESCE(custo_centavos, 0))
+    FROM vendas GROUP BY produto_id
+"""
+
+CONSULTA_VETORIZADA = """
+    SELECT produto_id, quantidade, total_centavos, quantidade * COALESCE(custo_centavos, 0) FROM vendas
+"""
+
+
+def gerar_historico(conn, linhas, produtos):
+
+    #Preenche produtos e vendas em reais (semente fixa), como o programa
+    #gravava antes da migração 10. Retorna (receita, custo) exatos em centavos.
+
+    rnd = random.Random(42)
+    inicio = datetime(2020, 1, 1)
+    segundos = 3 * 365 * 24 * 3600
+
+    custos = [rnd.randint(100, 6000) for _ in range(produtos)]
+    precos = [round(c * rnd.uniform(1.2, 1.8)) for c in custos]
+    conn.executemany(
+        "INSERT INTO produtos (nome, valor_venda, valor_custo, quantidade, peso, marca) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"Produto {i}", precos[i] / 100, custos[i] / 100, 100, 1.0, "Marca") for i in range(produtos)),
+    )
+
+    exato = [0, 0]
+
+    def vendas():
+        for _ in range(linhas):
+            i = rnd.randrange(produtos)
+            qtd = rnd.randint(1, 5)
+            exato[0] += precos[i] * qtd
+            exato[1] += custos[i] * qtd
+            data = (inicio + timedelta(seconds=rnd.randrange(segundos))).strftime("%Y-%m-%d %H:%M:%S")
+            valor = precos[i] / 100
+            yield (i + 1, f"Produto {i + 1}", qtd, data, valor, valor * qtd, "pix", "Cliente")
+
+    conn.executemany("""
+        INSERT INTO vendas (produto_id, nome_produto, quantidade, data, valor_unitario, valor_total, forma_pagamento, consumidor)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, vendas())
+    conn.commit()
+    return tuple(exato)
+
+
+def medir(funcao, repeticoes):
+
+    #Melhor tempo de "repeticoes" execuções e o último resultado.
+
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor, resultado
+
+
+def somar_sql(conn, sql):
+    return {linha[0]: list(linha[1:]) for linha in conn.execute(sql)}
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Somas de valores em REAL, em centavos e vetorizadas")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="vendas geradas")
+    parser.add_argument("--produtos", type=int, default=2000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    caminho = os.path.join(_pasta, "bench_dinheiro.db")
+    conn = sqlite3.connect(caminho)
+
+    # Gera na versão 1 (sem triggers) e migra até a 9: os resumos são calculados de uma vez
+    esquema.migrar(conn, alvo=1)
+    print(f"Gerando {args.linhas:,} vendas em {caminho} ...")
+    t0 = time.perf_counter()
+    receita_exata, custo_exato = gerar_historico(conn, args.linhas, args.produtos)
+    esquema.migrar(conn, alvo=VERSAO_REAL)
+    print(f"  gerado em {time.perf_counter() - t0:.1f}s")
+
+    resultados = {}
+    resultados["SQL SUM sobre REAL"] = medir(lambda: somar_sql(conn, CONSULTA_REAL), args.repeticoes)
+
+    t0 = time.perf_counter()
+    esquema.migrar(conn)
+    print(f"  migração para centavos (versão {esquema.versao_esquema(conn)}) em {time.perf_counter() - t0:.1f}s")
+
+    resultados["SQL SUM sobre INTEGER"] = medir(lambda: somar_sql(conn, CONSULTA_CENTAVOS), args.repeticoes)
+    resultados["Vetorizado (blocos)"] = medir(
+        lambda: somar_por_produto(conn.execute(CONSULTA_VETORIZADA)), args.repeticoes)
+
+    try:
+        import numpy  # noqa: F401
+        motor = "numpy"
+    except ImportError:
+        motor = "Python puro (numpy não instalado)"
+    print(f"  caminho vetorizado: {motor}")
+
+    print(f"\n{'Método':<24} | {'Tempo (ms)':>10} | {'Receita (R$)':>18} | {'Diferença (R$)':>14} | Custo confere")
+    print("-" * 90)
+    for nome, (duracao, por_produto) in resultados.items():
+        receita = sum(p[2] for p in por_produto.values())
+        custo = sum(p[3] for p in por_produto.values())
+        if nome.endswith("REAL"):
+            # Soma em REAL: o total sai em reais, com a deriva do ponto flutuante
+            diferenca = f"{receita - receita_exata / 100:+.9f}"
+            custo_ok = abs(custo * 100 - custo_exato) < 0.5
+            receita_txt = f"{receita:,.6f}"
+        else:
+            diferenca = f"{reais(receita - receita_exata):+.2f}"
+            custo_ok = custo == custo_exato
+            receita_txt = f"{reais(receita):,.2f}"
+        print(f"{nome:<24} | {duracao * 1000:>10.1f} | {receita_txt:>18} | {diferenca:>14} | {'sim' if custo_ok else 'NÃO'}")
+
+    print(f"\nReceita exata: R$ {reais(receita_exata):,.2f}")
+
+    conn.close()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
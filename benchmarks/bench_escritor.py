@@ -0,0 +1,98 @@
+# ============================================================
+#   BENCHMARK: VENDAS/S COM COMMIT PRÓPRIO x ESCRITOR EM GRUPO
+# ============================================================
+#
+# Várias threads produtoras chamam vender_itens ao mesmo tempo durante alguns
+# segundos. Compara, para cada nível de durabilidade (synchronous FULL e
+# NORMAL):
+#
+#   direto     cada venda faz o próprio commit na conexão da sua thread
+#   escritor   as vendas vão para a fila do escritor, que comita em grupos
+#
+# Uso:  python benchmarks/bench_escritor.py [--produtores 1 8 32] [--segundos 3]
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco, escritor  # noqa: E402
+from estoque.vendas import vender_itens  # noqa: E402
+
+PRODUTOS = 500
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+
+
+def preparar(sincronia):
+    banco.configurar_banco(os.path.join(_pasta, f"bench_{sincronia.lower()}.db"))
+    banco.definir_sincronia(sincronia)
+
+    conn = banco.conexao()
+    conn.executemany(
+        "INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Bench {i}", 990, 500, 10_000_000, 1.0, "Bench") for i in range(PRODUTOS)],
+    )
+    conn.commit()
+    banco.fechar_conexoes()
+
+
+def rodada(produtores, segundos):
+
+    #Vendas por segundo com "produtores" threads vendendo até o tempo acabar.
+
+    fim = time.perf_counter() + segundos
+    contagens = []
+
+    def produtor(semente):
+        rnd = random.Random(semente)
+        feitas = 0
+        while time.perf_counter() < fim:
+            vender_itens([(rnd.randint(1, PRODUTOS), 1)], "pix", "bench")
+            feitas += 1
+        banco.fechar_conexoes()
+        contagens.append(feitas)
+
+    threads = [threading.Thread(target=produtor, args=(i,)) for i in range(produtores)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return sum(contagens) / segundos
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Vendas/s: commit próprio x commit em grupo")
+    parser.add_argument("--produtores", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--segundos", type=float, default=3.0)
+    parser.add_argument("--janela", type=float, default=escritor.JANELA_GRUPO, help="janela do grupo (s)")
+    parser.add_argument("--tamanho", type=int, default=escritor.TAMANHO_GRUPO, help="máximo de vendas por commit")
+    args = parser.parse_args()
+
+    print(f"{'Sincronia':<9} | {'Produtores':>10} | {'Direto (v/s)':>12} | {'Escritor (v/s)':>14} | {'Vendas/commit':>13}")
+    print("-" * 71)
+    for sincronia in banco.NIVEIS_SINCRONIA:
+        preparar(sincronia)
+        for n in args.produtores:
+            direto = rodada(n, args.segundos)
+
+            atual = escritor.iniciar_escritor(args.janela, args.tamanho)
+            agrupado = rodada(n, args.segundos)
+            escritor.parar_escritor()
+
+            por_commit = atual.operacoes / max(atual.grupos, 1)
+            print(f"{sincronia:<9} | {n:>10} | {direto:>12.1f} | {agrupado:>14.1f} | {por_commit:>13.1f}")
+
+    banco.fechar_conexoes()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
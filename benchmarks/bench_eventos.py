@@ -0,0 +1,140 @@
+# ============================================================
+#   BENCHMARK: SINCRONIZAÇÃO RELENDO AS TABELAS x FEED DE EVENTOS
+# ============================================================
+#
+# Gera um banco sintético (gerador.py), faz algumas rodadas de vendas e
+# entradas de estoque e, depois de cada rodada, sincroniza uma cópia em
+# memória do estoque (produto -> quantidade) e das vendas de duas formas:
+#
+#   1. relendo produtos e vendas inteiros (como os sistemas externos faziam)
+#   2. lendo só os eventos novos do consumidor (estoque.eventos)
+#
+# As duas cópias são conferidas no fim. Também mede quanto as vendas ficam
+# mais lentas com os triggers do feed e o tempo da compactação.
+#
+# Uso:  python benchmarks/bench_eventos.py [--escala media] [--rodadas 5] [--vendas 200]
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco  # noqa: E402
+from estoque.eventos import acompanhar_eventos, compactar_eventos, registrar_consumidor  # noqa: E402
+from estoque.produtos import registrar_entrada  # noqa: E402
+from estoque.vendas import vender_itens  # noqa: E402
+from benchmarks import gerador  # noqa: E402
+
+# Triggers do feed (migração 13), desligados para medir o custo nas vendas
+TRIGGERS_EVENTOS = ("trg_eventos_produtos_update", "trg_eventos_vendas_insert", "trg_eventos_movimentacoes_insert")
+
+
+def sincronizar_tudo(conn):
+
+    #O que o consumidor fazia sem o feed: lê as tabelas inteiras.
+
+    estoque = dict(conn.execute("SELECT id, quantidade FROM produtos"))
+    vendas = dict(conn.execute("SELECT id, total_centavos FROM vendas"))
+    return estoque, vendas
+
+
+def sincronizar_eventos(estoque, vendas):
+
+    #Aplica só os eventos novos nas cópias. Retorna quantos eventos leu.
+
+    lidos = 0
+    for lote in acompanhar_eventos("bench", tamanho=5000):
+        for evento in lote:
+            if evento.tabela == "produtos":
+                if evento.operacao == "DELETE":
+                    estoque.pop(evento.chave, None)
+                else:
+                    estoque[evento.chave] = evento.dados["quantidade"]
+            elif evento.tabela == "vendas":
+                vendas[evento.chave] = evento.dados["total_centavos"]
+        lidos += len(lote)
+    return lidos
+
+
+def rodada_vendas(rnd, ids, vendas):
+
+    #"vendas" vendas de 1 a 3 itens e algumas entradas. Retorna os segundos gastos.
+
+    t0 = time.perf_counter()
+    for _ in range(vendas):
+        vender_itens([(rnd.choice(ids), 1) for _ in range(rnd.randint(1, 3))], "pix", "Cliente 1")
+        if rnd.random() < 0.1:
+            registrar_entrada(rnd.choice(ids), 50, "bench")
+    return time.perf_counter() - t0
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Sincronização relendo tabelas x feed de eventos")
+    parser.add_argument("--escala", choices=gerador.ESCALAS, default="media")
+    parser.add_argument("--rodadas", type=int, default=5)
+    parser.add_argument("--vendas", type=int, default=200, help="vendas por rodada")
+    args = parser.parse_args()
+
+    banco.configurar_banco(os.path.join(_pasta, "bench_eventos.db"))
+    conn = banco.conexao()
+    print(f"Gerando banco ({args.escala}) ...")
+    print(f"  {gerador.gerar(conn, **gerador.ESCALAS[args.escala])}")
+
+    # Os eventos da carga inicial não interessam: a cópia parte das tabelas
+    compactar_eventos(mostrar=False)
+    leitura = banco.conexao_leitura()
+    estoque_eventos, vendas_eventos = sincronizar_tudo(leitura)
+    registrar_consumidor("bench")
+
+    rnd = random.Random(42)
+    ids = [linha[0] for linha in conn.execute("SELECT id FROM produtos WHERE quantidade > 1000 OR id % 7 = 0")]
+    conn.execute("UPDATE produtos SET quantidade = 1000000")
+    conn.commit()
+    sincronizar_eventos(estoque_eventos, vendas_eventos)
+
+    print(f"\n{'Rodada':>6} | {'Vendas/s':>9} | {'Relendo tudo (ms)':>17} | {'Feed (ms)':>9} | {'Eventos':>7}")
+    print("-" * 62)
+    for rodada in range(1, args.rodadas + 1):
+        duracao = rodada_vendas(rnd, ids, args.vendas)
+
+        t0 = time.perf_counter()
+        estoque_tudo, vendas_tudo = sincronizar_tudo(leitura)
+        tempo_tudo = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        lidos = sincronizar_eventos(estoque_eventos, vendas_eventos)
+        tempo_feed = time.perf_counter() - t0
+
+        print(f"{rodada:>6} | {args.vendas / duracao:>9.0f} | {tempo_tudo * 1000:>17.1f} | {tempo_feed * 1000:>9.1f} | {lidos:>7}")
+
+    confere = estoque_tudo == estoque_eventos and vendas_tudo == vendas_eventos
+    print(f"\nCópias pelo feed iguais às tabelas: {'sim' if confere else 'NÃO'}")
+
+    # Mesmas vendas sem os triggers do feed
+    definicoes = [conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (nome,)).fetchone()[0]
+                  for nome in TRIGGERS_EVENTOS]
+    for nome in TRIGGERS_EVENTOS:
+        conn.execute(f"DROP TRIGGER {nome}")
+    conn.commit()
+    sem_feed = args.vendas / rodada_vendas(rnd, ids, args.vendas)
+    for sql in definicoes:
+        conn.execute(sql)
+    conn.commit()
+    print(f"Vendas/s sem os triggers do feed: {sem_feed:.0f}")
+
+    t0 = time.perf_counter()
+    apagados = compactar_eventos(mostrar=False)
+    print(f"Compactação: {apagados} evento(s) em {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    banco.fechar_conexoes()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
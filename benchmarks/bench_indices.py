@@ -0,0 +1,158 @@
+# ============================================================
+#   BENCHMARK: HISTÓRICO DE VENDAS/MOVIMENTAÇÕES COM E SEM ÍNDICES
+# ============================================================
+#
+# Gera um banco temporário na versão 1 do esquema (só as tabelas), preenche
+# com um histórico sintético e mede as consultas de listar_vendas e
+# listar_movimentacoes. Depois aplica as migrações restantes (índices) e
+# mede de novo.
+#
+# Uso:  python benchmarks/bench_indices.py [--linhas 1000000] [--produtos 2000]
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import esquema  # noqa: E402
+
+
+CONSULTAS = {
+    "listar_vendas (1ª página)": """
+        SELECT id, nome_produto, quantidade, data, valor_unitario, valor_total, forma_pagamento, consumidor
+        FROM vendas ORDER BY data DESC, id DESC LIMIT 50
+    """,
+    "listar_vendas (tudo)": """
+        SELECT id, nome_produto, quantidade, data, valor_unitario, valor_total, forma_pagamento, consumidor
+        FROM vendas ORDER BY data DESC, id DESC
+    """,
+    "vendas de um produto": """
+        SELECT SUM(quantidade), SUM(valor_total) FROM vendas WHERE produto_id = 7
+    """,
+    "listar_movimentacoes (1ª página)": """
+        SELECT m.id, p.nome, m.tipo, m.quantidade, m.data, m.usuario
+        FROM movimentacoes m
+        JOIN produtos p ON p.id = m.produto_id
+        ORDER BY m.data DESC, m.id DESC LIMIT 50
+    """,
+    "listar_movimentacoes (tudo)": """
+        SELECT m.id, p.nome, m.tipo, m.quantidade, m.data, m.usuario
+        FROM movimentacoes m
+        JOIN produtos p ON p.id = m.produto_id
+        ORDER BY m.data DESC, m.id DESC
+    """,
+    "movimentações de um produto": """
+        SELECT tipo, SUM(quantidade) FROM movimentacoes WHERE produto_id = 7 GROUP BY tipo
+    """,
+}
+
+
+def gerar_historico(conn, linhas, produtos):
+
+    #Preenche produtos, vendas e movimentações com dados aleatórios (semente fixa).
+    #As datas são embaralhadas para que a ordem de inserção não coincida com a de data.
+
+    rnd = random.Random(42)
+    inicio = datetime(2020, 1, 1)
+    segundos = 3 * 365 * 24 * 3600
+
+    conn.executemany(
+        "INSERT INTO produtos (nome, valor_venda, valor_custo, quantidade, peso, marca) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"Produto {i}", 10.0, 6.0, 100, 1.0, "Marca") for i in range(1, produtos + 1)),
+    )
+
+    def vendas():
+        for _ in range(linhas):
+            pid = rnd.randint(1, produtos)
+            qtd = rnd.randint(1, 5)
+            data = (inicio + timedelta(seconds=rnd.randrange(segundos))).strftime("%Y-%m-%d %H:%M:%S")
+            yield (pid, f"Produto {pid}", qtd, data, 10.0, 10.0 * qtd, "pix", "Cliente")
+
+    def movimentacoes():
+        for _ in range(linhas):
+            pid = rnd.randint(1, produtos)
+            data = (inicio + timedelta(seconds=rnd.randrange(segundos))).strftime("%Y-%m-%d %H:%M:%S")
+            yield (pid, rnd.choice(("entrada", "saida", "saida - venda")), rnd.randint(1, 5), data, "bench")
+
+    conn.executemany("""
+        INSERT INTO vendas (produto_id, nome_produto, quantidade, data, valor_unitario, valor_total, forma_pagamento, consumidor)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, vendas())
+    conn.executemany("""
+        INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+        VALUES (?, ?, ?, ?, ?)
+    """, movimentacoes())
+    conn.commit()
+
+
+def medir(conn, repeticoes):
+
+    #Executa cada consulta e guarda o melhor tempo (percorre todas as linhas).
+
+    tempos = {}
+    for nome, sql in CONSULTAS.items():
+        melhor = float("inf")
+        for _ in range(repeticoes):
+            t0 = time.perf_counter()
+            for _linha in conn.execute(sql):
+                pass
+            melhor = min(melhor, time.perf_counter() - t0)
+        tempos[nome] = melhor
+    return tempos
+
+
+def planos(conn):
+    for nome, sql in CONSULTAS.items():
+        detalhes = [linha[3] for linha in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        print(f"  {nome}: {' / '.join(detalhes)}")
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Histórico com e sem índices")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="vendas e movimentações geradas (cada)")
+    parser.add_argument("--produtos", type=int, default=2000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    caminho = os.path.join(_pasta, "bench.db")
+    conn = sqlite3.connect(caminho)
+    esquema.migrar(conn, alvo=1)
+
+    print(f"Gerando {args.linhas:,} vendas e {args.linhas:,} movimentações em {caminho} ...")
+    t0 = time.perf_counter()
+    gerar_historico(conn, args.linhas, args.produtos)
+    print(f"  gerado em {time.perf_counter() - t0:.1f}s")
+
+    print("\nPlanos SEM índices (versão 1):")
+    planos(conn)
+    antes = medir(conn, args.repeticoes)
+
+    # Até a versão 9: as consultas usam as colunas em reais, que a 10 troca por centavos
+    t0 = time.perf_counter()
+    esquema.migrar(conn, alvo=9)
+    print(f"\nMigrações até a versão {esquema.versao_esquema(conn)} em {time.perf_counter() - t0:.1f}s")
+
+    print("\nPlanos COM índices:")
+    planos(conn)
+    depois = medir(conn, args.repeticoes)
+
+    print(f"\n{'Consulta':<36} | {'Antes (ms)':>11} | {'Depois (ms)':>11} | Ganho")
+    print("-" * 76)
+    for nome in CONSULTAS:
+        a, d = antes[nome] * 1000, depois[nome] * 1000
+        print(f"{nome:<36} | {a:>11.1f} | {d:>11.1f} | {a / d:>5.1f}x")
+
+    conn.close()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
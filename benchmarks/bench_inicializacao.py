@@ -0,0 +1,124 @@
+# ============================================================
+#   BENCHMARK: TEMPO DE INICIALIZAÇÃO (IMPORT FRIO + 1ª CONSULTA)
+# ============================================================
+#
+# Cada medição roda num interpretador novo (import frio) e separa o tempo do
+# import do tempo da primeira consulta (contar_estoque_baixo), que é quando a
+# conexão é aberta e o esquema conferido. Casos:
+#
+#   import main / import estoque.*    só o import, nenhum banco tocado
+#   banco existente                   esquema já na versão atual
+#   banco novo                        arquivo inexistente: roda as migrações
+#   :memory:                          banco em memória
+#
+# Com --legado REV, mede também o main.py monolítico daquela revisão do git
+# (que abria o banco, migrava e inseria os produtos padrão no import).
+#
+# Uso:  python benchmarks/bench_inicializacao.py [--repeticoes 15] [--legado 058e1fa]
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, RAIZ)
+
+from estoque import banco  # noqa: E402
+from estoque.produtos import inserir_dados_padrao  # noqa: E402
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+
+# Roda no processo filho: importa, consulta e devolve os tempos em JSON
+SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+{importar}
+t1 = time.perf_counter()
+{consultar}
+t2 = time.perf_counter()
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "consulta_ms": (t2 - t1) * 1000}}))
+"""
+
+NOVO = ("from estoque.produtos import contar_estoque_baixo", "contar_estoque_baixo()")
+LEGADO = ("import main", "main.contar_estoque_baixo()")
+
+
+def rodar(importar, consultar, caminho, pasta=RAIZ, preparar=None):
+
+    #Um processo novo: devolve (processo inteiro, import, 1ª consulta) em ms.
+
+    if preparar:
+        preparar()
+    env = dict(os.environ, ESTOQUE_DB=caminho)
+    codigo = SCRIPT.format(importar=importar, consultar=consultar)
+
+    t0 = time.perf_counter()
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=pasta, env=env,
+                           capture_output=True, text=True, check=True).stdout
+    total = (time.perf_counter() - t0) * 1000
+
+    tempos = json.loads(saida.strip().splitlines()[-1])
+    return total, tempos["import_ms"], tempos["consulta_ms"]
+
+
+def medir(nome, repeticoes, *args, **kwargs):
+    rodar(*args, **kwargs)  # aquecimento (bytecode em cache, arquivos no cache do SO)
+    amostras = [rodar(*args, **kwargs) for _ in range(repeticoes)]
+    total, imp, consulta = (statistics.median(col) for col in zip(*amostras))
+    print(f"{nome:<38} | {total:>9.1f} | {imp:>9.2f} | {consulta:>11.2f}")
+
+
+def apagar(caminho):
+    def preparar():
+        for sufixo in ("", "-wal", "-shm"):
+            if os.path.exists(caminho + sufixo):
+                os.remove(caminho + sufixo)
+    return preparar
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Import frio e primeira consulta")
+    parser.add_argument("--repeticoes", type=int, default=15)
+    parser.add_argument("--legado", help="revisão do git com o main.py antigo, para comparar")
+    args = parser.parse_args()
+
+    existente = os.path.join(_pasta, "existente.db")
+    banco.configurar_banco(existente)
+    inserir_dados_padrao()
+    banco.fechar_conexoes()
+    novo = os.path.join(_pasta, "novo.db")
+
+    print(f"Medianas de {args.repeticoes} processos (ms)\n")
+    print(f"{'Caso':<38} | {'Processo':>9} | {'Import':>9} | {'1ª consulta':>11}")
+    print("-" * 76)
+    medir("import main", args.repeticoes, "import main", "pass", existente)
+    medir("import estoque (todos os módulos)", args.repeticoes, "import estoque.menus, estoque.importacao", "pass", existente)
+    medir("banco existente", args.repeticoes, *NOVO, existente)
+    medir("banco novo (migrações)", args.repeticoes, *NOVO, novo, preparar=apagar(novo))
+    medir(":memory:", args.repeticoes, *NOVO, ":memory:")
+
+    if args.legado:
+        pasta_legado = os.path.join(_pasta, "legado")
+        os.makedirs(pasta_legado)
+        fonte = subprocess.run(["git", "show", f"{args.legado}:main.py"], cwd=RAIZ,
+                               capture_output=True, text=True, check=True).stdout
+        with open(os.path.join(pasta_legado, "main.py"), "w", encoding="utf-8") as f:
+            f.write(fonte)
+
+        copia = os.path.join(pasta_legado, "existente.db")
+        shutil.copy(existente, copia)
+        medir(f"legado {args.legado}: banco existente", args.repeticoes, *LEGADO, copia, pasta=pasta_legado)
+        medir(f"legado {args.legado}: banco novo", args.repeticoes, *LEGADO, novo, pasta=pasta_legado,
+              preparar=apagar(novo))
+
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
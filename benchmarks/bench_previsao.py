@@ -0,0 +1,75 @@
+# ============================================================
+#   BENCHMARK: PREVISÃO DE DEMANDA (COMPLETA x INCREMENTAL)
+# ============================================================
+#
+# Gera um banco sintético (gerador.py) e mede atualizar_previsao:
+#
+#   1. completa: todo o histórico, do zero (refazer=True)
+#   2. incremental: a partir do estado gravado, lendo só o último dia
+#
+# O caminho vetorizado usa numpy se estiver instalado; --sem-numpy força o
+# cálculo em Python puro para comparar.
+#
+# Uso:  python benchmarks/bench_previsao.py [--escala grande] [--sem-numpy]
+
+import argparse
+import builtins
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco  # noqa: E402
+from estoque.previsao import atualizar_previsao  # noqa: E402
+from benchmarks import gerador  # noqa: E402
+
+
+def sem_numpy():
+
+    #Faz "import numpy" falhar neste processo.
+
+    importar = builtins.__import__
+
+    def bloquear(nome, *args, **kwargs):
+        if nome == "numpy" or nome.startswith("numpy."):
+            raise ImportError(nome)
+        return importar(nome, *args, **kwargs)
+
+    builtins.__import__ = bloquear
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Previsão de demanda: completa x incremental")
+    parser.add_argument("--escala", choices=gerador.ESCALAS, default="grande")
+    parser.add_argument("--sem-numpy", action="store_true", help="calcula em Python puro")
+    args = parser.parse_args()
+
+    if args.sem_numpy:
+        sem_numpy()
+
+    banco.configurar_banco(os.path.join(_pasta, "bench_previsao.db"))
+    print(f"Gerando banco ({args.escala}) ...")
+    t0 = time.perf_counter()
+    print(f"  {gerador.gerar(banco.conexao(), **gerador.ESCALAS[args.escala])} em {time.perf_counter() - t0:.1f}s")
+
+    # O histórico gerado termina em FIM_HISTORICO: a completa para um dia antes
+    ultimo_dia = gerador.FIM_HISTORICO.date()
+    completa = atualizar_previsao(ate=ultimo_dia.isoformat(), refazer=True)
+    incremental = atualizar_previsao(ate=(ultimo_dia + timedelta(days=1)).isoformat())
+
+    print(f"\n{'Execução':<12} | {'Motor':<7} | {'Produtos':>9} | {'Produto-dia':>11} | {'Tempo (s)':>9}")
+    print("-" * 62)
+    for nome, r in (("completa", completa), ("incremental", incremental)):
+        print(f"{nome:<12} | {r['motor']:<7} | {r['produtos']:>9,} | {r['linhas']:>11,} | {r['segundos']:>9.2f}")
+
+    banco.fechar_conexoes()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,206 @@
+# ============================================================
+#   BENCHMARK: VENDAS EM TEXTO x VENDAS COMPACTAS (MIGRAÇÃO 12)
+# ============================================================
+#
+# Gera um banco temporário na versão 11 do esquema (forma de pagamento e
+# consumidor por extenso em cada venda), mede, migra para a versão 12
+# (dicionário de formas de pagamento + id do cliente) e mede de novo:
+#
+#   - tamanho do arquivo (depois de VACUUM, para comparar só os dados)
+#   - páginas da tabela de vendas e dos seus índices: o que o cache de
+#     páginas precisa guardar para uma varredura não voltar ao disco
+#   - GROUP BY por forma de pagamento e por consumidor, por texto (antes),
+#     por id (depois) e pela view de compatibilidade "vendas" (depois)
+#
+# Os totais de cada agrupamento são conferidos entre antes e depois.
+#
+# Uso:  python benchmarks/bench_vendas_compactas.py [--linhas 1000000] [--clientes 5000] [--repeticoes 3]
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import esquema  # noqa: E402
+from estoque.esquema import CONSUMIDOR_NAO_INFORMADO  # noqa: E402
+from benchmarks.gerador import FORMAS_PAGAMENTO  # noqa: E402
+
+# Versão do esquema com forma de pagamento e consumidor em texto
+VERSAO_TEXTO = 11
+
+PRODUTOS = 2000
+
+CONSULTAS_ANTES = {
+    "forma (texto)": "SELECT forma_pagamento, COUNT(*), SUM(total_centavos) FROM vendas GROUP BY forma_pagamento",
+    "consumidor (texto)": "SELECT consumidor, COUNT(*), SUM(total_centavos) FROM vendas GROUP BY consumidor",
+}
+
+CONSULTAS_DEPOIS = {
+    # Agrupa pelos ids e só depois busca os nomes (um por grupo)
+    "forma (id)": """
+        SELECT f.nome, g.n, g.total
+        FROM (SELECT forma_id, COUNT(*) AS n, SUM(total_centavos) AS total
+              FROM vendas_compactas GROUP BY forma_id) g
+        JOIN formas_pagamento f ON f.id = g.forma_id
+    """,
+    # Clientes e avulsos pelos índices parciais; os não informados são o que sobra do total
+    "consumidor (id)": f"""
+        WITH clientes_g AS MATERIALIZED (
+            SELECT c.nome, g.n, g.total
+            FROM (SELECT cliente_id, COUNT(*) AS n, SUM(total_centavos) AS total
+                  FROM vendas_compactas WHERE cliente_id IS NOT NULL GROUP BY cliente_id) g
+            JOIN clientes c ON c.id = g.cliente_id
+        ), avulsos AS MATERIALIZED (
+            SELECT consumidor AS nome, COUNT(*) AS n, SUM(total_centavos) AS total
+            FROM vendas_compactas WHERE consumidor IS NOT NULL GROUP BY consumidor
+        ), todos AS MATERIALIZED (
+            SELECT COUNT(*) AS n, SUM(total_centavos) AS total FROM vendas_compactas
+        )
+        SELECT nome, SUM(n), SUM(total) FROM (
+            SELECT * FROM clientes_g
+            UNION ALL SELECT * FROM avulsos
+            UNION ALL
+            SELECT '{CONSUMIDOR_NAO_INFORMADO}',
+                   todos.n - (SELECT COALESCE(SUM(n), 0) FROM clientes_g) - (SELECT COALESCE(SUM(n), 0) FROM avulsos),
+                   todos.total - (SELECT COALESCE(SUM(total), 0) FROM clientes_g) - (SELECT COALESCE(SUM(total), 0) FROM avulsos)
+            FROM todos
+        )
+        GROUP BY nome
+    """,
+    "forma (view)": CONSULTAS_ANTES["forma (texto)"],
+    "consumidor (view)": CONSULTAS_ANTES["consumidor (texto)"],
+}
+
+
+def gerar_historico(conn, linhas, clientes):
+
+    #Preenche produtos, clientes e vendas com texto por extenso (semente fixa),
+    #como o programa gravava antes da migração 12.
+
+    rnd = random.Random(42)
+    inicio = datetime(2023, 1, 1)
+    segundos = 3 * 365 * 24 * 3600
+
+    precos = [rnd.randint(150, 9000) for _ in range(PRODUTOS)]
+    conn.executemany(
+        "INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"Produto {i}", precos[i], precos[i] * 2 // 3, 100, 1.0, "Marca") for i in range(PRODUTOS)),
+    )
+    conn.executemany("INSERT INTO clientes (nome, contato) VALUES (?, ?)",
+                     ((f"Cliente {i}", f"(11) 9{i:08d}") for i in range(clientes)))
+
+    def vendas():
+        for _ in range(linhas):
+            i = rnd.randrange(PRODUTOS)
+            qtd = rnd.randint(1, 5)
+            sorteio = rnd.random()
+            if sorteio < 0.4:
+                consumidor = f"Cliente {rnd.randrange(clientes)}"
+            elif sorteio < 0.45:
+                consumidor = f"Consumidor avulso {rnd.randrange(500)}"
+            else:
+                consumidor = CONSUMIDOR_NAO_INFORMADO
+            data = (inicio + timedelta(seconds=rnd.randrange(segundos))).strftime("%Y-%m-%d %H:%M:%S")
+            yield (i + 1, f"Produto {i}", qtd, data, precos[i], precos[i] * qtd,
+                   rnd.choice(FORMAS_PAGAMENTO), consumidor, precos[i] * 2 // 3)
+
+    conn.executemany("""
+        INSERT INTO vendas (produto_id, nome_produto, quantidade, data, unitario_centavos, total_centavos,
+                            forma_pagamento, consumidor, custo_centavos)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, vendas())
+    conn.commit()
+
+
+def medir(funcao, repeticoes):
+
+    #Melhor tempo de "repeticoes" execuções e o último resultado.
+
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor, resultado
+
+
+def tamanhos(conn, caminho, tabela):
+
+    #(MB do arquivo, páginas da tabela, páginas dos índices da tabela) depois de VACUUM.
+
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    arquivo = os.path.getsize(caminho) / 1024 ** 2
+    try:
+        paginas = dict(conn.execute("""
+            SELECT s.name = ?, COUNT(*) FROM dbstat s
+            JOIN sqlite_schema m ON m.name = s.name
+            WHERE m.tbl_name = ? GROUP BY 1
+        """, (tabela, tabela)))
+    except sqlite3.OperationalError:
+        # SQLite compilado sem dbstat
+        return arquivo, None, None
+    return arquivo, paginas.get(1, 0), paginas.get(0, 0)
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="Vendas com texto por extenso x vendas compactas")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="vendas geradas")
+    parser.add_argument("--clientes", type=int, default=5000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    caminho = os.path.join(_pasta, "bench_vendas_compactas.db")
+    conn = sqlite3.connect(caminho, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+
+    esquema.migrar(conn, alvo=VERSAO_TEXTO)
+    print(f"Gerando {args.linhas:,} vendas em {caminho} ...")
+    t0 = time.perf_counter()
+    conn.execute("BEGIN")
+    gerar_historico(conn, args.linhas, args.clientes)
+    print(f"  gerado em {time.perf_counter() - t0:.1f}s")
+
+    tamanho_pagina = conn.execute("PRAGMA page_size").fetchone()[0]
+    espaco = {"antes (texto)": tamanhos(conn, caminho, "vendas")}
+    tempos = {nome: medir(lambda sql=sql: sorted(conn.execute(sql)), args.repeticoes)
+              for nome, sql in CONSULTAS_ANTES.items()}
+
+    t0 = time.perf_counter()
+    esquema.migrar(conn)
+    print(f"  migração para vendas compactas (versão {esquema.versao_esquema(conn)}) em {time.perf_counter() - t0:.1f}s")
+
+    espaco["depois (compacta)"] = tamanhos(conn, caminho, "vendas_compactas")
+    tempos.update({nome: medir(lambda sql=sql: sorted(conn.execute(sql)), args.repeticoes)
+                   for nome, sql in CONSULTAS_DEPOIS.items()})
+
+    print(f"\n{'Banco':<18} | {'Arquivo (MB)':>12} | {'Páginas vendas':>14} | {'Páginas índices':>15} | {'Cache p/ varrer (MB)':>20}")
+    print("-" * 92)
+    for nome, (arquivo, tabela, indices) in espaco.items():
+        if tabela is None:
+            print(f"{nome:<18} | {arquivo:>12.1f} | {'(sem dbstat)':>14} | {'':>15} | {'':>20}")
+        else:
+            cache = tabela * tamanho_pagina / 1024 ** 2
+            print(f"{nome:<18} | {arquivo:>12.1f} | {tabela:>14,} | {indices:>15,} | {cache:>20.1f}")
+
+    print(f"\n{'GROUP BY':<20} | {'Tempo (ms)':>10} | {'Grupos':>7} | Totais conferem")
+    print("-" * 60)
+    referencia = {"forma": tempos["forma (texto)"][1], "consumidor": tempos["consumidor (texto)"][1]}
+    for nome, (duracao, linhas) in tempos.items():
+        confere = linhas == referencia[nome.split()[0]]
+        print(f"{nome:<20} | {duracao * 1000:>10.1f} | {len(linhas):>7} | {'sim' if confere else 'NÃO'}")
+
+    conn.close()
+    shutil.rmtree(_pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,173 @@
+# ============================================================
+#        CENÁRIOS CRONOMETRADOS DAS OPERAÇÕES PRINCIPAIS
+# ============================================================
+#
+# Cada cenário é uma função que recebe o Contexto e executa UMA operação.
+# As funções interativas (listar_*, relatórios) são chamadas de verdade, com
+# as respostas do input() roteirizadas e a saída descartada.
+
+import builtins
+import contextlib
+import os
+import random
+
+from estoque import banco, cadastros, catalogo, historico, produtos, relatorios, vendas
+
+CENARIOS = {}
+
+
+def cenario(nome):
+
+    #Registra a função como cenário com o nome dado (a ordem de registro é a de execução).
+
+    def registrar(funcao):
+        CENARIOS[nome] = funcao
+        return funcao
+    return registrar
+
+
+class Contexto:
+
+    #Estado compartilhado pelos cenários: gerador aleatório com semente fixa e
+    #amostras de IDs e datas do banco sendo medido.
+
+    def __init__(self, semente=42):
+        conn = banco.conexao_leitura()
+        self.rnd = random.Random(semente)
+        self.ids = [linha[0] for linha in conn.execute("SELECT id FROM produtos")]
+        self.com_estoque = [linha[0] for linha in conn.execute("SELECT id FROM produtos WHERE quantidade > 100")]
+        self.com_estoque = self.com_estoque or self.ids
+        self.ultima_data = (conn.execute("SELECT MAX(data) FROM vendas").fetchone()[0] or "2025-12-31")[:10]
+
+    def produto(self):
+        return self.rnd.choice(self.com_estoque)
+
+
+@contextlib.contextmanager
+def terminal(respostas=()):
+
+    #Roda o bloco respondendo o input() com "respostas" (depois delas, "s" = sair)
+    #e jogando fora tudo o que for impresso.
+
+    respostas = iter(respostas)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(respostas, "s")
+    try:
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            yield
+    finally:
+        builtins.input = original
+
+
+# ---------------------------- Escrita ----------------------------
+
+@cenario("venda_1_item")
+def _venda_1_item(ctx):
+    vendas.vender_itens([(ctx.produto(), 1)], "pix", "bench")
+
+
+@cenario("venda_carrinho_10_itens")
+def _venda_carrinho(ctx):
+    vendas.vender_itens([(ctx.produto(), 1) for _ in range(10)], "pix", "bench")
+
+
+@cenario("entrada_estoque")
+def _entrada(ctx):
+    produtos.registrar_entrada(ctx.rnd.choice(ctx.ids), 10, "bench")
+
+
+@cenario("saida_estoque")
+def _saida(ctx):
+    produtos.registrar_saida(ctx.produto(), 1, "bench")
+
+
+# ---------------------------- Listagens ----------------------------
+
+@cenario("listar_produtos")
+def _listar_produtos(ctx):
+    with terminal():
+        produtos.listar_produtos()
+
+
+@cenario("listar_vendas_1a_pagina")
+def _listar_vendas(ctx):
+    with terminal(["", "", ""]):
+        historico.listar_vendas()
+
+
+@cenario("listar_vendas_10_paginas")
+def _listar_vendas_10(ctx):
+    with terminal(["", "", ""] + [""] * 9):
+        historico.listar_vendas()
+
+
+@cenario("listar_vendas_produto_e_periodo")
+def _listar_vendas_filtrado(ctx):
+    inicio = ctx.ultima_data[:4] + "-01-01"
+    with terminal([inicio, ctx.ultima_data, str(ctx.rnd.choice(ctx.ids))]):
+        historico.listar_vendas()
+
+
+@cenario("listar_movimentacoes_1a_pagina")
+def _listar_movimentacoes(ctx):
+    with terminal(["", "", ""]):
+        historico.listar_movimentacoes()
+
+
+@cenario("listar_movimentacoes_10_paginas")
+def _listar_movimentacoes_10(ctx):
+    with terminal(["", "", ""] + [""] * 9):
+        historico.listar_movimentacoes()
+
+
+@cenario("listar_clientes")
+def _listar_clientes(ctx):
+    with terminal():
+        cadastros.listar_clientes()
+
+
+@cenario("listar_fornecedores")
+def _listar_fornecedores(ctx):
+    with terminal():
+        cadastros.listar_fornecedores()
+
+
+@cenario("listar_estoque_baixo")
+def _listar_estoque_baixo(ctx):
+    with terminal():
+        produtos.listar_estoque_baixo()
+
+
+@cenario("buscar_produtos")
+def _buscar(ctx):
+    produtos.buscar_produtos(ctx.rnd.choice(("arroz", "cafe pil", "acucar 1", "sabao omo", "leite")))
+
+
+@cenario("produto_por_id_cache")
+def _produto_cache(ctx):
+    catalogo.catalogo().obter(ctx.rnd.choice(ctx.ids))
+
+
+@cenario("produto_por_id_sql")
+def _produto_sql(ctx):
+    banco.conexao_leitura().execute(
+        f"SELECT {catalogo.COLUNAS} FROM produtos WHERE id=?", (ctx.rnd.choice(ctx.ids),)
+    ).fetchone()
+
+
+# ---------------------------- Relatórios ----------------------------
+
+@cenario("relatorio_financeiro")
+def _financeiro(ctx):
+    with terminal():
+        relatorios.relatorio_financeiro()
+
+
+@cenario("vendas_por_mes_e_produto")
+def _por_periodo(ctx):
+    relatorios.vendas_por_periodo("mes", ctx.ultima_data[:4] + "-01-01", ctx.ultima_data, "produto")
+
+
+@cenario("ranking_abc_ano")
+def _ranking(ctx):
+    relatorios.ranking_produtos(ctx.ultima_data[:4] + "-01-01", ctx.ultima_data)
@@ -0,0 +1,64 @@
+# ============================================================
+#        COMPARAÇÃO DE DOIS RESULTADOS DA SUÍTE (JSON)
+# ============================================================
+#
+# Uso:  python -m benchmarks.comparar antes.json depois.json [--limite 1.10] [--falhar]
+
+import argparse
+import json
+import sys
+
+
+def carregar(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def comparar(antes, depois, limite):
+
+    #Imprime a mediana de cada cenário nos dois resultados e a razão depois/antes.
+    #Retorna os cenários que ficaram mais lentos que "limite" vezes.
+
+    regressoes = []
+    print(f"{'Cenário':<34} | {'Antes (ms)':>11} | {'Depois (ms)':>11} | Razão")
+    print("-" * 72)
+
+    for nome, medida in depois["cenarios"].items():
+        if nome not in antes["cenarios"]:
+            print(f"{nome:<34} | {'-':>11} | {medida['mediana_ms']:>11.3f} | novo")
+            continue
+
+        a = antes["cenarios"][nome]["mediana_ms"]
+        d = medida["mediana_ms"]
+        razao = d / a if a else float("inf")
+        marca = "  <-- mais lento" if razao > limite else ""
+        print(f"{nome:<34} | {a:>11.3f} | {d:>11.3f} | {razao:5.2f}x{marca}")
+
+        if razao > limite:
+            regressoes.append(nome)
+
+    return regressoes
+
+
+def main_comparar():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.comparar")
+    parser.add_argument("antes")
+    parser.add_argument("depois")
+    parser.add_argument("--limite", type=float, default=1.10, help="razão a partir da qual é regressão")
+    parser.add_argument("--falhar", action="store_true", help="sai com código 1 se houver regressão")
+    args = parser.parse_args()
+
+    antes, depois = carregar(args.antes), carregar(args.depois)
+
+    if antes["meta"]["escala"] != depois["meta"]["escala"]:
+        print("Atenção: os resultados foram gerados em escalas diferentes.", file=sys.stderr)
+
+    print(f"antes: {antes['meta']['commit']}  depois: {depois['meta']['commit']}\n")
+    regressoes = comparar(antes, depois, args.limite)
+
+    if regressoes and args.falhar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_comparar()
@@ -0,0 +1,128 @@
+# ============================================================
+#        GERADOR DETERMINÍSTICO DE DADOS SINTÉTICOS
+# ============================================================
+#
+# A mesma escala e a mesma semente geram sempre o mesmo banco: produtos,
+# clientes, fornecedores e anos de vendas + movimentações, inseridos em ordem
+# de data como aconteceria em produção (os triggers de resumo rodam normalmente).
+
+import random
+from datetime import datetime, timedelta
+
+# Escalas prontas (podem ser ajustadas campo a campo na linha de comando)
+ESCALAS = {
+    "pequena": {"produtos": 1_000, "clientes": 200, "fornecedores": 20, "anos": 1, "vendas_por_dia": 50},
+    "media": {"produtos": 20_000, "clientes": 2_000, "fornecedores": 100, "anos": 3, "vendas_por_dia": 500},
+    "grande": {"produtos": 100_000, "clientes": 10_000, "fornecedores": 500, "anos": 3, "vendas_por_dia": 3_000},
+}
+
+# Último dia do histórico gerado (fixo para o banco não depender de "hoje")
+FIM_HISTORICO = datetime(2025, 12, 31)
+
+CATEGORIAS = ["Arroz", "Feijão", "Macarrão", "Açúcar", "Óleo", "Café", "Leite", "Farinha", "Sal",
+              "Bolacha", "Sabão", "Detergente", "Biscoito", "Achocolatado", "Molho", "Sardinha",
+              "Azeite", "Vinagre", "Fubá", "Aveia"]
+MARCAS = ["Tio João", "Kicaldo", "Adria", "União", "Soya", "Pilão", "Itambé", "Dona Benta",
+          "Cisne", "Marilan", "Omo", "Ypê", "Nestlé", "Camil", "Qualitá", "Predileto"]
+TAMANHOS = ["200g", "350g", "500g", "1kg", "2kg", "5kg", "900ml", "1L", "2L"]
+FORMAS_PAGAMENTO = ["dinheiro", "pix", "debito", "credito"]
+
+LOTE = 10_000
+
+
+def gerar(conn, produtos, clientes, fornecedores, anos, vendas_por_dia, semente=42):
+
+    #Preenche um banco já migrado. Retorna um dicionário com as contagens geradas.
+
+    rnd = random.Random(semente)
+
+    # ---------------------------- Produtos ----------------------------
+    catalogo = []
+    for i in range(produtos):
+        custo = round(rnd.uniform(1, 60) * 100)         # centavos
+        catalogo.append((
+            f"{rnd.choice(CATEGORIAS)} {rnd.choice(TAMANHOS)} {i}",
+            round(custo * rnd.uniform(1.2, 1.8)),
+            custo,
+            rnd.randint(0, 500),
+            round(rnd.uniform(0.1, 5), 2),
+            rnd.choice(MARCAS),
+            rnd.randint(2, 20),
+        ))
+    conn.executemany("""
+        INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca, estoque_minimo)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, catalogo)
+
+    ids = [linha[0] for linha in conn.execute("SELECT id FROM produtos ORDER BY id")]
+    precos = dict(conn.execute("SELECT id, venda_centavos FROM produtos"))
+    custos = dict(conn.execute("SELECT id, custo_centavos FROM produtos"))
+    nomes = dict(conn.execute("SELECT id, nome FROM produtos"))
+
+    # ---------------------------- Cadastros ----------------------------
+    conn.executemany("INSERT INTO clientes (nome, contato) VALUES (?, ?)",
+                     [(f"Cliente {i}", f"(11) 9{i:08d}") for i in range(clientes)])
+    id_clientes = [linha[0] for linha in conn.execute("SELECT id FROM clientes ORDER BY id")]
+    conn.executemany("INSERT INTO fornecedores (nome, contato) VALUES (?, ?)",
+                     [(f"Fornecedor {i}", f"fornecedor{i}@exemplo.com") for i in range(fornecedores)])
+
+    # Popularidade no estilo Pareto: poucos produtos vendem muito
+    pesos = [1 / (posicao + 1) for posicao in range(len(ids))]
+    rnd.shuffle(pesos)
+    acumulados = []
+    total = 0.0
+    for peso in pesos:
+        total += peso
+        acumulados.append(total)
+
+    # ---------------------------- Histórico ----------------------------
+    dias = anos * 365
+    inicio = FIM_HISTORICO - timedelta(days=dias - 1)
+    vendas, movs = [], []
+    num_vendas = num_movs = 0
+
+    # Formas de pagamento por id, como vendas.vender_itens grava
+    conn.executemany("INSERT OR IGNORE INTO formas_pagamento (nome) VALUES (?)", [(f,) for f in FORMAS_PAGAMENTO])
+    id_formas = dict(conn.execute("SELECT nome, id FROM formas_pagamento"))
+
+    def gravar():
+        conn.executemany("""
+            INSERT INTO vendas_compactas (produto_id, nome_produto, quantidade, data, unitario_centavos, total_centavos,
+                                          forma_id, cliente_id, custo_centavos)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, vendas)
+        conn.executemany("""
+            INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+            VALUES (?, ?, ?, ?, ?)
+        """, movs)
+        vendas.clear()
+        movs.clear()
+
+    for d in range(dias):
+        dia = inicio + timedelta(days=d)
+        segundos = sorted(rnd.randrange(8 * 3600, 22 * 3600) for _ in range(rnd.randint(vendas_por_dia // 2, vendas_por_dia * 3 // 2)))
+
+        for seg in segundos:
+            data = (dia + timedelta(seconds=seg)).strftime("%Y-%m-%d %H:%M:%S")
+            pid = rnd.choices(ids, cum_weights=acumulados)[0]
+            qtd = rnd.randint(1, 5)
+            cliente = id_clientes[rnd.randrange(clientes)] if clientes and rnd.random() < 0.4 else None
+            vendas.append((pid, nomes[pid], qtd, data, precos[pid], precos[pid] * qtd,
+                           id_formas[rnd.choice(FORMAS_PAGAMENTO)], cliente, custos[pid]))
+            movs.append((pid, "saida - venda", qtd, data, "caixa"))
+
+        # Reposição de alguns produtos no começo do dia
+        for pid in rnd.sample(ids, min(len(ids), max(1, vendas_por_dia // 20))):
+            movs.append((pid, "entrada", rnd.randint(10, 100), dia.strftime("%Y-%m-%d 07:00:00"), "estoquista"))
+
+        num_vendas += len(segundos)
+        if len(vendas) >= LOTE:
+            num_movs += len(movs)
+            gravar()
+
+    num_movs += len(movs)
+    gravar()
+    conn.commit()
+
+    return {"produtos": len(ids), "clientes": clientes, "fornecedores": fornecedores,
+            "vendas": num_vendas, "movimentacoes": num_movs}
@@ -0,0 +1,159 @@
+# ============================================================
+#   STRESS: VÁRIOS PROCESSOS DISPUTANDO O MESMO ESTOQUE
+# ============================================================
+#
+# Vários processos vendem (carrinhos de 1 a 3 itens) e dão saída nos mesmos
+# poucos produtos, com estoque limitado, até o tempo acabar. No fim confere:
+#
+#   - nenhum produto com quantidade negativa
+#   - para cada produto: inicial - final == soma das saídas registradas
+#   - saídas confirmadas pelos processos == saídas gravadas no banco
+#
+# e mostra as operações por segundo, as recusas por falta de estoque e os
+# erros de banco ocupado. Com --legado, usa a venda antiga (SELECT, conferência
+# no Python e UPDATE separado) para comparar: ela vende mais do que existe.
+#
+# Uso:  python benchmarks/stress_estoque.py [--processos 8] [--segundos 5] [--legado]
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from estoque import banco  # noqa: E402
+from estoque.produtos import OperacaoInvalida, registrar_saida  # noqa: E402
+from estoque.vendas import vender_itens  # noqa: E402
+
+_pasta = tempfile.mkdtemp(prefix="bench_estoque_")
+
+
+def venda_legada(itens, forma, consumidor):
+
+    #A venda como era antes: lê o estoque, confere no Python e só depois
+    #atualiza, sem trava entre a leitura e a escrita.
+
+    conn = banco.conexao()
+    produtos = {}
+    for pid, _ in itens:
+        linha = conn.execute("SELECT nome, venda_centavos, quantidade, custo_centavos FROM produtos WHERE id=?", (pid,)).fetchone()
+        produtos[pid] = linha
+
+    for pid, qtd in itens:
+        if qtd > produtos[pid][2]:
+            raise OperacaoInvalida("Estoque insuficiente.")
+
+    data = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with conn:
+        for pid, qtd in itens:
+            nome, valor, _, custo = produtos[pid]
+            conn.execute("""
+                INSERT INTO vendas (produto_id, nome_produto, quantidade, data, unitario_centavos, total_centavos, forma_pagamento, consumidor, custo_centavos)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (pid, nome, qtd, data, valor, valor * qtd, forma, consumidor, custo))
+            conn.execute("UPDATE produtos SET quantidade = quantidade - ? WHERE id=?", (qtd, pid))
+            conn.execute("""
+                INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+                VALUES (?, 'saida - venda', ?, ?, ?)
+            """, (pid, qtd, data, consumidor))
+
+
+def trabalhador(fim, produtos, legado, resultados):
+    rnd = random.Random(os.getpid())
+    vender = venda_legada if legado else vender_itens
+    contagem = {"vendas": 0, "saidas": 0, "recusadas": 0, "ocupado": 0}
+
+    while time.time() < fim:
+        try:
+            if rnd.random() < 0.8:
+                itens = {rnd.randint(1, produtos): rnd.randint(1, 3) for _ in range(rnd.randint(1, 3))}
+                vender(list(itens.items()), "pix", "stress")
+                contagem["vendas"] += 1
+            else:
+                registrar_saida(rnd.randint(1, produtos), rnd.randint(1, 3), "stress")
+                contagem["saidas"] += 1
+        except OperacaoInvalida:
+            contagem["recusadas"] += 1
+        except sqlite3.OperationalError as erro:
+            if not banco.banco_ocupado(erro):
+                raise
+            contagem["ocupado"] += 1
+
+    banco.fechar_conexoes()
+    resultados.put(contagem)
+
+
+def main_stress():
+    parser = argparse.ArgumentParser(description="Stress de vendas/saídas concorrentes")
+    parser.add_argument("--processos", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--produtos", type=int, default=20, help="poucos produtos = mais disputa")
+    parser.add_argument("--estoque", type=int, default=2000, help="estoque inicial de cada produto")
+    parser.add_argument("--legado", action="store_true", help="usa a venda antiga (SELECT + UPDATE)")
+    args = parser.parse_args()
+
+    banco.configurar_banco(os.path.join(_pasta, "stress.db"))
+    conn = banco.conexao()
+    conn.executemany(
+        "INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Stress {i}", 990, 500, args.estoque, 1.0, "Stress") for i in range(args.produtos)],
+    )
+    conn.commit()
+    banco.fechar_conexoes()
+
+    # fork: os filhos herdam o módulo e abrem as próprias conexões
+    multiprocessing.set_start_method("fork")
+    resultados = multiprocessing.Queue()
+    fim = time.time() + args.segundos
+    processos = [multiprocessing.Process(target=trabalhador, args=(fim, args.produtos, args.legado, resultados))
+                 for _ in range(args.processos)]
+    for p in processos:
+        p.start()
+    total = {"vendas": 0, "saidas": 0, "recusadas": 0, "ocupado": 0}
+    for _ in processos:
+        for chave, valor in resultados.get().items():
+            total[chave] += valor
+    for p in processos:
+        p.join()
+
+    conn = banco.conexao_leitura()
+    negativos = conn.execute("SELECT COUNT(*) FROM produtos WHERE quantidade < 0").fetchone()[0]
+    esgotados = conn.execute("SELECT COUNT(*) FROM produtos WHERE quantidade = 0").fetchone()[0]
+    divergentes = conn.execute("""
+        SELECT COUNT(*) FROM produtos p
+        WHERE ? - p.quantidade != (SELECT COALESCE(SUM(m.quantidade), 0) FROM movimentacoes m
+                                   WHERE m.produto_id = p.id AND m.tipo LIKE 'saida%')
+    """, (args.estoque,)).fetchone()[0]
+    vendas_banco, vendido = conn.execute("SELECT COUNT(*), COALESCE(SUM(quantidade), 0) FROM vendas").fetchone()
+    saidas_banco = conn.execute("SELECT COUNT(*) FROM movimentacoes WHERE tipo = 'saida'").fetchone()[0]
+    banco.fechar_conexoes()
+
+    operacoes = total["vendas"] + total["saidas"] + total["recusadas"]
+    print(f"{args.processos} processos, {args.segundos:.0f}s, {args.produtos} produtos x {args.estoque} unidades"
+          f" ({'venda antiga' if args.legado else 'UPDATE condicional + BEGIN IMMEDIATE'})")
+    print(f"  operações/s:          {operacoes / args.segundos:10.1f}")
+    print(f"  confirmadas/s:        {(total['vendas'] + total['saidas']) / args.segundos:10.1f}")
+    print(f"  vendas confirmadas:   {total['vendas']:10}   (linhas de venda gravadas: {vendas_banco}, itens: {vendido})")
+    print(f"  saídas confirmadas:   {total['saidas']:10}   (gravadas: {saidas_banco})")
+    print(f"  recusadas (estoque):  {total['recusadas']:10}")
+    print(f"  banco ocupado:        {total['ocupado']:10}")
+    print(f"  produtos esgotados:   {esgotados:10}")
+    print(f"  estoque negativo:     {negativos:10}")
+    print(f"  saldo divergente:     {divergentes:10}")
+
+    ok = negativos == 0 and divergentes == 0 and saidas_banco == total["saidas"]
+    print("OK: estoque consistente." if ok else "FALHOU: estoque inconsistente.")
+
+    shutil.rmtree(_pasta, ignore_errors=True)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main_stress()
@@ -0,0 +1,21 @@
+# ============================================================
+#            PACOTE DO GERENCIADOR DE ESTOQUES
+# ============================================================
+#
+# Importar o pacote (ou qualquer módulo dele) não abre o banco nem grava nada:
+# a conexão só é criada no primeiro uso de conexao()/conexao_leitura(), com o
+# caminho de banco.DB_FILE (variável ESTOQUE_DB ou configurar_banco), e o
+# esquema é conferido uma vez por processo pelo user_version gravado.
+#
+#   esquema         migrações (PRAGMA user_version)
+#   instrumentacao  tempo de cada SQL e latência por operação
+#   banco           conexões por thread, criadas sob demanda
+#   terminal        leitura de números do teclado
+#   usuarios        senhas, login e usuário logado
+#   produtos        produtos padrão, busca, CRUD, estoque baixo, entrada/saída
+#   historico       paginação e listagens de vendas/movimentações
+#   cadastros       clientes e fornecedores
+#   vendas          registro de vendas (carrinho)
+#   importacao      importação em lote (CSV / JSON Lines)
+#   relatorios      relatório financeiro e vendas por período
+#   menus           menus do terminal e tela de login
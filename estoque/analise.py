@@ -0,0 +1,223 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import multiprocessing  # Processos que somam cada fatia do histórico
+import os               # Número de núcleos
+from concurrent.futures import ProcessPoolExecutor  # Pool de processos
+from datetime import datetime, timedelta  # Divisão do período em fatias
+from itertools import repeat  # Mesmo motor para todas as fatias do pool
+
+from . import banco
+from .arquivamento import fonte_historico
+from .banco import abrir_conexao, conexao_leitura
+from .dinheiro import reais, somar_por_produto
+from .historico import pedir_data
+from .instrumentacao import medir_operacao
+
+
+# ============================================================
+#     ANÁLISE DE VENDAS EM PARALELO (FATIAS DE DATA + PROCESSOS)
+# ============================================================
+#
+# Um relatório sobre anos de vendas é uma soma grande numa consulta só, que o
+# SQLite faz num núcleo. Aqui o período é dividido em fatias de datas e cada
+# fatia é somada por um processo do pool, com a sua própria conexão somente
+# leitura (e o arquivo morto anexado, se houver). O processo principal junta
+# os resultados parciais: por produto, somar fatias dá o mesmo que somar tudo.
+#
+# O pool usa "spawn": os processos não herdam conexões abertas nem a thread do
+# escritor, e o comportamento é o mesmo no Windows.
+#
+# Cada fatia pode ser somada pelo SQLite (GROUP BY, motor "sql") ou lida em
+# blocos e somada como vetores de inteiros (motor "vetorizado", com numpy se
+# instalado). Os valores são centavos inteiros: os dois motores e qualquer
+# número de processos dão exatamente o mesmo total.
+
+# Fatias por processo: mais fatias equilibram melhor períodos com movimento
+# desigual (dezembro vende mais que fevereiro), ao custo de mais consultas
+FATIAS_POR_PROCESSO = 4
+
+# Produtos no ranking de mais vendidos
+TOP_PRODUTOS = 10
+
+MOTORES_ANALISE = ("sql", "vetorizado")
+
+class ResultadoAnalise:
+
+    #Totais do período, soma por produto e o ranking.
+
+    __slots__ = ("data_inicio", "data_fim", "num_vendas", "quantidade", "receita", "custo", "por_produto", "fatias")
+
+    def __init__(self, data_inicio, data_fim, por_produto, fatias):
+        self.data_inicio = data_inicio
+        self.data_fim = data_fim
+        self.por_produto = por_produto      # produto_id -> [nome, vendas, quantidade, receita, custo] (centavos)
+        self.fatias = fatias
+        self.num_vendas = sum(p[1] for p in por_produto.values())
+        self.quantidade = sum(p[2] for p in por_produto.values())
+        self.receita = sum(p[3] for p in por_produto.values())
+        self.custo = sum(p[4] for p in por_produto.values())
+
+    @property
+    def margem(self):
+        return self.receita - self.custo
+
+    def mais_vendidos(self, n=TOP_PRODUTOS, por="receita"):
+
+        #[(produto_id, nome, vendas, quantidade, receita, custo)] dos n maiores por "receita" ou "quantidade".
+
+        posicao = {"quantidade": 2, "receita": 3}[por]
+        ordenados = sorted(self.por_produto.items(), key=lambda item: (-item[1][posicao], item[0]))
+        return [(pid, *valores) for pid, valores in ordenados[:n]]
+
+def dividir_periodo(data_inicio, data_fim, fatias):
+
+    #Divide [data_inicio, data_fim] (AAAA-MM-DD, fim inclusivo) em até "fatias"
+    #intervalos [inicio, fim) de dias inteiros, cobrindo o período sem sobra.
+
+    inicio = datetime.strptime(data_inicio, "%Y-%m-%d")
+    fim = datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)
+    dias = (fim - inicio).days
+    fatias = max(1, min(fatias, dias))
+
+    limites = [inicio + timedelta(days=dias * i // fatias) for i in range(fatias + 1)]
+    return [(a.strftime("%Y-%m-%d"), b.strftime("%Y-%m-%d")) for a, b in zip(limites, limites[1:])]
+
+def _iniciar_processo(caminho):
+
+    #Cada processo do pool aponta para o mesmo arquivo de banco do principal.
+
+    banco.configurar_banco(caminho)
+
+def _somar_fatia(intervalo, motor="sql"):
+
+    #Soma por produto das vendas com inicio <= data < fim.
+    #Roda no processo do pool: conexão somente leitura própria, fechada no fim.
+
+    inicio, fim = intervalo
+    conn = banco.conexao_leitura() if banco.em_memoria() else abrir_conexao(somente_leitura=True)
+    try:
+        vendas = fonte_historico(conn, "vendas")
+        if motor == "sql":
+            return conn.execute(f"""
+                SELECT produto_id, MAX(nome_produto), COUNT(*), SUM(quantidade), SUM(total_centavos),
+                       SUM(quantidade * COALESCE(custo_centavos, 0))
+                FROM {vendas}
+                WHERE data >= ? AND data < ?
+                GROUP BY produto_id
+            """, (inicio, fim)).fetchall()
+
+        # Vetorizado: só as colunas numéricas, em blocos; o nome do produto é
+        # preenchido depois pelo cadastro atual
+        cursor = conn.execute(f"""
+            SELECT produto_id, quantidade, total_centavos, quantidade * COALESCE(custo_centavos, 0)
+            FROM {vendas}
+            WHERE data >= ? AND data < ?
+        """, (inicio, fim))
+        return [(pid, None, *somas) for pid, somas in somar_por_produto(cursor).items()]
+    finally:
+        if not banco.em_memoria():
+            conn.close()
+
+def periodo_vendas():
+
+    #(primeiro dia, último dia) com vendas, contando o arquivo morto; (None, None) sem vendas.
+
+    conn = conexao_leitura()
+    primeira, ultima = conn.execute(f"SELECT MIN(data), MAX(data) FROM {fonte_historico(conn, 'vendas')}").fetchone()
+    if primeira is None:
+        return None, None
+    return primeira[:10], ultima[:10]
+
+@medir_operacao("analise_vendas")
+def analisar_vendas(data_inicio=None, data_fim=None, processos=None, fatias=None, motor="sql"):
+
+    #Totais, receita/margem por produto e ranking do período (datas AAAA-MM-DD,
+    #fim inclusivo; sem datas = todo o histórico), somando as fatias em
+    #"processos" processos (padrão: um por núcleo; 1 = sem pool) com o
+    #"motor" escolhido (MOTORES_ANALISE).
+    #Banco em memória: sempre num processo só (os outros não o enxergariam).
+
+    if motor not in MOTORES_ANALISE:
+        raise ValueError(f"Motor inválido: {motor} (use {' ou '.join(MOTORES_ANALISE)}).")
+
+    primeira, ultima = periodo_vendas()
+    data_inicio = data_inicio or primeira
+    data_fim = data_fim or ultima
+    if data_inicio is None or data_fim is None or data_inicio > data_fim:
+        return ResultadoAnalise(data_inicio, data_fim, {}, 0)
+
+    processos = 1 if banco.em_memoria() else (processos or os.cpu_count() or 1)
+    intervalos = dividir_periodo(data_inicio, data_fim, fatias or processos * FATIAS_POR_PROCESSO)
+
+    if processos == 1:
+        parciais = map(_somar_fatia, intervalos, repeat(motor))
+        por_produto = _juntar(parciais)
+    else:
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(processos, mp_context=contexto, initializer=_iniciar_processo,
+                                 initargs=(os.path.abspath(banco.DB_FILE),)) as pool:
+            por_produto = _juntar(pool.map(_somar_fatia, intervalos, repeat(motor)))
+
+    # Nome atual do produto (o da venda fica para produtos excluídos; no
+    # motor vetorizado, produto excluído aparece pelo ID)
+    if por_produto:
+        ids = list(por_produto)
+        conn = conexao_leitura()
+        for i in range(0, len(ids), 900):
+            lote = ids[i:i + 900]
+            marcadores = ", ".join("?" for _ in lote)
+            for pid, nome in conn.execute(f"SELECT id, nome FROM produtos WHERE id IN ({marcadores})", lote):
+                por_produto[pid][0] = nome
+
+    for pid, valores in por_produto.items():
+        if valores[0] is None:
+            valores[0] = f"Produto {pid}"
+
+    return ResultadoAnalise(data_inicio, data_fim, por_produto, len(intervalos))
+
+def _juntar(parciais):
+
+    #Soma os resultados parciais das fatias, produto a produto.
+
+    por_produto = {}
+    for linhas in parciais:
+        for pid, nome, vendas, quantidade, receita, custo in linhas:
+            atual = por_produto.get(pid)
+            if atual is None:
+                por_produto[pid] = [nome, vendas, quantidade, receita, custo]
+            else:
+                atual[1] += vendas
+                atual[2] += quantidade
+                atual[3] += receita
+                atual[4] += custo
+    return por_produto
+
+def relatorio_analise():
+
+    #Relatório do menu: totais do período e os produtos que mais faturaram.
+
+    data_inicio = pedir_data("Data inicial (AAAA-MM-DD, Enter = início do histórico): ")
+    data_fim = pedir_data("Data final (AAAA-MM-DD, Enter = última venda): ")
+
+    resultado = analisar_vendas(data_inicio, data_fim)
+
+    if not resultado.num_vendas:
+        print("Nenhuma venda no período.")
+        return
+
+    pct = resultado.margem / resultado.receita * 100 if resultado.receita else 0
+    print(f"\n--- ANÁLISE DE VENDAS ({resultado.data_inicio} a {resultado.data_fim}) ---")
+    print(f"Vendas: {resultado.num_vendas} | Unidades: {resultado.quantidade}")
+    print(f"Receita: R$ {reais(resultado.receita):.2f} | Custo: R$ {reais(resultado.custo):.2f} | "
+          f"Margem: R$ {reais(resultado.margem):.2f} ({pct:.1f}%)")
+
+    print("\n" + "-"*96)
+    print(f"{'#':>3} | {'ID':<6} | {'Produto':<28} | {'Unid.':>8} | {'Receita':>13} | {'Margem':>13} | {'%':>6}")
+    print("-"*96)
+    for posicao, (pid, nome, _, qtd, receita, custo) in enumerate(resultado.mais_vendidos(), 1):
+        margem = receita - custo
+        pct = margem / receita * 100 if receita else 0
+        print(f"{posicao:>3} | {pid:<6} | {nome:<28.28} | {qtd:>8} | R${reais(receita):>11.2f} | R${reais(margem):>11.2f} | {pct:>5.1f}%")
+    print("-"*96)
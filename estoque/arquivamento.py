@@ -0,0 +1,329 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import glob             # Procura os arquivos de arquivo morto ao lado do banco
+import os               # Caminhos dos arquivos por ano
+import re               # Extrai o ano do nome do arquivo
+import sqlite3          # Limite de bancos anexados por conexão
+import time             # Medição de tempo (linhas por segundo)
+from datetime import datetime  # Validação da data de corte
+
+from . import banco
+from .banco import TENTATIVAS_OCUPADO, banco_ocupado, conexao, esperar_ocupado
+from .conciliacao import registrar_checkpoint
+from .esquema import SQL_CENTAVOS
+from .instrumentacao import medir_operacao
+
+
+# ============================================================
+#     ARQUIVO MORTO DE VENDAS E MOVIMENTAÇÕES (UM BANCO POR ANO)
+# ============================================================
+#
+# vendas e movimentacoes só crescem. O comando "arquivar" move as linhas
+# anteriores a uma data de corte para bancos separados, um por ano, ao lado do
+# banco principal (estoque.db -> estoque.arquivo-2023.db), em lotes: cada lote
+# é copiado e apagado numa transação curta, sem segurar a trava de escrita.
+#
+# As listagens do histórico continuam vendo tudo: se existe algum arquivo, a
+# conexão faz ATTACH de cada um e cria views temporárias (todas_vendas,
+# todas_movimentacoes) com UNION ALL da tabela do banco principal e das tabelas
+# arquivadas. Sem arquivos, as consultas usam as tabelas direto, como antes.
+#
+# O resumo financeiro e os agregados por período não mudam ao arquivar: são
+# mantidos por triggers de INSERT, e as linhas apagadas continuam somadas.
+#
+# Em WAL, um commit que envolve dois bancos é atômico em cada um, não nos dois
+# juntos: uma queda no meio do lote pode deixar linhas copiadas e ainda não
+# apagadas. A cópia usa INSERT OR IGNORE pelo id, então rodar o comando de
+# novo termina o lote sem duplicar nada.
+#
+# Arquivos gravados antes da migração 10 guardam os valores em reais (REAL).
+# Na leitura, a view converte esses arquivos para centavos; o próximo
+# "arquivar" que escrever no arquivo converte as colunas de vez.
+#
+# No banco principal, "vendas" é uma view sobre vendas_compactas (migração 12:
+# forma de pagamento e cliente por id). O arquivo guarda as colunas da view,
+# por extenso: cada arquivo continua legível sozinho, sem os dicionários do
+# banco principal. A cópia lê a view; a busca por data e a remoção usam a tabela.
+
+# Tabelas arquivadas: colunas copiadas e índices do histórico no arquivo
+TABELAS_ARQUIVADAS = {
+    "vendas": {
+        "tabela": "vendas_compactas",       # onde as linhas ficam no banco principal
+        "colunas": ("id, produto_id, nome_produto, quantidade, data, unitario_centavos, total_centavos, "
+                    "forma_pagamento, consumidor, custo_centavos"),
+        "criar": """
+            CREATE TABLE IF NOT EXISTS {banco}.vendas (
+                id INTEGER PRIMARY KEY,
+                produto_id INTEGER NOT NULL,
+                nome_produto TEXT NOT NULL,
+                quantidade INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                unitario_centavos INTEGER NOT NULL,
+                total_centavos INTEGER NOT NULL,
+                forma_pagamento TEXT NOT NULL,
+                consumidor TEXT,
+                custo_centavos INTEGER
+            )
+        """,
+        "indices": (
+            "CREATE INDEX IF NOT EXISTS {banco}.idx_vendas_data ON vendas (data)",
+            "CREATE INDEX IF NOT EXISTS {banco}.idx_vendas_produto ON vendas (produto_id, data, quantidade, total_centavos)",
+        ),
+        # Arquivos em reais (antes da migração 10): reconhecidos pela coluna
+        # antiga, lidos com conversão e convertidos antes de receber linhas
+        "legado": {
+            "coluna": "valor_total",
+            "ler": ("id, produto_id, nome_produto, quantidade, data, "
+                    f"{SQL_CENTAVOS.format('valor_unitario')} AS unitario_centavos, "
+                    f"{SQL_CENTAVOS.format('valor_total')} AS total_centavos, "
+                    "forma_pagamento, consumidor, "
+                    f"{SQL_CENTAVOS.format('custo_unitario')} AS custo_centavos"),
+            "converter": (
+                "DROP INDEX IF EXISTS {banco}.idx_vendas_produto",
+                "ALTER TABLE {banco}.vendas ADD COLUMN unitario_centavos INTEGER NOT NULL DEFAULT 0",
+                "ALTER TABLE {banco}.vendas ADD COLUMN total_centavos INTEGER NOT NULL DEFAULT 0",
+                "ALTER TABLE {banco}.vendas ADD COLUMN custo_centavos INTEGER",
+                f"""
+                UPDATE {{banco}}.vendas SET unitario_centavos = {SQL_CENTAVOS.format("valor_unitario")},
+                                            total_centavos = {SQL_CENTAVOS.format("valor_total")},
+                                            custo_centavos = {SQL_CENTAVOS.format("custo_unitario")}
+                """,
+                "ALTER TABLE {banco}.vendas DROP COLUMN valor_unitario",
+                "ALTER TABLE {banco}.vendas DROP COLUMN valor_total",
+                "ALTER TABLE {banco}.vendas DROP COLUMN custo_unitario",
+            ),
+        },
+    },
+    "movimentacoes": {
+        "colunas": "id, produto_id, tipo, quantidade, data, usuario",
+        "criar": """
+            CREATE TABLE IF NOT EXISTS {banco}.movimentacoes (
+                id INTEGER PRIMARY KEY,
+                produto_id INTEGER NOT NULL,
+                tipo TEXT NOT NULL,
+                quantidade INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                usuario TEXT
+            )
+        """,
+        "indices": (
+            "CREATE INDEX IF NOT EXISTS {banco}.idx_movimentacoes_data ON movimentacoes (data)",
+            "CREATE INDEX IF NOT EXISTS {banco}.idx_movimentacoes_produto ON movimentacoes (produto_id, data, tipo, quantidade)",
+        ),
+    },
+}
+
+# Linhas movidas por transação
+TAMANHO_LOTE_ARQUIVO = 2000
+
+def caminho_arquivo(ano):
+
+    #Arquivo morto de um ano, ao lado do banco principal.
+
+    raiz, _ = os.path.splitext(banco.DB_FILE)
+    return f"{raiz}.arquivo-{ano}.db"
+
+def arquivos_existentes():
+
+    #{ano: caminho} dos arquivos mortos do banco atual (vazio em memória).
+
+    if banco.em_memoria():
+        return {}
+
+    raiz, _ = os.path.splitext(banco.DB_FILE)
+    arquivos = {}
+    for caminho in glob.glob(glob.escape(raiz) + ".arquivo-*.db"):
+        achado = re.search(r"\.arquivo-(\d{4})\.db$", caminho)
+        if achado:
+            arquivos[int(achado.group(1))] = caminho
+    return dict(sorted(arquivos.items()))
+
+def _nome_anexo(ano):
+    return f"arquivo_{ano}"
+
+def _legado(conn, nome, tabela):
+
+    #Definição "legado" da tabela se o arquivo anexado "nome" ainda está no formato antigo.
+
+    legado = TABELAS_ARQUIVADAS[tabela].get("legado")
+    if legado is None:
+        return None
+    colunas = {linha[1] for linha in conn.execute(f"PRAGMA {nome}.table_info({tabela})")}
+    return legado if legado["coluna"] in colunas else None
+
+def anexar_arquivos(conn, arquivos=None):
+
+    #Faz ATTACH dos arquivos mortos que ainda não estão nesta conexão e
+    #(re)cria as views temporárias com UNION ALL quando o conjunto muda.
+    #Não pode rodar dentro de uma transação (ATTACH não deixa).
+
+    arquivos = arquivos_existentes() if arquivos is None else arquivos
+    anexados = {linha[1] for linha in conn.execute("PRAGMA database_list")}
+
+    novos = [ano for ano in arquivos if _nome_anexo(ano) not in anexados]
+    limite = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    if len(anexados) - 2 + len(novos) > limite:     # main e temp não contam
+        raise RuntimeError(f"Arquivos mortos demais para anexar ({len(arquivos)}; limite do SQLite: {limite}).")
+
+    for ano in novos:
+        conn.execute(f"ATTACH DATABASE ? AS {_nome_anexo(ano)}", (arquivos[ano],))
+
+    existentes = dict(conn.execute("SELECT name, sql FROM temp.sqlite_master WHERE type = 'view'"))
+    for tabela, definicao in TABELAS_ARQUIVADAS.items():
+        view = f"todas_{tabela}"
+        # A view que lê algum arquivo no formato antigo é refeita a cada vez:
+        # outro processo pode ter convertido o arquivo desde a última leitura
+        legado = definicao.get("legado")
+        lendo_legado = legado is not None and legado["coluna"] in existentes.get(view, "")
+        if not novos and view in existentes and not lendo_legado:
+            continue
+        partes = [f"SELECT {definicao['colunas']} FROM main.{tabela}"]
+        for ano in arquivos:
+            legado = _legado(conn, _nome_anexo(ano), tabela)
+            colunas = legado["ler"] if legado else definicao["colunas"]
+            partes.append(f"SELECT {colunas} FROM {_nome_anexo(ano)}.{tabela}")
+        conn.execute(f"DROP VIEW IF EXISTS temp.{view}")
+        conn.execute(f"CREATE TEMP VIEW {view} AS " + " UNION ALL ".join(partes))
+
+def fonte_historico(conn, tabela):
+
+    #Nome a usar no FROM para ler "vendas" ou "movimentacoes" inteiras:
+    #a própria tabela se não há arquivo morto, senão a view temporária que
+    #junta o banco principal e os arquivos (anexados aqui, se preciso).
+
+    arquivos = arquivos_existentes()
+    if not arquivos:
+        return tabela
+    anexar_arquivos(conn, arquivos)
+    return f"temp.todas_{tabela}"
+
+
+# ============================================================
+#                 COMANDO "ARQUIVAR" (EM LOTES)
+# ============================================================
+
+def _preparar_arquivo(conn, ano):
+
+    #Anexa (criando, se preciso) o arquivo morto do ano à conexão de escrita.
+
+    nome = _nome_anexo(ano)
+    if nome not in {linha[1] for linha in conn.execute("PRAGMA database_list")}:
+        conn.execute(f"ATTACH DATABASE ? AS {nome}", (caminho_arquivo(ano),))
+        # WAL também no arquivo: quem estiver lendo o histórico não trava o lote
+        conn.execute(f"PRAGMA {nome}.journal_mode = WAL")
+
+    conn.execute("BEGIN")
+    try:
+        for tabela, definicao in TABELAS_ARQUIVADAS.items():
+            legado = _legado(conn, nome, tabela)
+            if legado:
+                # A view desta conexão cita as colunas antigas (é refeita na próxima leitura)
+                conn.execute(f"DROP VIEW IF EXISTS temp.todas_{tabela}")
+                for sql in legado["converter"]:
+                    conn.execute(sql.format(banco=nome))
+            conn.execute(definicao["criar"].format(banco=nome))
+            for indice in definicao["indices"]:
+                conn.execute(indice.format(banco=nome))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return nome
+
+def _mover_lote(conn, tabela, nome, inicio, fim, tamanho):
+
+    #Move até "tamanho" linhas com inicio <= data < fim para o arquivo "nome".
+    #Retorna quantas linhas foram movidas (0 = terminou).
+
+    definicao = TABELAS_ARQUIVADAS[tabela]
+    colunas = definicao["colunas"]
+    origem = definicao.get("tabela", tabela)
+
+    for tentativa in range(TENTATIVAS_OCUPADO):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            ids = [linha[0] for linha in conn.execute(
+                f"SELECT id FROM main.{origem} WHERE data >= ? AND data < ? ORDER BY data LIMIT ?",
+                (inicio, fim, tamanho),
+            )]
+            if ids:
+                marcadores = ", ".join("?" for _ in ids)
+                conn.execute(f"""
+                    INSERT OR IGNORE INTO {nome}.{tabela} ({colunas})
+                    SELECT {colunas} FROM main.{tabela} WHERE id IN ({marcadores})
+                """, ids)
+                conn.execute(f"DELETE FROM main.{origem} WHERE id IN ({marcadores})", ids)
+            conn.commit()
+            return len(ids)
+        except Exception as erro:
+            if conn.in_transaction:
+                conn.rollback()
+            if not banco_ocupado(erro) or tentativa == TENTATIVAS_OCUPADO - 1:
+                raise
+            esperar_ocupado(tentativa)
+
+@medir_operacao("arquivar_historico")
+def arquivar_historico(corte, tamanho=TAMANHO_LOTE_ARQUIVO, compactar=False, mostrar=True):
+
+    #Move vendas e movimentações com data anterior a "corte" (AAAA-MM-DD)
+    #para os arquivos mortos por ano. compactar=True roda VACUUM no fim, para
+    #o arquivo do banco principal encolher (senão as páginas livres são
+    #reaproveitadas pelas próximas gravações).
+    #Retorna {tabela: linhas movidas}.
+
+    datetime.strptime(corte, "%Y-%m-%d")
+    if banco.em_memoria():
+        raise RuntimeError("Não há como arquivar um banco em memória.")
+
+    # Checkpoint antes: a conciliação do estoque só soma movimentações
+    # posteriores a ele, que ficam todas no banco principal
+    registrar_checkpoint("arquivamento")
+
+    conn = conexao()
+    movidas = {}
+    inicio_tempo = time.perf_counter()
+
+    for tabela, definicao in TABELAS_ARQUIVADAS.items():
+        movidas[tabela] = 0
+        origem = definicao.get("tabela", tabela)
+        primeira = conn.execute(f"SELECT MIN(data) FROM main.{origem} WHERE data < ?", (corte,)).fetchone()[0]
+        if primeira is None:
+            continue
+
+        for ano in range(int(primeira[:4]), int(corte[:4]) + 1):
+            inicio, fim = f"{ano}-01-01", min(f"{ano + 1}-01-01", corte)
+            nome = None
+            while True:
+                if nome is None:
+                    # Só cria o arquivo do ano se houver o que mover
+                    if conn.execute(f"SELECT 1 FROM main.{origem} WHERE data >= ? AND data < ? LIMIT 1",
+                                    (inicio, fim)).fetchone() is None:
+                        break
+                    nome = _preparar_arquivo(conn, ano)
+
+                n = _mover_lote(conn, tabela, nome, inicio, fim, tamanho)
+                if not n:
+                    break
+                movidas[tabela] += n
+                if mostrar:
+                    print(f"\r{tabela} {ano}: {movidas[tabela]} linha(s) arquivada(s)", end="", flush=True)
+
+        if mostrar and movidas[tabela]:
+            print()
+
+    # Desanexa: a conexão de escrita volta a ver só o banco principal
+    for _, nome, _ in conn.execute("PRAGMA database_list").fetchall():
+        if nome.startswith("arquivo_"):
+            conn.execute(f"DETACH DATABASE {nome}")
+
+    if compactar:
+        conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    if mostrar:
+        total = sum(movidas.values())
+        duracao = time.perf_counter() - inicio_tempo
+        print(f"✔ {total} linha(s) arquivada(s) em {duracao:.1f}s (antes de {corte}).")
+    return movidas
@@ -0,0 +1,352 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import glob             # Procura as cópias guardadas na pasta
+import gzip             # Compressão das cópias (.db.gz)
+import hashlib          # Confere a cópia comprimida com a original
+import os               # Caminhos, fsync e troca atômica do arquivo
+import re               # Data da cópia no nome do arquivo
+import sqlite3          # API de backup online e verificação da cópia
+import tempfile         # Arquivo descomprimido da verificação
+import threading        # Backup em segundo plano
+import time             # Pausa entre passos e tempo total
+from datetime import datetime  # Data no nome da cópia
+
+from . import banco
+from .instrumentacao import operacao
+
+
+# ============================================================
+#        BACKUP ONLINE (API DE BACKUP DO SQLITE, EM PASSOS)
+# ============================================================
+#
+# Copiar estoque.db com o programa aberto pode gravar um arquivo corrompido
+# (páginas de antes e de depois de um commit). A API de backup do SQLite
+# copia o banco página a página numa conexão própria, numa thread separada:
+# "paginas" por passo e uma pausa entre os passos, então as vendas continuam
+# sendo gravadas enquanto a cópia anda.
+#
+# A conexão de origem segura uma transação de leitura durante toda a cópia.
+# Em WAL ela não trava ninguém (as vendas vão para o WAL) e a cópia é o banco
+# como estava no início: sem ela, cada commit de outra conexão faz a API
+# recomeçar do zero, e com vendas o tempo todo a cópia nunca termina. O custo
+# é o WAL crescer enquanto a cópia anda (o checkpoint não passa do leitor):
+# pausas maiores deixam cada passo mais leve, mas seguram o WAL por mais tempo.
+#
+# Cada cópia passa por PRAGMA integrity_check, é comprimida com gzip para
+# <banco>.backup-AAAAMMDD-HHMMSS.db.gz (o nome final só aparece com o arquivo
+# completo e conferido) e as mais antigas além de "guardar" são apagadas.
+# Os arquivos mortos (estoque.arquivo-AAAA.db) não entram: não mudam depois
+# do "arquivar" e podem ser copiados como arquivos comuns.
+
+# Páginas copiadas por passo (com páginas de 4 KB, 1024 = 4 MB)
+PAGINAS_POR_PASSO = 1024
+
+# Segundos de pausa entre um passo e o próximo
+PAUSA_PASSO = 0.005
+
+# Cópias mantidas na pasta (as mais antigas são apagadas; 0 = todas)
+BACKUPS_GUARDADOS = 7
+
+# Nível do gzip (1 = mais rápido, 9 = menor)
+NIVEL_COMPRESSAO_BACKUP = 6
+
+# Bytes lidos por vez na compressão e na verificação
+BLOCO_BACKUP = 1024 * 1024
+
+class BackupCancelado(Exception):
+    pass
+
+def pasta_backups():
+
+    #Pasta padrão das cópias: a do banco.
+
+    return os.path.dirname(os.path.abspath(banco.DB_FILE))
+
+def _nome_base():
+    return os.path.splitext(os.path.basename(banco.DB_FILE))[0]
+
+def _ordem_backup(caminho):
+
+    #Chave de ordenação: data do nome e o contador de cópias no mesmo segundo.
+
+    achado = re.search(r"\.backup-(\d{8}-\d{6})(?:-(\d+))?\.db\.gz$", caminho)
+    return (achado.group(1), int(achado.group(2) or 0)) if achado else ("", 0)
+
+def listar_backups(pasta=None):
+
+    #Cópias do banco atual na pasta, da mais antiga para a mais recente.
+
+    padrao = os.path.join(glob.escape(pasta or pasta_backups()), glob.escape(_nome_base()) + ".backup-*.db.gz")
+    return sorted((c for c in glob.glob(padrao) if _ordem_backup(c)[0]), key=_ordem_backup)
+
+def _hash_arquivo(f):
+    resumo = hashlib.sha256()
+    while bloco := f.read(BLOCO_BACKUP):
+        resumo.update(bloco)
+    return resumo.hexdigest()
+
+class Backup:
+
+    #Thread que faz uma cópia: backup em passos, integrity_check, gzip e rotação.
+    #copiadas/total: páginas (andamento); fase: 'copiando', 'verificando',
+    #'comprimindo', 'concluido', 'cancelado' ou 'erro'. aguardar() espera e
+    #devolve o resumo (ou levanta o erro da thread).
+
+    def __init__(self, pasta=None, paginas=PAGINAS_POR_PASSO, pausa=PAUSA_PASSO, guardar=BACKUPS_GUARDADOS):
+        if banco.em_memoria():
+            raise RuntimeError("Não há como fazer backup de um banco em memória.")
+        if paginas == 0:
+            raise ValueError("Páginas por passo não pode ser 0 (use -1 para copiar tudo de uma vez).")
+
+        self.pasta = pasta or pasta_backups()
+        self.paginas = paginas
+        self.pausa = pausa
+        self.guardar = guardar
+        self.fase = "copiando"
+        self.copiadas = 0
+        self.total = 0
+        self.passos = 0
+        self.reinicios = 0
+        self.segundos_copia = None
+        self.resultado = None
+        self.erro = None
+        self._cancelar = threading.Event()
+        self._inicio = time.perf_counter()
+
+        # O arquivo precisa existir e estar migrado antes da conexão somente leitura
+        banco.conexao()
+        os.makedirs(self.pasta, exist_ok=True)
+
+        self.thread = threading.Thread(target=self._rodar, name="estoque-backup", daemon=True)
+        self.thread.start()
+
+    def em_andamento(self):
+        return self.thread.is_alive()
+
+    def cancelar(self):
+
+        #Interrompe a cópia no próximo passo (verificação e compressão vão até o fim).
+
+        self._cancelar.set()
+        self.thread.join()
+
+    def aguardar(self):
+        self.thread.join()
+        if self.erro is not None:
+            raise self.erro
+        return self.resultado
+
+    def _passo(self, status, restantes, total):
+
+        #Chamado pela API de backup depois de cada passo.
+
+        if self.total and total - restantes < self.copiadas:
+            self.reinicios += 1     # a origem mudou fora da transação: recomeçou
+        self.copiadas, self.total = total - restantes, total
+        self.passos += 1
+        if self._cancelar.is_set():
+            raise BackupCancelado()
+        if self.pausa > 0:
+            time.sleep(self.pausa)
+
+    def _destino(self):
+
+        #<pasta>/<banco>.backup-AAAAMMDD-HHMMSS.db.gz (com -N se já existe uma no mesmo segundo).
+
+        raiz = os.path.join(self.pasta, f"{_nome_base()}.backup-{datetime.now():%Y%m%d-%H%M%S}")
+        destino, n = f"{raiz}.db.gz", 1
+        while os.path.exists(destino):
+            destino, n = f"{raiz}-{n}.db.gz", n + 1
+        return destino
+
+    def _copiar(self, copia):
+
+        #Backup da origem para "copia" (um .db comum). Devolve (versão do esquema, páginas).
+
+        origem = banco.abrir_conexao(somente_leitura=True)
+        destino = sqlite3.connect(copia)
+        # A cópia descomprimida é rascunho (vira .gz e é apagada): sem fsync dela,
+        # que disputaria o disco com o fsync de cada venda
+        destino.execute("PRAGMA synchronous = OFF")
+        try:
+            # Fixa o retrato do banco: os commits das outras conexões não reiniciam a cópia
+            origem.execute("BEGIN")
+            origem.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            origem.backup(destino, pages=self.paginas, progress=self._passo)
+            origem.rollback()
+            self.segundos_copia = time.perf_counter() - self._inicio
+
+            self.fase = "verificando"
+            # A cópia sai com o cabeçalho de WAL da origem: volta a um arquivo só
+            destino.execute("PRAGMA journal_mode = DELETE")
+            erros = [linha[0] for linha in destino.execute("PRAGMA integrity_check")]
+            if erros != ["ok"]:
+                raise RuntimeError(f"Cópia com defeito (integrity_check): {'; '.join(erros[:5])}")
+            versao = destino.execute("PRAGMA user_version").fetchone()[0]
+            paginas = destino.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            destino.close()
+            origem.close()
+        return versao, paginas
+
+    def _comprimir(self, copia, destino):
+
+        #Comprime "copia" em destino + ".parcial", relê e confere o conteúdo e só
+        #então dá o nome final. Devolve o sha256 da cópia descomprimida.
+
+        self.fase = "comprimindo"
+        parcial = destino + ".parcial"
+        resumo = hashlib.sha256()
+
+        with open(copia, "rb") as entrada, open(parcial, "wb") as bruto:
+            with gzip.GzipFile(os.path.basename(destino)[:-3], "wb", NIVEL_COMPRESSAO_BACKUP, bruto) as saida:
+                while bloco := entrada.read(BLOCO_BACKUP):
+                    resumo.update(bloco)
+                    saida.write(bloco)
+            bruto.flush()
+            os.fsync(bruto.fileno())
+
+        # Relê o que foi para o disco (o gzip também confere o CRC no fim)
+        with gzip.open(parcial, "rb") as f:
+            if _hash_arquivo(f) != resumo.hexdigest():
+                raise RuntimeError(f"A cópia comprimida não confere com o banco copiado ({parcial}).")
+
+        os.replace(parcial, destino)
+        return resumo.hexdigest()
+
+    def _rodar(self):
+        destino = self._destino()
+        copia = destino[:-3] + ".parcial"
+
+        try:
+            with operacao("backup"):
+                versao, paginas = self._copiar(copia)
+                sha256 = self._comprimir(copia, destino)
+
+            apagados = []
+            if self.guardar:
+                for antigo in listar_backups(self.pasta)[:-self.guardar]:
+                    os.remove(antigo)
+                    apagados.append(antigo)
+
+            self.resultado = {
+                "arquivo": destino, "versao": versao, "paginas": paginas,
+                "bytes_banco": os.path.getsize(copia), "bytes": os.path.getsize(destino),
+                "sha256": sha256, "passos": self.passos, "reinicios": self.reinicios,
+                "segundos_copia": self.segundos_copia, "segundos": time.perf_counter() - self._inicio,
+                "apagados": apagados,
+            }
+            self.fase = "concluido"
+        except BackupCancelado:
+            self.fase = "cancelado"
+        except Exception as erro:
+            self.erro = erro
+            self.fase = "erro"
+        finally:
+            for parcial in (copia, destino + ".parcial"):
+                if os.path.exists(parcial):
+                    os.remove(parcial)
+
+# Backup em segundo plano iniciado pelo menu (um por vez)
+_backup = None
+
+def iniciar_backup(pasta=None, paginas=PAGINAS_POR_PASSO, pausa=PAUSA_PASSO, guardar=BACKUPS_GUARDADOS):
+
+    #Começa um backup em segundo plano e devolve o Backup (não espera terminar).
+
+    global _backup
+    if _backup is not None and _backup.em_andamento():
+        raise RuntimeError("Já há um backup em andamento.")
+    _backup = Backup(pasta, paginas, pausa, guardar)
+    return _backup
+
+def backup_atual():
+
+    #O último backup iniciado neste processo (None se nenhum).
+
+    return _backup
+
+def aguardar_backup():
+
+    #Espera o backup em segundo plano terminar (ao sair do programa).
+
+    if _backup is not None and _backup.em_andamento():
+        print("Aguardando o backup terminar...")
+        _backup.thread.join()
+
+
+# ============================================================
+#            VERIFICAÇÃO DAS CÓPIAS E COMANDO "BACKUP"
+# ============================================================
+
+def verificar_backup(arquivo):
+
+    #Descomprime a cópia num arquivo temporário e roda PRAGMA integrity_check.
+    #Retorna {"arquivo", "ok", "erros", "versao", "produtos", "vendas"}.
+
+    descritor, temporario = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(os.path.abspath(arquivo)))
+    try:
+        with os.fdopen(descritor, "wb") as saida, gzip.open(arquivo, "rb") as entrada:
+            while bloco := entrada.read(BLOCO_BACKUP):
+                saida.write(bloco)
+
+        conn = sqlite3.connect(temporario)
+        try:
+            erros = [linha[0] for linha in conn.execute("PRAGMA integrity_check")]
+            resumo = {"arquivo": arquivo, "ok": erros == ["ok"], "erros": [] if erros == ["ok"] else erros,
+                      "versao": conn.execute("PRAGMA user_version").fetchone()[0]}
+            if resumo["ok"]:
+                resumo["produtos"] = conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+                resumo["vendas"] = conn.execute("SELECT COUNT(*) FROM vendas").fetchone()[0]
+        finally:
+            conn.close()
+    except (OSError, EOFError, sqlite3.DatabaseError) as erro:
+        # gzip truncado, CRC errado, arquivo que não é banco...
+        return {"arquivo": arquivo, "ok": False, "erros": [str(erro)], "versao": None}
+    finally:
+        os.remove(temporario)
+    return resumo
+
+def comando_backup(acao, pasta=None, paginas=PAGINAS_POR_PASSO, pausa=PAUSA_PASSO, guardar=BACKUPS_GUARDADOS,
+                   arquivo=None):
+
+    #Comando "backup" da linha de comando:
+    #criar      faz uma cópia (com o banco em uso) e apaga as mais antigas
+    #listar     cópias guardadas na pasta
+    #verificar  descomprime e confere a cópia "arquivo" (padrão: a mais recente)
+
+    if acao == "criar":
+        backup = Backup(pasta, paginas, pausa, guardar)
+        while backup.em_andamento():
+            if backup.total:
+                print(f"\r  {backup.fase}: {backup.copiadas:,}/{backup.total:,} páginas "
+                      f"({100 * backup.copiadas / backup.total:.0f}%)", end="", flush=True)
+            time.sleep(0.2)
+        r = backup.aguardar()
+        print(f"\r✔ Backup de {r['bytes_banco'] / 1e6:,.1f} MB ({r['paginas']:,} páginas, "
+              f"{r['reinicios']} reinício(s)) em {r['segundos']:.1f}s -> {r['arquivo']} ({r['bytes'] / 1e6:,.1f} MB)")
+        for antigo in r["apagados"]:
+            print(f"  apagado: {antigo}")
+    elif acao == "listar":
+        copias = listar_backups(pasta)
+        if not copias:
+            print("Nenhum backup encontrado.")
+        for copia in copias:
+            print(f"  {copia} ({os.path.getsize(copia) / 1e6:,.1f} MB)")
+    elif acao == "verificar":
+        if arquivo is None:
+            copias = listar_backups(pasta)
+            if not copias:
+                raise ValueError("Nenhum backup encontrado para verificar.")
+            arquivo = copias[-1]
+        r = verificar_backup(arquivo)
+        if r["ok"]:
+            print(f"✔ {arquivo}: íntegro (esquema {r['versao']}, {r['produtos']:,} produtos, {r['vendas']:,} vendas)")
+        else:
+            print(f"✘ {arquivo}: com defeito")
+            for erro in r["erros"][:10]:
+                print(f"  {erro}")
+    else:
+        raise ValueError(f"Ação inválida: {acao}.")
@@ -0,0 +1,191 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import sqlite3          # Biblioteca para usar banco de dados SQLite (arquivo local)
+import os               # Lê configurações do ambiente
+import random           # Espera aleatória entre tentativas com o banco ocupado
+import threading        # Uma conexão por thread
+import time             # Espera entre tentativas com o banco ocupado
+import pathlib          # Monta a URI file: da conexão somente leitura
+
+from . import instrumentacao
+from .esquema import VERSAO_ESQUEMA, migrar, versao_esquema
+
+
+# ============================================================
+#      CONEXÃO COM O BANCO DE DADOS (WAL + UMA POR THREAD)
+# ============================================================
+
+# Caminho do banco de dados SQLite (pode ser trocado pela variável ESTOQUE_DB
+# ou por configurar_banco). ":memory:" usa um banco em memória, que some
+# quando as conexões são fechadas.
+DB_FILE = os.environ.get("ESTOQUE_DB", "estoque.db")
+
+# Modo do journal. Em WAL, leitores não bloqueiam o escritor e vice-versa,
+# então vários terminais podem usar o mesmo estoque.db ao mesmo tempo.
+MODO_JOURNAL = "WAL"
+
+# Durabilidade das conexões de escrita (PRAGMA synchronous):
+#   FULL    fsync do WAL a cada commit: nada confirmado se perde nem com queda de energia
+#   NORMAL  fsync só nos checkpoints: bem mais rápido; uma queda de energia pode
+#           desfazer os últimos commits (o banco continua íntegro)
+NIVEIS_SINCRONIA = ("FULL", "NORMAL")
+SINCRONIA = os.environ.get("ESTOQUE_SYNC", "FULL").upper()
+
+# Tempo máximo (segundos) esperando outro terminal liberar a escrita
+# antes de desistir com "database is locked"
+BUSY_TIMEOUT = 10.0
+
+# Quando a trava de escrita continua com outro processo depois do BUSY_TIMEOUT,
+# a transação inteira é tentada de novo até TENTATIVAS_OCUPADO vezes, esperando
+# ESPERA_OCUPADO * 2^tentativa segundos (com sorteio, para os processos não
+# voltarem todos juntos).
+TENTATIVAS_OCUPADO = 5
+ESPERA_OCUPADO = 0.05
+
+# Conexões abertas por esta thread (cada thread/processo tem as suas)
+_conexoes = threading.local()
+
+# Bancos cujo esquema este processo já conferiu: {(pid, caminho absoluto)}
+_esquemas_conferidos = set()
+_trava_esquema = threading.Lock()
+
+# Em memória não dá para abrir uma conexão por thread (cada uma veria um banco
+# vazio diferente): todas as threads usam esta, que também serve de leitura.
+_memoria = None
+
+def configurar_banco(caminho):
+
+    #Troca o banco usado pelas próximas conexões. Nada é aberto aqui:
+    #a primeira conexão só acontece no primeiro uso.
+
+    global DB_FILE
+    fechar_conexoes()
+    DB_FILE = caminho
+
+def definir_sincronia(nivel):
+
+    #Troca o nível de durabilidade (FULL ou NORMAL) das próximas conexões de escrita.
+
+    global SINCRONIA
+    nivel = nivel.upper()
+    if nivel not in NIVEIS_SINCRONIA:
+        raise ValueError(f"Sincronia inválida: {nivel} (use {' ou '.join(NIVEIS_SINCRONIA)}).")
+    fechar_conexoes()
+    SINCRONIA = nivel
+
+def em_memoria():
+    return DB_FILE == ":memory:"
+
+def abrir_conexao(somente_leitura=False, entre_threads=False):
+
+    #Abre uma conexão nova com DB_FILE.
+    #Somente leitura: aberta com mode=ro, nunca pega trava de escrita.
+    #entre_threads: pode ser usada por qualquer thread (quem a usa serializa o acesso).
+
+    tipo = instrumentacao.ConexaoInstrumentada if instrumentacao.INSTRUMENTACAO_ATIVA else sqlite3.Connection
+
+    if em_memoria():
+        nova = sqlite3.connect(DB_FILE, check_same_thread=False, factory=tipo)
+    elif somente_leitura:
+        uri = pathlib.Path(os.path.abspath(DB_FILE)).as_uri() + "?mode=ro"
+        nova = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT, factory=tipo,
+                               check_same_thread=not entre_threads)
+    else:
+        nova = sqlite3.connect(DB_FILE, timeout=BUSY_TIMEOUT, factory=tipo,
+                               check_same_thread=not entre_threads)
+        nova.execute(f"PRAGMA journal_mode = {MODO_JOURNAL}")
+        nova.execute(f"PRAGMA synchronous = {SINCRONIA}")
+
+    return nova
+
+def banco_ocupado(erro):
+
+    #True se o erro é "database is locked"/"busy" (vale tentar de novo).
+
+    codigo = getattr(erro, "sqlite_errorcode", None)
+    if codigo is not None:
+        return codigo & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return isinstance(erro, sqlite3.OperationalError) and ("locked" in str(erro) or "busy" in str(erro))
+
+def esperar_ocupado(tentativa):
+    time.sleep(ESPERA_OCUPADO * (2 ** tentativa) * random.uniform(0.5, 1.5))
+
+def conferir_esquema(conn):
+
+    #Migra o banco até VERSAO_ESQUEMA se o user_version gravado for menor.
+    #Roda uma vez por processo e por arquivo: depois disso abrir conexões
+    #novas não custa nem a leitura do PRAGMA.
+
+    chave = (os.getpid(), os.path.abspath(DB_FILE))
+    if chave in _esquemas_conferidos:
+        return
+
+    with _trava_esquema:
+        if chave not in _esquemas_conferidos:
+            if versao_esquema(conn) < VERSAO_ESQUEMA:
+                migrar(conn)
+            _esquemas_conferidos.add(chave)
+
+def _conexao_memoria():
+    global _memoria
+    if _memoria is None:
+        _memoria = abrir_conexao()
+        migrar(_memoria)
+    return _memoria
+
+def _conexao_da_thread(nome, somente_leitura):
+
+    #Devolve a conexão "nome" desta thread, abrindo na primeira vez.
+    #Depois de um fork o processo filho não pode reaproveitar a conexão do pai:
+    #o pid guardado junto detecta isso e abre outra.
+
+    pid = os.getpid()
+    if getattr(_conexoes, "pid", None) != pid:
+        _conexoes.__dict__.clear()
+        _conexoes.pid = pid
+
+    atual = getattr(_conexoes, nome, None)
+    if atual is None:
+        if em_memoria():
+            atual = _conexao_memoria()
+        elif somente_leitura:
+            # mode=ro não cria o arquivo nem migra: a conexão de escrita faz isso antes
+            if (pid, os.path.abspath(DB_FILE)) not in _esquemas_conferidos:
+                conexao()
+            atual = abrir_conexao(True)
+        else:
+            atual = abrir_conexao()
+            conferir_esquema(atual)
+        setattr(_conexoes, nome, atual)
+    return atual
+
+def conexao():
+
+    #Conexão de escrita da thread atual (aberta, e o esquema conferido, no primeiro uso).
+
+    return _conexao_da_thread("escrita", False)
+
+def conexao_leitura():
+
+    #Conexão somente leitura da thread atual: usada pelas listagens e relatórios,
+    #que assim nunca seguram a trava de escrita enquanto uma venda acontece.
+
+    return _conexao_da_thread("leitura", True)
+
+def fechar_conexoes():
+
+    #Fecha as conexões abertas pela thread atual (e o banco em memória, se for o caso).
+
+    global _memoria
+
+    for nome in ("escrita", "leitura"):
+        atual = getattr(_conexoes, nome, None)
+        if atual is not None and atual is not _memoria:
+            atual.close()
+        setattr(_conexoes, nome, None)
+
+    if _memoria is not None:
+        _memoria.close()
+        _memoria = None
@@ -0,0 +1,47 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+from .escritor import executar_escrita
+from .historico import mostrar_paginas, paginar
+from .instrumentacao import operacao
+
+
+# ============================================================
+#                   CLIENTES E FORNECEDORES
+# ============================================================
+
+def cadastrar_cliente():
+    nome = input("Nome: ")
+    contato = input("Contato: ")
+    with operacao("cadastrar_cliente"):
+        executar_escrita(_inserir_contato, "clientes", nome, contato)
+    print("✔ Cliente cadastrado.")
+
+def _inserir_contato(conn, tabela, nome, contato):
+    conn.execute(f"INSERT INTO {tabela} (nome, contato) VALUES (?, ?)", (nome, contato))
+
+def listar_clientes():
+    def imprimir(clientes):
+        for c in clientes:
+            print(f"{c[0]} - {c[1]} ({c[2]})")
+
+    paginas = paginar("SELECT id, nome, contato FROM clientes", (("id", 0),), nome_operacao="listar_clientes")
+    if not mostrar_paginas(paginas, imprimir):
+        print("Nenhum cliente.")
+
+def cadastrar_fornecedor():
+    nome = input("Nome: ")
+    contato = input("Contato: ")
+    with operacao("cadastrar_fornecedor"):
+        executar_escrita(_inserir_contato, "fornecedores", nome, contato)
+    print("✔ Fornecedor cadastrado.")
+
+def listar_fornecedores():
+    def imprimir(fornecedores):
+        for f in fornecedores:
+            print(f"{f[0]} - {f[1]} ({f[2]})")
+
+    paginas = paginar("SELECT id, nome, contato FROM fornecedores", (("id", 0),), nome_operacao="listar_fornecedores")
+    if not mostrar_paginas(paginas, imprimir):
+        print("Nenhum fornecedor.")
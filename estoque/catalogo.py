@@ -0,0 +1,313 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import os               # Limite do cache pelo ambiente; pid do processo dono
+import threading        # O cache é do processo: uma trava protege o acesso
+from collections import OrderedDict  # Ordem de uso para o modo limitado (LRU)
+
+from . import banco
+from .banco import abrir_conexao, conexao
+
+
+# ============================================================
+#          CACHE DO CATÁLOGO DE PRODUTOS EM MEMÓRIA
+# ============================================================
+#
+# Guarda os produtos na memória do processo para consultas por ID e por nome
+# sem ir ao SQLite. Antes de responder, confere se algum outro processo (ou
+# outra conexão deste) gravou no banco:
+#
+#   1. PRAGMA data_version da conexão do cache: só muda quando outra conexão
+#      faz commit. Sem mudança, a resposta sai da memória.
+#   2. Mudou: lê em alteracoes_produtos (mantida por triggers) os produtos com
+#      sequência maior que a última vista e relê só esses. Commits que não
+#      mexeram em produtos custam essa única consulta.
+#
+# Modos:
+#   completo  (limite=None) carrega o catálogo inteiro no primeiro uso
+#   limitado  (limite=N)    guarda no máximo N produtos, descartando os usados
+#                           há mais tempo; quem não está na memória é lido sob
+#                           demanda
+
+# Máximo de produtos em memória (ESTOQUE_CATALOGO_LIMITE; vazio = catálogo inteiro)
+LIMITE_CATALOGO = int(os.environ["ESTOQUE_CATALOGO_LIMITE"]) if os.environ.get("ESTOQUE_CATALOGO_LIMITE") else None
+
+# Acima desta fração do catálogo alterada, recarregar tudo sai mais barato
+FRACAO_RECARGA = 0.25
+
+COLUNAS = "id, nome, venda_centavos, custo_centavos, quantidade, peso, marca, estoque_minimo"
+
+class Produto:
+
+    #Um produto do cache. __slots__ evita o dicionário por objeto: em
+    #catálogos grandes a memória fica perto da dos próprios valores.
+
+    __slots__ = ("id", "nome", "venda_centavos", "custo_centavos", "quantidade", "peso", "marca", "estoque_minimo")
+
+    def __init__(self, linha):
+        (self.id, self.nome, self.venda_centavos, self.custo_centavos,
+         self.quantidade, self.peso, self.marca, self.estoque_minimo) = linha
+
+    def __repr__(self):
+        return f"Produto({self.id}, {self.nome!r}, quantidade={self.quantidade})"
+
+# COLLATE NOCASE do SQLite só junta maiúsculas e minúsculas ASCII (A-Z)
+_MINUSCULAS_ASCII = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def _chave_nome(nome):
+
+    #Chave do índice de nomes em memória: a mesma comparação do COLLATE NOCASE
+    #(e do idx_produtos_nome) usado quando o nome não está na memória, para os
+    #dois modos acharem os mesmos produtos ("ARROZ" acha "Arroz"; "AÇÚCAR" não acha "Açúcar").
+
+    return nome.translate(_MINUSCULAS_ASCII)
+
+class Catalogo:
+
+    #Cache de produtos de um banco, válido para o processo que o criou.
+
+    def __init__(self, limite=LIMITE_CATALOGO):
+        self.limite = limite
+        self.caminho = banco.DB_FILE
+        self.pid = os.getpid()
+        self.produtos = OrderedDict()       # id -> Produto (ordem de uso no modo limitado)
+        self.nomes = {}                     # nome (como no NOCASE) -> {ids}
+        self.completo = False               # todos os produtos do banco estão em memória
+        self.fora_de_ordem = False          # entrou ID menor que o último (reordenar em todos())
+        self.data_version = None
+        self.seq = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.recargas = 0
+        self._trava = threading.RLock()
+        self._conn = None
+
+    # ---------- conexão e invalidação ----------
+
+    def _conexao(self):
+
+        #Conexão própria, somente leitura: o data_version é por conexão, então
+        #ela não pode ser a de uma thread qualquer. O cache é do processo: a
+        #conexão é usada por todas as threads, sempre dentro de _trava.
+        #Em memória só existe a compartilhada.
+
+        if banco.em_memoria():
+            conn = conexao()
+            if conn is not self._conn:      # banco em memória recriado: nada vale mais
+                self._conn = conn
+                self.invalidar()
+            return conn
+
+        if self._conn is None:
+            conexao()   # garante arquivo e esquema antes do mode=ro
+            self._conn = abrir_conexao(somente_leitura=True, entre_threads=True)
+        return self._conn
+
+    def _conferir(self):
+
+        #Deixa a memória igual ao banco, relendo só os produtos alterados.
+
+        conn = self._conexao()
+        # total_changes cobre o banco em memória, em que o cache divide a
+        # conexão com quem grava (data_version não muda com commits próprios)
+        versao = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+        if versao == self.data_version:
+            return
+
+        primeira = self.data_version is None
+        self.data_version = versao
+
+        if primeira:
+            if self.limite is None:
+                self._carregar_tudo()
+            else:
+                self.seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM alteracoes_produtos").fetchone()[0]
+            return
+
+        alterados = conn.execute(f"""
+            SELECT a.produto_id, a.seq, {", ".join("p." + c.strip() for c in COLUNAS.split(","))}
+            FROM alteracoes_produtos a
+            LEFT JOIN produtos p ON p.id = a.produto_id
+            WHERE a.seq > ?
+        """, (self.seq,)).fetchall()
+
+        if not alterados:
+            return
+
+        if self.limite is None and len(alterados) > FRACAO_RECARGA * max(len(self.produtos), 1):
+            self._carregar_tudo()
+            return
+
+        for linha in alterados:
+            pid, seq, dados = linha[0], linha[1], linha[2:]
+            self.seq = max(self.seq, seq)
+            if dados[0] is None:
+                self._remover(pid)
+            elif self.completo:
+                self._guardar(Produto(dados))
+            else:
+                # Modo limitado: quem mudou é relido só se voltar a ser pedido
+                self._remover(pid)
+        self.recargas += 1
+
+    def _carregar_tudo(self):
+        conn = self._conexao()
+        self.produtos.clear()
+        self.nomes.clear()
+
+        # Sequência e produtos lidos no mesmo instantâneo do banco (em memória
+        # a conexão é a de quem grava: lá não existe outro instantâneo)
+        memoria = banco.em_memoria()
+        if not memoria:
+            conn.execute("BEGIN")
+        try:
+            self.seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM alteracoes_produtos").fetchone()[0]
+            for linha in conn.execute(f"SELECT {COLUNAS} FROM produtos ORDER BY id"):
+                self._guardar(Produto(linha))
+        finally:
+            if not memoria:
+                conn.commit()
+
+        self.completo = True
+        self.recargas += 1
+
+    def _guardar(self, produto):
+        velho = self.produtos.get(produto.id)
+        if velho is not None:
+            self._tirar_nome(velho)
+        elif self.produtos and self.limite is None and produto.id < next(reversed(self.produtos)):
+            self.fora_de_ordem = True
+
+        # Substituir a chave existente mantém a posição (ordem por ID)
+        self.produtos[produto.id] = produto
+        self.nomes.setdefault(_chave_nome(produto.nome), set()).add(produto.id)
+
+        if self.limite is not None:
+            self.produtos.move_to_end(produto.id)
+            while len(self.produtos) > self.limite:
+                _, velho = self.produtos.popitem(last=False)
+                self._tirar_nome(velho)
+
+    def _remover(self, pid):
+        velho = self.produtos.pop(pid, None)
+        if velho is not None:
+            self._tirar_nome(velho)
+
+    def _tirar_nome(self, produto):
+        ids = self.nomes.get(_chave_nome(produto.nome))
+        if ids is not None:
+            ids.discard(produto.id)
+            if not ids:
+                del self.nomes[_chave_nome(produto.nome)]
+
+    # ---------- consultas ----------
+
+    def obter(self, pid):
+
+        #Produto pelo ID (ou None se não existir).
+
+        with self._trava:
+            self._conferir()
+
+            produto = self.produtos.get(pid)
+            if produto is not None:
+                self.acertos += 1
+                if self.limite is not None:
+                    self.produtos.move_to_end(pid)
+                return produto
+
+            if self.completo:
+                return None
+
+            self.faltas += 1
+            linha = self._conexao().execute(f"SELECT {COLUNAS} FROM produtos WHERE id=?", (pid,)).fetchone()
+            if linha is None:
+                return None
+            produto = Produto(linha)
+            self._guardar(produto)
+            return produto
+
+    def por_nome(self, nome):
+
+        #Produtos com este nome exato (sem diferenciar maiúsculas ASCII, como o NOCASE), por ID.
+
+        with self._trava:
+            self._conferir()
+
+            if not self.completo:
+                self.faltas += 1
+                for linha in self._conexao().execute(
+                    f"SELECT {COLUNAS} FROM produtos WHERE nome = ? COLLATE NOCASE", (nome,)
+                ):
+                    if linha[0] not in self.produtos:
+                        self._guardar(Produto(linha))
+            else:
+                self.acertos += 1
+
+            ids = self.nomes.get(_chave_nome(nome), ())
+            return sorted((self.produtos[i] for i in ids if i in self.produtos), key=lambda p: p.id)
+
+    def todos(self):
+
+        #Todos os produtos por ID. No modo limitado vêm do banco, sem encher o cache.
+
+        with self._trava:
+            self._conferir()
+            if self.completo:
+                if self.fora_de_ordem:
+                    self.produtos = OrderedDict(sorted(self.produtos.items()))
+                    self.fora_de_ordem = False
+                return list(self.produtos.values())
+
+            # Ainda dentro da trava: a conexão do cache é de todas as threads
+            linhas = self._conexao().execute(f"SELECT {COLUNAS} FROM produtos ORDER BY id")
+            return [Produto(linha) for linha in linhas]
+
+    def invalidar(self):
+
+        #Esquece tudo: a próxima consulta recarrega do banco.
+
+        with self._trava:
+            self.produtos.clear()
+            self.nomes.clear()
+            self.completo = False
+            self.data_version = None
+
+    def fechar(self):
+        with self._trava:
+            if self._conn is not None and not banco.em_memoria():
+                self._conn.close()
+            self._conn = None
+            self.invalidar()
+
+# Cache deste processo (recriado depois de fork ou troca de banco)
+_catalogo = None
+_trava_catalogo = threading.Lock()
+
+def catalogo():
+
+    #Cache de produtos do processo, criado no primeiro uso.
+
+    global _catalogo
+    atual = _catalogo
+    if atual is not None and atual.pid == os.getpid() and atual.caminho == banco.DB_FILE:
+        return atual
+
+    with _trava_catalogo:
+        if _catalogo is None or _catalogo.pid != os.getpid() or _catalogo.caminho != banco.DB_FILE:
+            if _catalogo is not None and _catalogo.pid == os.getpid():
+                _catalogo.fechar()
+            _catalogo = Catalogo(LIMITE_CATALOGO)
+        return _catalogo
+
+def configurar_catalogo(limite=None):
+
+    #Troca o modo do cache: None = catálogo inteiro; N = no máximo N produtos.
+
+    global LIMITE_CATALOGO, _catalogo
+    with _trava_catalogo:
+        if _catalogo is not None and _catalogo.pid == os.getpid():
+            _catalogo.fechar()
+        LIMITE_CATALOGO = limite
+        _catalogo = None
@@ -0,0 +1,182 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+from datetime import datetime  # Data do checkpoint
+
+from .banco import conexao_leitura
+from .escritor import executar_escrita
+from .instrumentacao import medir_operacao
+
+
+# ============================================================
+#     CONCILIAÇÃO DO ESTOQUE COM O LIVRO DE MOVIMENTAÇÕES
+# ============================================================
+#
+# produtos.quantidade é atualizada no lugar; movimentacoes é o livro (ledger)
+# de tudo que entrou e saiu. O saldo pelo livro de um produto é:
+#
+#   saldo no último checkpoint + movimentações com id > ate_movimentacao
+#
+# Conferir ou reconstruir o estoque soma só as movimentações depois do
+# checkpoint, pela chave primária, sem reler o histórico inteiro. Um checkpoint
+# novo é gravado a cada INTERVALO_CHECKPOINT movimentações (ao conciliar) e
+# antes de arquivar o histórico, então as movimentações somadas nunca estão
+# no arquivo morto.
+#
+# O checkpoint guarda o saldo do livro, não o do produto: uma divergência
+# continua aparecendo até ser corrigida (com --corrigir, ou com um ajuste
+# manual de quantidade, que grava a movimentação 'ajuste').
+
+# Efeito de cada movimentação no estoque ('ajuste' já vem com sinal)
+SQL_DELTA_MOVIMENTACAO = "CASE tipo WHEN 'entrada' THEN quantidade WHEN 'ajuste' THEN quantidade ELSE -quantidade END"
+
+# Movimentações desde o último checkpoint que fazem a conciliação gravar outro
+INTERVALO_CHECKPOINT = 50_000
+
+# Checkpoints mantidos (os mais antigos são apagados)
+CHECKPOINTS_MANTIDOS = 5
+
+# Saldo pelo livro de cada produto: último checkpoint + movimentações depois dele
+SQL_SALDOS_LIVRO = f"""
+    WITH ultimo AS (
+        SELECT id, ate_movimentacao FROM checkpoints_estoque ORDER BY id DESC LIMIT 1
+    ),
+    depois AS (
+        SELECT produto_id, SUM({SQL_DELTA_MOVIMENTACAO}) AS delta
+        FROM movimentacoes
+        WHERE id > COALESCE((SELECT ate_movimentacao FROM ultimo), 0)
+        GROUP BY produto_id
+    )
+    SELECT p.id, p.nome, p.quantidade,
+           COALESCE(s.quantidade, 0) + COALESCE(d.delta, 0) AS livro
+    FROM produtos p
+    LEFT JOIN saldos_checkpoint s ON s.checkpoint_id = (SELECT id FROM ultimo) AND s.produto_id = p.id
+    LEFT JOIN depois d ON d.produto_id = p.id
+"""
+
+@medir_operacao("conferir_estoque")
+def conferir_estoque(produto_id=None):
+
+    #Compara produtos.quantidade com o saldo pelo livro.
+    #Retorna (id, nome, quantidade, livro, diferença) dos produtos divergentes.
+
+    cursor = conexao_leitura().cursor()
+
+    filtro, params = "", ()
+    if produto_id is not None:
+        filtro, params = "AND id = ?", (produto_id,)
+
+    cursor.execute(f"""
+        SELECT id, nome, quantidade, livro, quantidade - livro
+        FROM ({SQL_SALDOS_LIVRO})
+        WHERE quantidade != livro {filtro}
+        ORDER BY ABS(quantidade - livro) DESC, id
+    """, params)
+    return cursor.fetchall()
+
+def movimentacoes_desde_checkpoint():
+
+    #Quantas movimentações a conferência precisa somar hoje.
+
+    cursor = conexao_leitura().cursor()
+    cursor.execute("""
+        SELECT COUNT(*) FROM movimentacoes
+        WHERE id > COALESCE((SELECT ate_movimentacao FROM checkpoints_estoque ORDER BY id DESC LIMIT 1), 0)
+    """)
+    return cursor.fetchone()[0]
+
+@medir_operacao("registrar_checkpoint")
+def registrar_checkpoint(origem="conciliacao"):
+
+    #Grava o saldo pelo livro de todos os produtos até a última movimentação.
+    #Retorna o id do checkpoint.
+
+    return executar_escrita(_gravar_checkpoint, origem)
+
+def _gravar_checkpoint(conn, origem):
+    cursor = conn.cursor()
+
+    # Dentro da transação de escrita: nenhuma movimentação entra entre o
+    # cálculo dos saldos e o limite gravado. Os saldos são calculados antes de
+    # inserir o checkpoint novo (que passaria a ser o "último" da consulta).
+    cursor.execute("DROP TABLE IF EXISTS temp.saldos_novos")
+    cursor.execute(f"CREATE TEMP TABLE saldos_novos AS SELECT id, livro FROM ({SQL_SALDOS_LIVRO})")
+
+    cursor.execute("""
+        INSERT INTO checkpoints_estoque (ate_movimentacao, data, origem)
+        SELECT COALESCE(MAX(id), 0), ?, ? FROM movimentacoes
+    """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), origem))
+    novo = cursor.lastrowid
+
+    cursor.execute("""
+        INSERT INTO saldos_checkpoint (checkpoint_id, produto_id, quantidade)
+        SELECT ?, id, livro FROM temp.saldos_novos
+    """, (novo,))
+    cursor.execute("DROP TABLE temp.saldos_novos")
+
+    cursor.execute("""
+        DELETE FROM saldos_checkpoint WHERE checkpoint_id IN (
+            SELECT id FROM checkpoints_estoque ORDER BY id DESC LIMIT -1 OFFSET ?
+        )
+    """, (CHECKPOINTS_MANTIDOS,))
+    cursor.execute("""
+        DELETE FROM checkpoints_estoque WHERE id IN (
+            SELECT id FROM checkpoints_estoque ORDER BY id DESC LIMIT -1 OFFSET ?
+        )
+    """, (CHECKPOINTS_MANTIDOS,))
+    return novo
+
+@medir_operacao("corrigir_estoque")
+def corrigir_estoque(produto_id=None):
+
+    #Reconstrói produtos.quantidade pelo livro nos produtos divergentes
+    #(ou só em produto_id). Retorna quantos produtos foram corrigidos.
+
+    return executar_escrita(_corrigir_estoque, produto_id)
+
+def _corrigir_estoque(conn, produto_id):
+    cursor = conn.cursor()
+
+    filtro, params = "", ()
+    if produto_id is not None:
+        filtro, params = "AND l.id = ?", (produto_id,)
+
+    cursor.execute(f"""
+        UPDATE produtos SET quantidade = l.livro
+        FROM ({SQL_SALDOS_LIVRO}) l
+        WHERE l.id = produtos.id AND l.quantidade != l.livro {filtro}
+    """, params)
+    return cursor.rowcount
+
+def conciliar_estoque(corrigir=False, checkpoint=False, produto_id=None, mostrar=True):
+
+    #Comando "conciliar": mostra a divergência de cada produto, corrige se
+    #pedido e grava um checkpoint quando o livro acumulou movimentações
+    #demais desde o último (ou se checkpoint=True). Retorna True se confere.
+
+    divergentes = conferir_estoque(produto_id)
+
+    if mostrar:
+        if divergentes:
+            print("\n" + "-"*78)
+            print(f"{'ID':<6} | {'Produto':<30} | {'Estoque':>8} | {'Livro':>8} | {'Diferença':>9}")
+            print("-"*78)
+            for pid, nome, qtd, livro, dif in divergentes:
+                print(f"{pid:<6} | {nome:<30.30} | {qtd:>8} | {livro:>8} | {dif:>+9}")
+            print("-"*78)
+            print(f"{len(divergentes)} produto(s) divergente(s).")
+        else:
+            print("✔ Estoque confere com as movimentações.")
+
+    if corrigir and divergentes:
+        corrigidos = corrigir_estoque(produto_id)
+        if mostrar:
+            print(f"✔ {corrigidos} produto(s) reconstruído(s) pelo livro.")
+
+    if checkpoint or movimentacoes_desde_checkpoint() >= INTERVALO_CHECKPOINT:
+        novo = registrar_checkpoint()
+        if mostrar:
+            print(f"✔ Checkpoint {novo} gravado.")
+
+    return not divergentes or corrigir
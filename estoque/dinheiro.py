@@ -0,0 +1,99 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation  # Conversão exata de reais para centavos
+
+
+# ============================================================
+#            VALORES EM CENTAVOS (INTEIROS, SEM REAL)
+# ============================================================
+#
+# Preços, custos e totais ficam no banco como número inteiro de centavos
+# (colunas *_centavos). Somar inteiros é exato: o total de milhões de vendas
+# não deriva pelos arredondamentos do REAL, e o SQLite soma INTEGER mais
+# rápido. Reais só existem na borda: o que o usuário digita passa por
+# para_centavos() e o que aparece na tela por reais().
+
+# Linhas lidas por vez no caminho vetorizado
+TAMANHO_BLOCO_SOMA = 50_000
+
+def para_centavos(valor):
+
+    #Converte reais (texto com vírgula ou ponto, int, float ou Decimal) em
+    #centavos, arredondando meio centavo para cima. Levanta ValueError.
+
+    try:
+        reais_decimal = Decimal(str(valor).strip().replace(",", "."))
+    except InvalidOperation:
+        raise ValueError("Valor inválido.") from None
+    if not reais_decimal.is_finite():
+        raise ValueError("Valor inválido.")
+    return int((reais_decimal * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def reais(centavos):
+
+    #Centavos -> Decimal em reais, exato (formatável com :.2f). None vira 0.
+
+    return Decimal(centavos or 0).scaleb(-2)
+
+
+# ============================================================
+#       SOMA POR PRODUTO EM BLOCOS (NUMPY OU BIBLIOTECA PADRÃO)
+# ============================================================
+#
+# Para relatórios sobre muitas vendas: o cursor entrega blocos de linhas
+# (produto_id, quantidade, total_centavos, custo_centavos) e cada bloco vira
+# uma matriz int64, somada por produto de uma vez (np.unique + np.add.at).
+# Tudo em inteiros de 64 bits: o resultado é igual, centavo a centavo, ao
+# SUM do SQLite. numpy é opcional e só é importado aqui (não pesa na
+# inicialização do programa); sem ele, o mesmo laço soma em Python.
+
+def somar_por_produto(cursor, tamanho=TAMANHO_BLOCO_SOMA):
+
+    #Consome um cursor já executado com linhas (produto_id, quantidade,
+    #total_centavos, custo_centavos), sem NULL, e retorna
+    #{produto_id: [vendas, quantidade, receita, custo]} (valores em centavos).
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    somas = {}
+    while True:
+        bloco = cursor.fetchmany(tamanho)
+        if not bloco:
+            return somas
+        if np is not None:
+            _somar_bloco_numpy(np, somas, bloco)
+        else:
+            _somar_bloco(somas, bloco)
+
+def _somar_bloco_numpy(np, somas, bloco):
+    dados = np.array(bloco, dtype=np.int64)
+    ids, posicoes = np.unique(dados[:, 0], return_inverse=True)
+
+    # Coluna 0 vira o contador de vendas; as outras já são os valores a somar
+    dados[:, 0] = 1
+    parciais = np.zeros((len(ids), 4), dtype=np.int64)
+    np.add.at(parciais, posicoes, dados)
+
+    for pid, linha in zip(ids.tolist(), parciais.tolist()):
+        atual = somas.get(pid)
+        if atual is None:
+            somas[pid] = linha
+        else:
+            for i in range(4):
+                atual[i] += linha[i]
+
+def _somar_bloco(somas, bloco):
+    for pid, quantidade, total, custo in bloco:
+        atual = somas.get(pid)
+        if atual is None:
+            somas[pid] = [1, quantidade, total, custo]
+        else:
+            atual[0] += 1
+            atual[1] += quantidade
+            atual[2] += total
+            atual[3] += custo
@@ -0,0 +1,223 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import os               # pid do processo dono da thread
+import queue            # Fila de operações dos produtores
+import threading        # Thread dona da conexão de escrita
+import time             # Janela de agrupamento
+from concurrent.futures import Future  # Resultado de cada operação para quem enviou
+
+from .banco import (TENTATIVAS_OCUPADO, abrir_conexao, banco_ocupado, conexao, conferir_esquema,
+                    em_memoria, esperar_ocupado)
+from .instrumentacao import operacao, operacao_atual, sql_da_operacao
+
+
+# ============================================================
+#        ESCRITOR ÚNICO COM COMMIT EM GRUPO (GROUP COMMIT)
+# ============================================================
+#
+# Sem o escritor, cada operação de escrita faz o próprio commit: com
+# synchronous=FULL isso é um fsync por venda, e é o fsync que limita quantas
+# vendas por segundo o banco aceita.
+#
+# Com o escritor ligado, as operações vão para uma fila e uma thread, dona da
+# única conexão de escrita, executa várias numa mesma transação:
+#
+#   BEGIN IMMEDIATE
+#     SAVEPOINT operacao   op 1   RELEASE    (ou ROLLBACK TO se ela falhar)
+#     SAVEPOINT operacao   op 2   RELEASE
+#     ...
+#   COMMIT                 um fsync para o grupo inteiro
+#
+# Cada operação é uma função funcao(conn, *args) que NÃO faz commit. Quem
+# enviou recebe um Future, que só é concluído depois do COMMIT do grupo: um
+# resultado recebido já está gravado em disco. Uma operação que levanta erro
+# volta ao seu SAVEPOINT e não afeta as outras do grupo.
+#
+# Com a instrumentação ligada, o SQL de cada operação (do SAVEPOINT ao
+# RELEASE) conta para a operação em andamento em quem enviou (registrar_venda,
+# entrada_estoque...); BEGIN e COMMIT ficam em "escritor_grupo".
+
+# Tempo máximo (segundos) esperando mais operações depois da primeira do grupo.
+# Com 0 o grupo é o que se acumulou na fila durante o commit anterior: quanto
+# mais lento o fsync, maiores os grupos. Uma janela maior ajuda quando os
+# produtores chegam em rajadas e o disco é lento.
+JANELA_GRUPO = 0.0
+
+# Máximo de operações por commit
+TAMANHO_GRUPO = 256
+
+class Escritor:
+
+    #Thread que executa as operações da fila em grupos, cada grupo num commit.
+
+    def __init__(self, janela=JANELA_GRUPO, tamanho=TAMANHO_GRUPO):
+        self.janela = janela
+        self.tamanho = tamanho
+        self.pid = os.getpid()
+        self.fila = queue.Queue()
+        self.grupos = 0
+        self.operacoes = 0
+        self._ultimo_grupo = 0
+        self.thread = threading.Thread(target=self._rodar, name="estoque-escritor", daemon=True)
+        self.thread.start()
+
+    def enviar(self, funcao, *args):
+
+        #Coloca funcao(conn, *args) na fila e devolve o Future do resultado.
+
+        futuro = Future()
+        self.fila.put((funcao, args, futuro, operacao_atual()))
+        return futuro
+
+    def parar(self):
+
+        #Termina o que já está na fila e encerra a thread.
+
+        self.fila.put(None)
+        self.thread.join()
+
+    def _proximo_grupo(self):
+
+        #Espera a primeira operação e junta as que chegarem dentro da janela
+        #(até "tamanho"). Devolve (grupo, parar).
+        #Com um produtor só (último grupo de uma operação) esperar não junta
+        #nada e só atrasa: aí o grupo é apenas o que já estiver na fila.
+
+        primeira = self.fila.get()
+        if primeira is None:
+            return [], True
+
+        grupo = [primeira]
+        janela = self.janela if self._ultimo_grupo > 1 else 0
+        limite = time.monotonic() + janela
+
+        while len(grupo) < self.tamanho:
+            restante = limite - time.monotonic()
+            try:
+                item = self.fila.get(timeout=restante) if restante > 0 else self.fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return grupo, True
+            grupo.append(item)
+
+        return grupo, False
+
+    def _executar_grupo(self, conn, grupo):
+        grupo = [item for item in grupo if item[2].set_running_or_notify_cancel()]
+
+        for tentativa in range(TENTATIVAS_OCUPADO):
+            try:
+                resultados = self._gravar_grupo(conn, grupo)
+                break
+            except Exception as erro:
+                # Falha do grupo (banco travado, disco cheio...): ninguém foi gravado
+                if conn.in_transaction:
+                    conn.rollback()
+                if banco_ocupado(erro) and tentativa < TENTATIVAS_OCUPADO - 1:
+                    esperar_ocupado(tentativa)
+                    continue
+                for _, _, futuro, _ in grupo:
+                    futuro.set_exception(erro)
+                return
+
+        # Só agora, com o grupo gravado, quem enviou fica sabendo do resultado
+        for (_, _, futuro, _), (resultado, erro) in zip(grupo, resultados):
+            if erro is None:
+                futuro.set_result(resultado)
+            else:
+                futuro.set_exception(erro)      # nada dela foi gravado
+
+        self.grupos += 1
+        self.operacoes += len(grupo)
+        self._ultimo_grupo = len(grupo)
+
+    def _gravar_grupo(self, conn, grupo):
+
+        #Uma tentativa: todas as operações do grupo numa transação.
+        #Devolve [(resultado, erro)] na ordem do grupo.
+
+        resultados = []
+        conn.execute("BEGIN IMMEDIATE")
+
+        for funcao, args, _, nome in grupo:
+            with sql_da_operacao(nome):
+                conn.execute("SAVEPOINT operacao")
+                try:
+                    resultado = funcao(conn, *args)
+                except Exception as erro:
+                    if banco_ocupado(erro):
+                        raise
+                    conn.execute("ROLLBACK TO operacao")
+                    conn.execute("RELEASE operacao")
+                    resultados.append((None, erro))
+                else:
+                    conn.execute("RELEASE operacao")
+                    resultados.append((resultado, None))
+
+        conn.commit()
+        return resultados
+
+    def _rodar(self):
+        # Em memória só existe a conexão compartilhada; num arquivo, uma própria
+        memoria = em_memoria()
+        conn = conexao() if memoria else abrir_conexao()
+        conferir_esquema(conn)
+
+        parar = False
+        while not parar:
+            grupo, parar = self._proximo_grupo()
+            if grupo:
+                with operacao("escritor_grupo"):
+                    self._executar_grupo(conn, grupo)
+
+        if not memoria:
+            conn.close()
+
+# Escritor em uso neste processo (None = cada operação faz o próprio commit)
+_escritor = None
+
+def iniciar_escritor(janela=JANELA_GRUPO, tamanho=TAMANHO_GRUPO):
+
+    #Liga o commit em grupo para as escritas deste processo.
+
+    global _escritor
+    parar_escritor()
+    _escritor = Escritor(janela, tamanho)
+    return _escritor
+
+def parar_escritor():
+
+    #Desliga o escritor, gravando antes tudo o que estiver na fila.
+
+    global _escritor
+    if _escritor is not None and _escritor.pid == os.getpid():
+        _escritor.parar()
+    _escritor = None
+
+def executar_escrita(funcao, *args):
+
+    #Executa funcao(conn, *args) numa transação BEGIN IMMEDIATE e devolve o resultado.
+    #Com o escritor ligado, entra na fila e espera o commit do grupo;
+    #sem ele, roda na conexão de escrita desta thread com commit próprio.
+    #IMMEDIATE pega a trava de escrita antes de qualquer leitura: o que a
+    #função lê não muda até o commit. Banco ocupado: tenta de novo algumas vezes.
+
+    if _escritor is not None and _escritor.pid == os.getpid():
+        return _escritor.enviar(funcao, *args).result()
+
+    conn = conexao()
+    for tentativa in range(TENTATIVAS_OCUPADO):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            resultado = funcao(conn, *args)
+            conn.commit()
+            return resultado
+        except Exception as erro:
+            if conn.in_transaction:
+                conn.rollback()
+            if not banco_ocupado(erro) or tentativa == TENTATIVAS_OCUPADO - 1:
+                raise
+            esperar_ocupado(tentativa)
@@ -0,0 +1,710 @@
+# Estoque mínimo padrão para alerta de "ESTOQUE BAIXO!"
+# (cada produto tem o seu em produtos.estoque_minimo; este é o valor inicial)
+LOW_STOCK_THRESHOLD = 5
+
+
+# ============================================================
+#      MIGRAÇÕES DO ESQUEMA (VERSÃO EM PRAGMA user_version)
+# ============================================================
+
+# Converte uma coluna em reais (REAL) para centavos inteiros. O ROUND(x, 2)
+# antes de multiplicar arredonda pelo valor digitado: 0.285 vira 29 centavos,
+# não 28 (0.285 * 100 em REAL dá 28.4999...)
+SQL_CENTAVOS = "CAST(ROUND(ROUND({}, 2) * 100) AS INTEGER)"
+
+# Recalcula do zero a linha única de resumo_financeiro a partir de vendas
+# ({vendas}: a tabela, ou a view que inclui o arquivo morto)
+SQL_RESUMO_FINANCEIRO = """
+    INSERT OR REPLACE INTO resumo_financeiro (id, num_vendas, itens, total_centavos, custo_centavos)
+    SELECT 1, COUNT(*), COALESCE(SUM(quantidade), 0), COALESCE(SUM(total_centavos), 0),
+           COALESCE(SUM(quantidade * COALESCE(custo_centavos, 0)), 0)
+    FROM {vendas}
+"""
+
+# Primeiro dia do período de uma data, por granularidade dos agregados de vendas
+INICIO_PERIODO = {
+    "dia": "date({})",
+    "semana": "date({}, 'weekday 0', '-6 days')",   # semanas começam na segunda
+    "mes": "strftime('%Y-%m-01', {})",
+}
+
+# Recalcula do zero os agregados de vendas (todas as granularidades; {vendas} como acima)
+SQL_VENDAS_AGREGADAS = """
+    SELECT g.periodo,
+           CASE g.periodo
+               WHEN 'dia' THEN {dia}
+               WHEN 'semana' THEN {semana}
+               ELSE {mes}
+           END AS inicio,
+           v.produto_id, v.forma_pagamento, COUNT(*) AS num_vendas, SUM(v.quantidade) AS quantidade,
+           SUM(v.total_centavos) AS receita_centavos,
+           SUM(v.quantidade * COALESCE(v.custo_centavos, 0)) AS custo_centavos
+    FROM {{vendas}} v, (SELECT 'dia' AS periodo UNION ALL SELECT 'semana' UNION ALL SELECT 'mes') g
+    GROUP BY g.periodo, inicio, v.produto_id, v.forma_pagamento
+""".format(**{p: e.format("v.data") for p, e in INICIO_PERIODO.items()})
+
+# Soma uma venda nova nos três agregados (dia, semana e mês).
+# {tabela}: tabela das vendas; {forma}: expressão com o nome da forma de pagamento
+_TRIGGER_VENDAS_AGREGADAS = (
+    "CREATE TRIGGER IF NOT EXISTS trg_vendas_agregadas\n"
+    "AFTER INSERT ON {tabela}\n"
+    "BEGIN\n"
+    + "".join(f"""
+    INSERT INTO vendas_agregadas
+        (periodo, inicio, produto_id, forma_pagamento, num_vendas, quantidade, receita_centavos, custo_centavos)
+    VALUES ('{periodo}', {expr.format("new.data")}, new.produto_id, {{forma}}, 1,
+            new.quantidade, new.total_centavos, new.quantidade * COALESCE(new.custo_centavos, 0))
+    ON CONFLICT (periodo, inicio, produto_id, forma_pagamento) DO UPDATE SET
+        num_vendas = num_vendas + 1,
+        quantidade = quantidade + excluded.quantidade,
+        receita_centavos = receita_centavos + excluded.receita_centavos,
+        custo_centavos = custo_centavos + excluded.custo_centavos;
+""" for periodo, expr in INICIO_PERIODO.items())
+    + "END"
+)
+
+# Nome da forma de pagamento a partir do id (dicionário formas_pagamento)
+SQL_NOME_FORMA = "(SELECT nome FROM formas_pagamento WHERE id = {})"
+
+TRIGGER_VENDAS_AGREGADAS = _TRIGGER_VENDAS_AGREGADAS.format(
+    tabela="vendas_compactas", forma=SQL_NOME_FORMA.format("new.forma_id"))
+
+# Versões em REAL (valores em reais) das três acima, como eram nas migrações
+# 4 e 5: ficam congeladas aqui para essas migrações continuarem iguais
+SQL_RESUMO_FINANCEIRO_REAL = """
+    INSERT OR REPLACE INTO resumo_financeiro (id, num_vendas, itens, total_vendido, custo_total)
+    SELECT 1, COUNT(*), COALESCE(SUM(quantidade), 0), COALESCE(SUM(valor_total), 0),
+           COALESCE(SUM(quantidade * COALESCE(custo_unitario, 0)), 0)
+    FROM vendas
+"""
+
+SQL_VENDAS_AGREGADAS_REAL = """
+    SELECT g.periodo,
+           CASE g.periodo
+               WHEN 'dia' THEN {dia}
+               WHEN 'semana' THEN {semana}
+               ELSE {mes}
+           END AS inicio,
+           v.produto_id, v.forma_pagamento, COUNT(*) AS num_vendas, SUM(v.quantidade) AS quantidade,
+           SUM(v.valor_total) AS receita, SUM(v.quantidade * COALESCE(v.custo_unitario, 0)) AS custo
+    FROM vendas v, (SELECT 'dia' AS periodo UNION ALL SELECT 'semana' UNION ALL SELECT 'mes') g
+    GROUP BY g.periodo, inicio, v.produto_id, v.forma_pagamento
+""".format(**{p: e.format("v.data") for p, e in INICIO_PERIODO.items()})
+
+TRIGGER_VENDAS_AGREGADAS_REAL = (
+    "CREATE TRIGGER IF NOT EXISTS trg_vendas_agregadas\n"
+    "AFTER INSERT ON vendas\n"
+    "BEGIN\n"
+    + "".join(f"""
+    INSERT INTO vendas_agregadas
+        (periodo, inicio, produto_id, forma_pagamento, num_vendas, quantidade, receita, custo)
+    VALUES ('{periodo}', {expr.format("new.data")}, new.produto_id, new.forma_pagamento, 1,
+            new.quantidade, new.valor_total, new.quantidade * COALESCE(new.custo_unitario, 0))
+    ON CONFLICT (periodo, inicio, produto_id, forma_pagamento) DO UPDATE SET
+        num_vendas = num_vendas + 1,
+        quantidade = quantidade + excluded.quantidade,
+        receita = receita + excluded.receita,
+        custo = custo + excluded.custo;
+""" for periodo, expr in INICIO_PERIODO.items())
+    + "END"
+)
+
+# Soma uma venda nova na linha única de resumo_financeiro ({tabela}: tabela das vendas)
+_TRIGGER_RESUMO_FINANCEIRO = """
+    CREATE TRIGGER IF NOT EXISTS trg_vendas_resumo_financeiro
+    AFTER INSERT ON {tabela}
+    BEGIN
+        UPDATE resumo_financeiro SET
+            num_vendas = num_vendas + 1,
+            itens = itens + new.quantidade,
+            total_centavos = total_centavos + new.total_centavos,
+            custo_centavos = custo_centavos + new.quantidade * COALESCE(new.custo_centavos, 0)
+        WHERE id = 1;
+    END
+"""
+
+TRIGGER_RESUMO_FINANCEIRO = _TRIGGER_RESUMO_FINANCEIRO.format(tabela="vendas_compactas")
+
+# Os dois triggers como eram na migração 10, com a tabela vendas guardando a
+# forma de pagamento em texto: congelados para essa migração continuar igual
+TRIGGER_RESUMO_FINANCEIRO_TEXTO = _TRIGGER_RESUMO_FINANCEIRO.format(tabela="vendas")
+TRIGGER_VENDAS_AGREGADAS_TEXTO = _TRIGGER_VENDAS_AGREGADAS.format(tabela="vendas", forma="new.forma_pagamento")
+
+# Consumidor gravado quando a venda não informa nenhum (guardado como NULL)
+CONSUMIDOR_NAO_INFORMADO = "Cliente não informado"
+
+# Cliente cadastrado com o nome digitado na venda (o de menor id, se repetido)
+SQL_CLIENTE_POR_NOME = "(SELECT MIN(id) FROM clientes WHERE nome = {})"
+
+# Texto livre do consumidor: só quando não é um cliente cadastrado nem o "não informado"
+SQL_CONSUMIDOR_AVULSO = (
+    "CASE WHEN {consumidor} IS NULL OR {consumidor} = '" + CONSUMIDOR_NAO_INFORMADO + "'"
+    " OR {cliente} IS NOT NULL THEN NULL ELSE {consumidor} END"
+)
+
+# Marca o produto como alterado com a próxima sequência (cache do catálogo)
+TRIGGER_ALTERACOES_PRODUTOS = """
+    CREATE TRIGGER IF NOT EXISTS trg_alteracoes_produtos_{nome} AFTER {evento} ON produtos
+    BEGIN
+        INSERT OR REPLACE INTO alteracoes_produtos (produto_id, seq)
+        VALUES ({linha}.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM alteracoes_produtos));
+    END
+"""
+
+# Acrescenta um evento ao feed de alterações (eventos) a cada escrita em {tabela}.
+# {origem}: nome lógico publicado para os consumidores; {dados}: JSON da linha
+TRIGGER_EVENTOS = """
+    CREATE TRIGGER IF NOT EXISTS trg_eventos_{nome} AFTER {evento} ON {tabela}
+    BEGIN
+        INSERT INTO eventos (tabela, operacao, chave, dados, data)
+        VALUES ('{origem}', '{evento}', {linha}.id, {dados}, datetime('now', 'localtime'));
+    END
+"""
+
+# Linha publicada de cada tabela no feed (new.* de um INSERT/UPDATE)
+JSON_EVENTO_PRODUTO = """json_object(
+            'nome', new.nome, 'venda_centavos', new.venda_centavos, 'custo_centavos', new.custo_centavos,
+            'quantidade', new.quantidade, 'estoque_minimo', new.estoque_minimo, 'peso', new.peso, 'marca', new.marca)"""
+
+JSON_EVENTO_VENDA = f"""json_object(
+            'produto_id', new.produto_id, 'nome_produto', new.nome_produto, 'quantidade', new.quantidade,
+            'data', new.data, 'forma_pagamento', {SQL_NOME_FORMA.format("new.forma_id")}, 'cliente_id', new.cliente_id,
+            'consumidor', COALESCE((SELECT nome FROM clientes WHERE id = new.cliente_id), new.consumidor,
+                                   '{CONSUMIDOR_NAO_INFORMADO}'),
+            'unitario_centavos', new.unitario_centavos, 'total_centavos', new.total_centavos,
+            'custo_centavos', new.custo_centavos)"""
+
+JSON_EVENTO_MOVIMENTACAO = """json_object(
+            'produto_id', new.produto_id, 'tipo', new.tipo, 'quantidade', new.quantidade,
+            'data', new.data, 'usuario', new.usuario)"""
+
+# Cada migração é (versão, descrição, lista de comandos SQL).
+# A versão aplicada fica gravada no cabeçalho do arquivo (PRAGMA user_version),
+# então cada migração roda uma única vez, dentro de uma transação.
+# Nunca altere uma migração já publicada: crie uma nova no fim da lista.
+MIGRACOES = [
+    (1, "tabelas base", [
+
+        # ---------------------------- Tabela de produtos ----------------------------
+        """
+        CREATE TABLE IF NOT EXISTS produtos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único e auto crescente
+            nome TEXT NOT NULL,                    -- Nome do produto
+            valor_venda REAL NOT NULL,             -- Preço de venda
+            valor_custo REAL NOT NULL,             -- Custo de compra
+            quantidade INTEGER NOT NULL,           -- Qtd no estoque
+            peso REAL NOT NULL,                    -- Peso do produto
+            marca TEXT                              -- Marca
+        )
+        """,
+
+        # ---------------------------- Tabela de vendas ----------------------------
+        """
+        CREATE TABLE IF NOT EXISTS vendas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            produto_id INTEGER NOT NULL,           -- Chave estrangeira para produtos
+            nome_produto TEXT NOT NULL,
+            quantidade INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            valor_unitario REAL NOT NULL,
+            valor_total REAL NOT NULL,
+            forma_pagamento TEXT NOT NULL,
+            consumidor TEXT,
+            FOREIGN KEY (produto_id) REFERENCES produtos(id)
+        )
+        """,
+
+        # ---------------------------- Tabela de clientes ----------------------------
+        """
+        CREATE TABLE IF NOT EXISTS clientes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            contato TEXT
+        )
+        """,
+
+        # ---------------------------- Tabela de fornecedores ----------------------------
+        """
+        CREATE TABLE IF NOT EXISTS fornecedores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            contato TEXT
+        )
+        """,
+
+        # ---------------------------- Tabela de movimentações ----------------------------
+        """
+        CREATE TABLE IF NOT EXISTS movimentacoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            produto_id INTEGER NOT NULL,
+            tipo TEXT NOT NULL,                 -- entrada / saída / venda
+            quantidade INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            usuario TEXT,                       -- usuário logado que realizou a ação
+            FOREIGN KEY (produto_id) REFERENCES produtos(id)
+        )
+        """,
+
+        # ---------------------------- Tabela de usuários ----------------------------
+        """
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,       -- nome único de usuário
+            password_hash TEXT NOT NULL,         -- senha criptografada
+            created_at TEXT NOT NULL             -- Data de criação
+        )
+        """,
+    ]),
+
+    (2, "índices do histórico de vendas e movimentações", [
+
+        # listar_vendas: ORDER BY data DESC percorre o índice (o id já vem junto),
+        # sem varrer a tabela e sem B-tree temporária para ordenar.
+        "CREATE INDEX IF NOT EXISTS idx_vendas_data ON vendas (data)",
+
+        # Histórico/relatórios de um produto: cobre produto_id + data + valores,
+        # então somas por produto não precisam ler a tabela.
+        """
+        CREATE INDEX IF NOT EXISTS idx_vendas_produto
+        ON vendas (produto_id, data, quantidade, valor_total)
+        """,
+
+        # listar_movimentacoes: ORDER BY m.data DESC
+        "CREATE INDEX IF NOT EXISTS idx_movimentacoes_data ON movimentacoes (data)",
+
+        # Movimentações de um produto (JOIN / filtro por produto_id)
+        """
+        CREATE INDEX IF NOT EXISTS idx_movimentacoes_produto
+        ON movimentacoes (produto_id, data, tipo, quantidade)
+        """,
+    ]),
+    (3, "progresso das importações em lote", [
+        """
+        CREATE TABLE IF NOT EXISTS importacoes (
+            arquivo TEXT PRIMARY KEY,             -- caminho absoluto do arquivo importado
+            assinatura TEXT NOT NULL,             -- tamanho:mtime (detecta arquivo trocado)
+            processadas INTEGER NOT NULL,         -- registros já confirmados
+            concluida INTEGER NOT NULL DEFAULT 0,
+            atualizado_em TEXT NOT NULL
+        )
+        """,
+    ]),
+    (4, "custo unitário na venda e resumo financeiro incremental", [
+
+        # Custo do produto no momento da venda (antes o relatório usava o custo de hoje).
+        # Vendas antigas recebem o custo atual do produto, o melhor valor disponível.
+        "ALTER TABLE vendas ADD COLUMN custo_unitario REAL",
+        """
+        UPDATE vendas SET custo_unitario =
+            (SELECT p.valor_custo FROM produtos p WHERE p.id = vendas.produto_id)
+        """,
+
+        # Uma linha só, com os totais de todas as vendas já feitas
+        """
+        CREATE TABLE IF NOT EXISTS resumo_financeiro (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            num_vendas INTEGER NOT NULL,
+            itens INTEGER NOT NULL,
+            total_vendido REAL NOT NULL,
+            custo_total REAL NOT NULL
+        )
+        """,
+        SQL_RESUMO_FINANCEIRO_REAL,
+
+        # Atualizado na mesma transação de cada venda
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_vendas_resumo_financeiro
+        AFTER INSERT ON vendas
+        BEGIN
+            UPDATE resumo_financeiro SET
+                num_vendas = num_vendas + 1,
+                itens = itens + new.quantidade,
+                total_vendido = total_vendido + new.valor_total,
+                custo_total = custo_total + new.quantidade * COALESCE(new.custo_unitario, 0)
+            WHERE id = 1;
+        END
+        """,
+    ]),
+    (5, "agregados de vendas por dia, semana e mês", [
+        """
+        CREATE TABLE IF NOT EXISTS vendas_agregadas (
+            periodo TEXT NOT NULL,              -- 'dia' / 'semana' / 'mes'
+            inicio TEXT NOT NULL,               -- primeiro dia do período (AAAA-MM-DD)
+            produto_id INTEGER NOT NULL,
+            forma_pagamento TEXT NOT NULL,
+            num_vendas INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL,
+            receita REAL NOT NULL,
+            custo REAL NOT NULL,
+            PRIMARY KEY (periodo, inicio, produto_id, forma_pagamento)
+        ) WITHOUT ROWID
+        """,
+        "INSERT INTO vendas_agregadas " + SQL_VENDAS_AGREGADAS_REAL,
+        TRIGGER_VENDAS_AGREGADAS_REAL,
+    ]),
+    (6, "estoque mínimo por produto e índice de estoque baixo", [
+        f"ALTER TABLE produtos ADD COLUMN estoque_minimo INTEGER NOT NULL DEFAULT {LOW_STOCK_THRESHOLD}",
+
+        # Índice parcial: só contém os produtos em alerta, então contar/listar
+        # o estoque baixo lê algumas entradas em vez do catálogo inteiro
+        """
+        CREATE INDEX IF NOT EXISTS idx_produtos_estoque_baixo
+        ON produtos (quantidade) WHERE quantidade <= estoque_minimo
+        """,
+    ]),
+    (7, "busca textual de produtos (FTS5)", [
+
+        # Índice de texto sobre nome e marca, sem acentos ("acucar" acha "Açúcar"),
+        # com índices de prefixo de 2 e 3 letras para a busca enquanto digita.
+        # content='produtos': o texto não é duplicado, só o índice.
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS produtos_busca USING fts5(
+            nome, marca,
+            content='produtos', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+        """,
+        "INSERT INTO produtos_busca (produtos_busca) VALUES ('rebuild')",
+
+        # Mantém o índice em sincronia com produtos
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_produtos_busca_insert AFTER INSERT ON produtos
+        BEGIN
+            INSERT INTO produtos_busca (rowid, nome, marca) VALUES (new.id, new.nome, new.marca);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_produtos_busca_delete AFTER DELETE ON produtos
+        BEGIN
+            INSERT INTO produtos_busca (produtos_busca, rowid, nome, marca)
+            VALUES ('delete', old.id, old.nome, old.marca);
+        END
+        """,
+        # Só quando nome/marca mudam: baixas de estoque não mexem no índice
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_produtos_busca_update AFTER UPDATE OF nome, marca ON produtos
+        BEGIN
+            INSERT INTO produtos_busca (produtos_busca, rowid, nome, marca)
+            VALUES ('delete', old.id, old.nome, old.marca);
+            INSERT INTO produtos_busca (rowid, nome, marca) VALUES (new.id, new.nome, new.marca);
+        END
+        """,
+    ]),
+
+    (8, "contador de alterações de produtos (cache do catálogo)", [
+        # Uma linha por produto alterado, com o número de sequência da última
+        # alteração: o cache em memória de cada processo relê só o que mudou
+        # desde a sequência que ele já viu
+        """
+        CREATE TABLE IF NOT EXISTS alteracoes_produtos (
+            produto_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_alteracoes_produtos_seq ON alteracoes_produtos(seq)",
+        TRIGGER_ALTERACOES_PRODUTOS.format(nome="insert", evento="INSERT", linha="new"),
+        TRIGGER_ALTERACOES_PRODUTOS.format(nome="update", evento="UPDATE", linha="new"),
+        TRIGGER_ALTERACOES_PRODUTOS.format(nome="delete", evento="DELETE", linha="old"),
+        # Busca exata por nome no cache limitado (produtos fora da memória)
+        "CREATE INDEX IF NOT EXISTS idx_produtos_nome ON produtos(nome COLLATE NOCASE)",
+    ]),
+
+    (9, "checkpoints do estoque (conciliação com as movimentações)", [
+        # Cada checkpoint guarda o saldo de cada produto segundo o livro de
+        # movimentações até "ate_movimentacao" (id): conferir o estoque só
+        # precisa somar as movimentações depois dele
+        """
+        CREATE TABLE IF NOT EXISTS checkpoints_estoque (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ate_movimentacao INTEGER NOT NULL,    -- última movimentação incluída
+            data TEXT NOT NULL,
+            origem TEXT NOT NULL                  -- abertura / conciliacao / arquivamento
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS saldos_checkpoint (
+            checkpoint_id INTEGER NOT NULL,
+            produto_id INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL,
+            PRIMARY KEY (checkpoint_id, produto_id)
+        ) WITHOUT ROWID
+        """,
+
+        # Até aqui o estoque inicial e as edições manuais não geravam
+        # movimentação: o saldo de abertura é o estoque atual de cada produto
+        """
+        INSERT INTO checkpoints_estoque (ate_movimentacao, data, origem)
+        SELECT COALESCE(MAX(id), 0), datetime('now', 'localtime'), 'abertura' FROM movimentacoes
+        """,
+        """
+        INSERT INTO saldos_checkpoint (checkpoint_id, produto_id, quantidade)
+        SELECT (SELECT MAX(id) FROM checkpoints_estoque), id, quantidade FROM produtos
+        """,
+    ]),
+    (10, "valores em centavos (INTEGER) em produtos, vendas e resumos", [
+        # REAL soma com arredondamento a cada parcela (os totais derivam alguns
+        # centavos em milhões de vendas); inteiros de centavos somam exato.
+        # Cada coluna em reais vira uma *_centavos: nome novo para nenhum
+        # código antigo ler centavos achando que são reais.
+
+        # Triggers e índice que citam as colunas antigas (recriados no fim)
+        "DROP TRIGGER IF EXISTS trg_vendas_resumo_financeiro",
+        "DROP TRIGGER IF EXISTS trg_vendas_agregadas",
+        "DROP INDEX IF EXISTS idx_vendas_produto",
+
+        "ALTER TABLE produtos ADD COLUMN venda_centavos INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE produtos ADD COLUMN custo_centavos INTEGER NOT NULL DEFAULT 0",
+        f"""
+        UPDATE produtos SET venda_centavos = {SQL_CENTAVOS.format("valor_venda")},
+                            custo_centavos = {SQL_CENTAVOS.format("valor_custo")}
+        """,
+        "ALTER TABLE produtos DROP COLUMN valor_venda",
+        "ALTER TABLE produtos DROP COLUMN valor_custo",
+
+        "ALTER TABLE vendas ADD COLUMN unitario_centavos INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE vendas ADD COLUMN total_centavos INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE vendas ADD COLUMN custo_centavos INTEGER",
+        f"""
+        UPDATE vendas SET unitario_centavos = {SQL_CENTAVOS.format("valor_unitario")},
+                          total_centavos = {SQL_CENTAVOS.format("valor_total")},
+                          custo_centavos = {SQL_CENTAVOS.format("custo_unitario")}
+        """,
+        "ALTER TABLE vendas DROP COLUMN valor_unitario",
+        "ALTER TABLE vendas DROP COLUMN valor_total",
+        "ALTER TABLE vendas DROP COLUMN custo_unitario",
+
+        # Os resumos incluem vendas já arquivadas: são convertidos, não recalculados
+        "ALTER TABLE resumo_financeiro ADD COLUMN total_centavos INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE resumo_financeiro ADD COLUMN custo_centavos INTEGER NOT NULL DEFAULT 0",
+        f"""
+        UPDATE resumo_financeiro SET total_centavos = {SQL_CENTAVOS.format("total_vendido")},
+                                     custo_centavos = {SQL_CENTAVOS.format("custo_total")}
+        """,
+        "ALTER TABLE resumo_financeiro DROP COLUMN total_vendido",
+        "ALTER TABLE resumo_financeiro DROP COLUMN custo_total",
+
+        "ALTER TABLE vendas_agregadas ADD COLUMN receita_centavos INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE vendas_agregadas ADD COLUMN custo_centavos INTEGER NOT NULL DEFAULT 0",
+        f"""
+        UPDATE vendas_agregadas SET receita_centavos = {SQL_CENTAVOS.format("receita")},
+                                    custo_centavos = {SQL_CENTAVOS.format("custo")}
+        """,
+        "ALTER TABLE vendas_agregadas DROP COLUMN receita",
+        "ALTER TABLE vendas_agregadas DROP COLUMN custo",
+
+        """
+        CREATE INDEX IF NOT EXISTS idx_vendas_produto
+        ON vendas (produto_id, data, quantidade, total_centavos)
+        """,
+        TRIGGER_RESUMO_FINANCEIRO_TEXTO,
+        TRIGGER_VENDAS_AGREGADAS_TEXTO,
+    ]),
+
+    (11, "previsão de demanda e ponto de pedido por produto", [
+        # Estado da suavização exponencial de cada produto até o dia "dia"
+        # (date.toordinal()): a próxima execução continua dele, lendo só as
+        # vendas dos dias seguintes
+        """
+        CREATE TABLE IF NOT EXISTS demanda_produtos (
+            produto_id INTEGER PRIMARY KEY,
+            nivel REAL NOT NULL,                  -- demanda diária prevista (unidades)
+            variancia REAL NOT NULL,              -- variância suavizada do erro diário
+            dia INTEGER NOT NULL,                 -- último dia incluído
+            ponto_pedido INTEGER NOT NULL,        -- repor quando o estoque chegar aqui
+            estoque_alvo INTEGER NOT NULL         -- estoque depois da compra sugerida
+        )
+        """,
+        # Uma linha só: até onde as vendas já foram lidas e com qual suavização
+        """
+        CREATE TABLE IF NOT EXISTS execucao_previsao (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            ate_dia TEXT NOT NULL,                -- primeiro dia ainda não lido (AAAA-MM-DD)
+            alfa REAL NOT NULL,
+            atualizado_em TEXT NOT NULL
+        )
+        """,
+    ]),
+
+    (12, "vendas compactas: formas de pagamento em dicionário e consumidor ligado a clientes", [
+        # Cada venda repetia forma de pagamento e consumidor por extenso. As
+        # linhas passam para vendas_compactas, com o id da forma (tabela
+        # formas_pagamento) e o id do cliente cadastrado; o texto livre só fica
+        # para consumidores que não são clientes. "vendas" vira uma view com as
+        # mesmas colunas de antes, então as consultas existentes (e o arquivo
+        # morto, que continua guardando texto) não mudam.
+        """
+        CREATE TABLE IF NOT EXISTS formas_pagamento (
+            id INTEGER PRIMARY KEY,
+            nome TEXT NOT NULL UNIQUE
+        )
+        """,
+        "INSERT OR IGNORE INTO formas_pagamento (nome) SELECT DISTINCT forma_pagamento FROM vendas ORDER BY 1",
+
+        # Venda -> cliente pelo nome (na migração e em cada venda)
+        "CREATE INDEX IF NOT EXISTS idx_clientes_nome ON clientes (nome)",
+
+        """
+        CREATE TABLE IF NOT EXISTS vendas_compactas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            produto_id INTEGER NOT NULL,
+            nome_produto TEXT NOT NULL,
+            quantidade INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            forma_id INTEGER NOT NULL,
+            cliente_id INTEGER,                   -- NULL: consumidor avulso ou não informado
+            consumidor TEXT,                      -- só o avulso (não cadastrado em clientes)
+            unitario_centavos INTEGER NOT NULL,
+            total_centavos INTEGER NOT NULL,
+            custo_centavos INTEGER,
+            FOREIGN KEY (produto_id) REFERENCES produtos(id),
+            FOREIGN KEY (forma_id) REFERENCES formas_pagamento(id),
+            FOREIGN KEY (cliente_id) REFERENCES clientes(id)
+        )
+        """,
+        f"""
+        INSERT INTO vendas_compactas
+            (id, produto_id, nome_produto, quantidade, data, forma_id, cliente_id, consumidor,
+             unitario_centavos, total_centavos, custo_centavos)
+        SELECT v.id, v.produto_id, v.nome_produto, v.quantidade, v.data, f.id, v.cliente_id,
+               {SQL_CONSUMIDOR_AVULSO.format(consumidor="v.consumidor", cliente="v.cliente_id")},
+               v.unitario_centavos, v.total_centavos, v.custo_centavos
+        FROM (SELECT *, {SQL_CLIENTE_POR_NOME.format("consumidor")} AS cliente_id FROM vendas) v
+        JOIN formas_pagamento f ON f.nome = v.forma_pagamento
+        ORDER BY v.id
+        """,
+
+        # Os ids continuam de onde vendas parou (os das vendas arquivadas não voltam)
+        "DELETE FROM sqlite_sequence WHERE name = 'vendas_compactas'",
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'vendas_compactas', seq FROM sqlite_sequence WHERE name = 'vendas'",
+
+        # Leva junto os triggers e índices antigos
+        "DROP TABLE vendas",
+
+        # Nomes por subconsulta, não por JOIN: a view é achatada na consulta
+        # e o SQLite só busca forma e cliente quando a coluna é pedida (somas
+        # e GROUP BY por produto leem só vendas_compactas e os seus índices)
+        f"""
+        CREATE VIEW IF NOT EXISTS vendas AS
+        SELECT v.id, v.produto_id, v.nome_produto, v.quantidade, v.data,
+               {SQL_NOME_FORMA.format("v.forma_id")} AS forma_pagamento,
+               COALESCE((SELECT nome FROM clientes WHERE id = v.cliente_id), v.consumidor,
+                        '{CONSUMIDOR_NAO_INFORMADO}') AS consumidor,
+               v.unitario_centavos, v.total_centavos, v.custo_centavos
+        FROM vendas_compactas v
+        """,
+
+        # INSERT na view (código antigo, scripts) continua gravando a venda
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_vendas_inserir INSTEAD OF INSERT ON vendas
+        BEGIN
+            INSERT OR IGNORE INTO formas_pagamento (nome) VALUES (new.forma_pagamento);
+            INSERT INTO vendas_compactas
+                (id, produto_id, nome_produto, quantidade, data, forma_id, cliente_id, consumidor,
+                 unitario_centavos, total_centavos, custo_centavos)
+            SELECT new.id, new.produto_id, new.nome_produto, new.quantidade, new.data,
+                   (SELECT id FROM formas_pagamento WHERE nome = new.forma_pagamento), cliente,
+                   {SQL_CONSUMIDOR_AVULSO.format(consumidor="new.consumidor", cliente="cliente")},
+                   new.unitario_centavos, new.total_centavos, new.custo_centavos
+            FROM (SELECT {SQL_CLIENTE_POR_NOME.format("new.consumidor")} AS cliente);
+        END
+        """,
+
+        "CREATE INDEX IF NOT EXISTS idx_vendas_data ON vendas_compactas (data)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_vendas_produto
+        ON vendas_compactas (produto_id, data, quantidade, total_centavos)
+        """,
+
+        # Vendas e totais por cliente (e por consumidor avulso) sem ler a
+        # tabela nem ordenar: índices parciais, só das vendas com cliente
+        """
+        CREATE INDEX IF NOT EXISTS idx_vendas_cliente
+        ON vendas_compactas (cliente_id, total_centavos) WHERE cliente_id IS NOT NULL
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_vendas_avulso
+        ON vendas_compactas (consumidor, total_centavos) WHERE consumidor IS NOT NULL
+        """,
+        TRIGGER_RESUMO_FINANCEIRO,
+        TRIGGER_VENDAS_AGREGADAS,
+    ]),
+
+    (13, "feed de alterações (eventos) e cursores dos consumidores", [
+        # Log só de acréscimos: cada escrita em produtos, vendas e movimentações
+        # vira um evento, na mesma transação. Com um único escritor por vez, a
+        # ordem de seq é a ordem dos commits: quem leu até seq N nunca recebe
+        # depois um evento de seq menor. AUTOINCREMENT: seq não volta a ser
+        # usado depois que a compactação apaga o começo do log.
+        """
+        CREATE TABLE IF NOT EXISTS eventos (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tabela TEXT NOT NULL,                 -- 'produtos' / 'vendas' / 'movimentacoes'
+            operacao TEXT NOT NULL,               -- 'INSERT' / 'UPDATE' / 'DELETE'
+            chave INTEGER NOT NULL,               -- id da linha
+            dados TEXT,                           -- linha nova em JSON (NULL no DELETE)
+            data TEXT NOT NULL
+        )
+        """,
+        # Até onde cada consumidor já confirmou (a compactação guarda o resto)
+        """
+        CREATE TABLE IF NOT EXISTS consumidores_eventos (
+            nome TEXT PRIMARY KEY,
+            ultimo_seq INTEGER NOT NULL,          -- último evento confirmado
+            atualizado_em TEXT NOT NULL
+        )
+        """,
+        TRIGGER_EVENTOS.format(nome="produtos_insert", evento="INSERT", tabela="produtos", origem="produtos",
+                               linha="new", dados=JSON_EVENTO_PRODUTO),
+        TRIGGER_EVENTOS.format(nome="produtos_update", evento="UPDATE", tabela="produtos", origem="produtos",
+                               linha="new", dados=JSON_EVENTO_PRODUTO),
+        TRIGGER_EVENTOS.format(nome="produtos_delete", evento="DELETE", tabela="produtos", origem="produtos",
+                               linha="old", dados="NULL"),
+        # Vendas e movimentações só recebem INSERT (o DELETE do arquivamento
+        # não é uma alteração do negócio e não entra no feed)
+        TRIGGER_EVENTOS.format(nome="vendas_insert", evento="INSERT", tabela="vendas_compactas", origem="vendas",
+                               linha="new", dados=JSON_EVENTO_VENDA),
+        TRIGGER_EVENTOS.format(nome="movimentacoes_insert", evento="INSERT", tabela="movimentacoes",
+                               origem="movimentacoes", linha="new", dados=JSON_EVENTO_MOVIMENTACAO),
+    ]),
+]
+
+# Última versão conhecida pelo código
+VERSAO_ESQUEMA = MIGRACOES[-1][0]
+
+
+def versao_esquema(conn):
+
+    #Lê a versão do esquema gravada no arquivo (0 = banco novo ou antigo).
+
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrar(conn, alvo=None):
+
+    #Aplica, em ordem, as migrações ainda não aplicadas (até "alvo", se informado).
+    #Cada migração roda numa transação própria junto com a troca do user_version:
+    #ou ela entra inteira, ou o banco continua na versão anterior.
+
+    atual = versao_esquema(conn)
+    alvo = VERSAO_ESQUEMA if alvo is None else alvo
+
+    for versao, descricao, comandos in MIGRACOES:
+        if versao <= atual or versao > alvo:
+            continue
+
+        try:
+            conn.execute("BEGIN")
+            for sql in comandos:
+                if callable(sql):
+                    sql(conn)
+                else:
+                    conn.execute(sql)
+            conn.execute(f"PRAGMA user_version = {versao}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        atual = versao
+
+    return atual
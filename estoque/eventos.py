@@ -0,0 +1,268 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import json             # Linha de cada evento (coluna dados)
+import sys              # Saída do comando "eventos ler" (JSON Lines)
+import time             # Espera por eventos novos (seguir)
+from datetime import datetime  # Data da confirmação
+
+from .banco import conexao_leitura
+from .escritor import executar_escrita
+from .instrumentacao import medir_operacao
+
+
+# ============================================================
+#       FEED DE ALTERAÇÕES (EVENTOS) PARA SISTEMAS EXTERNOS
+# ============================================================
+#
+# Triggers gravam em "eventos" cada produto incluído, alterado ou excluído,
+# cada venda e cada movimentação, com um seq crescente (migração 13). Quem
+# sincroniza outro sistema (loja virtual, BI) não relê as tabelas: guarda
+# até onde leu e busca só os eventos depois disso, então o custo de cada
+# sincronização é proporcional às alterações, não ao tamanho das tabelas.
+#
+# Cada consumidor tem um nome e um cursor (consumidores_eventos.ultimo_seq).
+# acompanhar_eventos() entrega lotes a partir do cursor e confirma um lote
+# quando o próximo é pedido: se o consumidor cair no meio de um lote, ele
+# recebe o lote de novo na próxima vez (pelo menos uma vez, nunca pulado).
+# O evento traz a chave e a linha inteira: aplicar o mesmo evento duas vezes
+# deixa o destino igual.
+#
+# compactar_eventos() apaga os eventos que todos os consumidores já
+# confirmaram. Sem nenhum consumidor cadastrado, apaga tudo.
+
+# Eventos por lote lido
+TAMANHO_LOTE_EVENTOS = 1000
+
+# Eventos apagados por transação na compactação
+TAMANHO_LOTE_COMPACTACAO = 10_000
+
+# Segundos entre consultas ao esperar eventos novos (seguir=True)
+INTERVALO_EVENTOS = 1.0
+
+class Evento:
+
+    #Uma alteração: tabela ('produtos', 'vendas', 'movimentacoes'), operação
+    #('INSERT', 'UPDATE', 'DELETE'), id da linha e a linha nova (dict; None no DELETE).
+
+    __slots__ = ("seq", "tabela", "operacao", "chave", "dados", "data")
+
+    def __init__(self, seq, tabela, operacao, chave, dados, data):
+        self.seq = seq
+        self.tabela = tabela
+        self.operacao = operacao
+        self.chave = chave
+        self.dados = json.loads(dados) if dados is not None else None
+        self.data = data
+
+    def como_dict(self):
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+    def __repr__(self):
+        return f"Evento({self.seq}, {self.tabela}, {self.operacao}, {self.chave})"
+
+def ler_eventos(depois=0, limite=TAMANHO_LOTE_EVENTOS, tabelas=None):
+
+    #Até "limite" eventos com seq > depois, em ordem (só das "tabelas", se informadas).
+    #Retorna (eventos, cursor): cursor é o seq de onde continuar a leitura. Com
+    #filtro de tabelas ele pode passar do último evento entregue (os eventos de
+    #outras tabelas no meio do caminho também contam como lidos).
+
+    conn = conexao_leitura()
+    filtro = f"AND tabela IN ({', '.join('?' for _ in tabelas)})" if tabelas else ""
+
+    # O maior seq e o lote na mesma transação de leitura: o cursor não pula
+    # um evento gravado entre as duas consultas. (Em memória a conexão é a
+    # de escrita e pode já estar numa transação.)
+    propria = not conn.in_transaction
+    if propria:
+        conn.execute("BEGIN")
+    try:
+        ultimo = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM eventos").fetchone()[0]
+        linhas = conn.execute(f"""
+            SELECT seq, tabela, operacao, chave, dados, data FROM eventos
+            WHERE seq > ? AND seq <= ? {filtro}
+            ORDER BY seq LIMIT ?
+        """, (depois, ultimo, *(tabelas or ()), limite)).fetchall()
+    finally:
+        if propria:
+            conn.rollback()
+
+    eventos = [Evento(*linha) for linha in linhas]
+    cursor = eventos[-1].seq if len(eventos) == limite else max(ultimo, depois)
+    return eventos, cursor
+
+def ultimo_seq():
+
+    #Seq do evento mais recente (0 sem eventos).
+
+    return conexao_leitura().execute("SELECT COALESCE(MAX(seq), 0) FROM eventos").fetchone()[0]
+
+
+# ============================================================
+#        CONSUMIDORES: CURSOR GUARDADO, CONFIRMAÇÃO E LOTES
+# ============================================================
+
+def registrar_consumidor(nome, desde_inicio=False):
+
+    #Cadastra o consumidor (se ainda não existe) e devolve o cursor dele.
+    #Um consumidor novo começa do evento mais recente (copia o estado atual
+    #das tabelas e segue daí) ou, com desde_inicio=True, do começo do log.
+
+    return executar_escrita(_registrar_consumidor, nome, desde_inicio)
+
+def _registrar_consumidor(conn, nome, desde_inicio):
+    cursor = conn.cursor()
+    cursor.execute("SELECT ultimo_seq FROM consumidores_eventos WHERE nome = ?", (nome,))
+    linha = cursor.fetchone()
+    if linha is not None:
+        return linha[0]
+
+    if desde_inicio:
+        inicio = 0
+    else:
+        cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM eventos")
+        inicio = cursor.fetchone()[0]
+    cursor.execute("""
+        INSERT INTO consumidores_eventos (nome, ultimo_seq, atualizado_em) VALUES (?, ?, ?)
+    """, (nome, inicio, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    return inicio
+
+def cursor_consumidor(nome):
+
+    #Último seq confirmado pelo consumidor (None se ele não existe).
+
+    linha = conexao_leitura().execute(
+        "SELECT ultimo_seq FROM consumidores_eventos WHERE nome = ?", (nome,)
+    ).fetchone()
+    return linha[0] if linha else None
+
+def confirmar_eventos(nome, seq):
+
+    #Grava que o consumidor processou tudo até "seq" (o cursor nunca volta).
+
+    executar_escrita(_confirmar_eventos, nome, seq)
+
+def _confirmar_eventos(conn, nome, seq):
+    conn.execute("""
+        UPDATE consumidores_eventos SET ultimo_seq = MAX(ultimo_seq, ?), atualizado_em = ?
+        WHERE nome = ?
+    """, (seq, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), nome))
+
+def remover_consumidor(nome):
+
+    #Tira o consumidor da lista: a compactação deixa de esperar por ele.
+
+    return executar_escrita(_remover_consumidor, nome) > 0
+
+def _remover_consumidor(conn, nome):
+    return conn.execute("DELETE FROM consumidores_eventos WHERE nome = ?", (nome,)).rowcount
+
+def acompanhar_eventos(nome, tamanho=TAMANHO_LOTE_EVENTOS, tabelas=None, seguir=False,
+                       intervalo=INTERVALO_EVENTOS):
+
+    #Gera lotes (listas de Evento) do consumidor "nome", a partir do cursor
+    #guardado (cadastra o consumidor, se preciso). O lote entregue é
+    #confirmado quando o próximo é pedido; parar no meio de um lote faz ele
+    #ser entregue de novo na próxima vez.
+    #seguir=False termina quando os eventos acabam; seguir=True fica
+    #esperando eventos novos (consulta a cada "intervalo" segundos).
+
+    cursor = registrar_consumidor(nome)
+
+    while True:
+        eventos, proximo = ler_eventos(cursor, tamanho, tabelas)
+
+        if eventos:
+            yield eventos
+
+        if proximo != cursor:
+            confirmar_eventos(nome, proximo)
+            cursor = proximo
+        elif not seguir:
+            return
+        else:
+            # Consulta barata (maior seq pela chave primária) até chegar algo
+            while ultimo_seq() <= cursor:
+                time.sleep(intervalo)
+
+
+# ============================================================
+#             COMPACTAÇÃO E COMANDO "EVENTOS"
+# ============================================================
+
+@medir_operacao("compactar_eventos")
+def compactar_eventos(lote=TAMANHO_LOTE_COMPACTACAO, mostrar=True):
+
+    #Apaga, em lotes de uma transação cada, os eventos já confirmados por
+    #todos os consumidores. Retorna quantos foram apagados.
+
+    conn = conexao_leitura()
+    limite = conn.execute("""
+        SELECT COALESCE((SELECT MIN(ultimo_seq) FROM consumidores_eventos),
+                        (SELECT MAX(seq) FROM eventos), 0)
+    """).fetchone()[0]
+
+    apagados = 0
+    while True:
+        n = executar_escrita(_apagar_lote, limite, lote)
+        apagados += n
+        if n < lote:
+            break
+
+    if mostrar:
+        print(f"✔ {apagados} evento(s) apagado(s) (confirmados até o seq {limite}).")
+    return apagados
+
+def _apagar_lote(conn, limite, lote):
+    return conn.execute("""
+        DELETE FROM eventos WHERE seq IN (SELECT seq FROM eventos WHERE seq <= ? ORDER BY seq LIMIT ?)
+    """, (limite, lote)).rowcount
+
+def situacao_eventos():
+
+    #{"primeiro", "ultimo", "consumidores": [(nome, ultimo_seq, pendentes, atualizado_em)]}.
+
+    conn = conexao_leitura()
+    primeiro, ultimo = conn.execute("SELECT MIN(seq), MAX(seq) FROM eventos").fetchone()
+    consumidores = [
+        (nome, seq, conn.execute("SELECT COUNT(*) FROM eventos WHERE seq > ?", (seq,)).fetchone()[0], quando)
+        for nome, seq, quando in conn.execute(
+            "SELECT nome, ultimo_seq, atualizado_em FROM consumidores_eventos ORDER BY nome").fetchall()
+    ]
+    return {"primeiro": primeiro, "ultimo": ultimo, "consumidores": consumidores}
+
+def comando_eventos(acao, consumidor=None, tamanho=TAMANHO_LOTE_EVENTOS, tabelas=None, seguir=False,
+                    desde_inicio=False):
+
+    #Comando "eventos" da linha de comando:
+    #situacao   eventos guardados e quanto falta para cada consumidor
+    #ler        escreve os eventos do consumidor em JSON Lines na saída padrão e confirma
+    #compactar  apaga os eventos que todos já confirmaram
+    #remover    tira o consumidor da lista
+
+    if acao in ("ler", "remover") and not consumidor:
+        raise ValueError(f"'eventos {acao}' precisa de --consumidor.")
+
+    if acao == "situacao":
+        situacao = situacao_eventos()
+        if situacao["ultimo"] is None:
+            print("Nenhum evento guardado.")
+        else:
+            print(f"Eventos guardados: seq {situacao['primeiro']} a {situacao['ultimo']}")
+        for nome, seq, pendentes, quando in situacao["consumidores"]:
+            print(f"  {nome}: confirmado até {seq} ({pendentes} pendente(s), em {quando})")
+    elif acao == "ler":
+        if desde_inicio:
+            registrar_consumidor(consumidor, desde_inicio=True)
+        for eventos in acompanhar_eventos(consumidor, tamanho, tabelas, seguir):
+            for evento in eventos:
+                sys.stdout.write(json.dumps(evento.como_dict(), ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    elif acao == "compactar":
+        compactar_eventos()
+    elif acao == "remover":
+        print("✔ Consumidor removido." if remover_consumidor(consumidor) else "Consumidor não encontrado.")
+    else:
+        raise ValueError(f"Ação inválida: {acao}.")
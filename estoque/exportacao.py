@@ -0,0 +1,238 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import csv              # Exportação em CSV
+import json             # Cabeçalho do formato colunar
+import os               # Tamanho do arquivo gerado
+import struct           # Tamanhos binários do formato colunar
+import sys              # Ordem dos bytes da máquina
+import time             # Medição de tempo (linhas e bytes por segundo)
+import zlib             # Compressão de cada coluna
+from array import array  # Colunas numéricas como vetores compactos
+
+from .arquivamento import fonte_historico
+from .banco import conexao_leitura
+from .historico import filtros_historico
+from .instrumentacao import medir_operacao
+
+
+# ============================================================
+#   EXPORTAÇÃO DE VENDAS E MOVIMENTAÇÕES (CSV / COLUNAR) EM BLOCOS
+# ============================================================
+#
+# As linhas saem do cursor com fetchmany, TAMANHO_BLOCO por vez, e cada bloco
+# é gravado antes de buscar o próximo: a memória usada não depende do tamanho
+# do histórico. A leitura é feita pela conexão somente leitura (um único
+# instantâneo do banco do começo ao fim, sem travar as vendas) e inclui o
+# arquivo morto.
+#
+# Formato colunar (.ecol), só com a biblioteca padrão:
+#
+#   "ECOL1\n"  tamanho (uint32)  cabeçalho JSON {tabela, colunas: [[nome, tipo]...], filtros}
+#   bloco:     linhas (uint32)   para cada coluna: tamanho (uint32) + zlib(nulos + valores)
+#   ...
+#   fim:       linhas = 0
+#
+# Tipos: "i" inteiro (int64), "f" real (float64), "t" texto (tamanhos uint32
+# + UTF-8 concatenado). "nulos" tem um byte por linha (1 = NULL). Tudo em
+# little-endian. Guardar coluna por coluna põe valores parecidos lado a lado,
+# e o zlib comprime bem mais que o CSV. ler_colunar() lê de volta.
+
+# Linhas por bloco (fetchmany e bloco do formato colunar)
+TAMANHO_BLOCO = 10_000
+
+# Nível de compressão do formato colunar (1 = rápido ... 9 = menor)
+NIVEL_COMPRESSAO = 6
+
+MAGICO_COLUNAR = b"ECOL1\n"
+
+FORMATOS_EXPORTACAO = ("csv", "colunar")
+
+# Colunas exportadas de cada tabela: (nome, expressão SQL, tipo colunar)
+COLUNAS_EXPORTACAO = {
+    "vendas": (
+        ("id", "id", "i"),
+        ("produto_id", "produto_id", "i"),
+        ("nome_produto", "nome_produto", "t"),
+        ("quantidade", "quantidade", "i"),
+        ("data", "data", "t"),
+        ("unitario_centavos", "unitario_centavos", "i"),
+        ("total_centavos", "total_centavos", "i"),
+        ("forma_pagamento", "forma_pagamento", "t"),
+        ("consumidor", "consumidor", "t"),
+        ("custo_centavos", "custo_centavos", "i"),
+    ),
+    "movimentacoes": (
+        ("id", "m.id", "i"),
+        ("produto_id", "m.produto_id", "i"),
+        ("produto", "(SELECT p.nome FROM produtos p WHERE p.id = m.produto_id)", "t"),
+        ("tipo", "m.tipo", "t"),
+        ("quantidade", "m.quantidade", "i"),
+        ("data", "m.data", "t"),
+        ("usuario", "m.usuario", "t"),
+    ),
+}
+
+def linhas_exportacao(tabela, data_inicio=None, data_fim=None, produto_id=None, tamanho=TAMANHO_BLOCO):
+
+    #Gera blocos (listas de até "tamanho" linhas) da tabela, em ordem de data.
+
+    conn = conexao_leitura()
+    colunas = ", ".join(expr for _, expr, _ in COLUNAS_EXPORTACAO[tabela])
+    prefixo = "m." if tabela == "movimentacoes" else ""
+    filtros, params = filtros_historico(f"{prefixo}data", f"{prefixo}produto_id", data_inicio, data_fim, produto_id)
+
+    sql = f"SELECT {colunas} FROM {fonte_historico(conn, tabela)} {prefixo.rstrip('.')}"
+    if filtros:
+        sql += " WHERE " + " AND ".join(filtros)
+    sql += f" ORDER BY {prefixo}data, {prefixo}id"
+
+    # Cursor próprio: o sqlite3 só avança no banco quando fetchmany pede
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        while True:
+            bloco = cursor.fetchmany(tamanho)
+            if not bloco:
+                break
+            yield bloco
+    finally:
+        cursor.close()
+
+def _escrever_csv(f, tabela, blocos):
+    escritor = csv.writer(f)
+    escritor.writerow([nome for nome, _, _ in COLUNAS_EXPORTACAO[tabela]])
+    for bloco in blocos:
+        escritor.writerows(bloco)
+        yield len(bloco)
+
+def _codificar_coluna(valores, tipo):
+
+    #Uma coluna de um bloco: zlib(byte de NULL por linha + valores).
+
+    nulos = bytes(v is None for v in valores)
+
+    if tipo == "t":
+        textos = [b"" if v is None else str(v).encode("utf-8") for v in valores]
+        tamanhos = array("I", map(len, textos))
+        if sys.byteorder == "big":
+            tamanhos.byteswap()
+        dados = tamanhos.tobytes() + b"".join(textos)
+    else:
+        numeros = array("q" if tipo == "i" else "d", (0 if v is None else v for v in valores))
+        if sys.byteorder == "big":
+            numeros.byteswap()
+        dados = numeros.tobytes()
+
+    return zlib.compress(nulos + dados, NIVEL_COMPRESSAO)
+
+def _escrever_colunar(f, tabela, blocos, filtros):
+    colunas = COLUNAS_EXPORTACAO[tabela]
+    cabecalho = json.dumps({
+        "tabela": tabela,
+        "colunas": [[nome, tipo] for nome, _, tipo in colunas],
+        "filtros": filtros,
+    }, ensure_ascii=False).encode("utf-8")
+    f.write(MAGICO_COLUNAR + struct.pack("<I", len(cabecalho)) + cabecalho)
+
+    for bloco in blocos:
+        f.write(struct.pack("<I", len(bloco)))
+        for posicao, (_, _, tipo) in enumerate(colunas):
+            dados = _codificar_coluna([linha[posicao] for linha in bloco], tipo)
+            f.write(struct.pack("<I", len(dados)) + dados)
+        yield len(bloco)
+
+    f.write(struct.pack("<I", 0))
+
+@medir_operacao("exportar_historico")
+def exportar_historico(tabela, caminho, formato=None, data_inicio=None, data_fim=None, produto_id=None,
+                       tamanho=TAMANHO_BLOCO, mostrar=True):
+
+    #Exporta "vendas" ou "movimentacoes" para CSV ou para o formato colunar
+    #(formato None = pela extensão: .ecol é colunar, o resto CSV).
+    #Datas AAAA-MM-DD (fim inclusivo). Retorna {linhas, bytes, segundos}.
+
+    if tabela not in COLUNAS_EXPORTACAO:
+        raise ValueError(f"Tabela inválida: {tabela} (use {' ou '.join(COLUNAS_EXPORTACAO)}).")
+    formato = formato or ("colunar" if caminho.lower().endswith(".ecol") else "csv")
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato inválido: {formato} (use {' ou '.join(FORMATOS_EXPORTACAO)}).")
+
+    blocos = linhas_exportacao(tabela, data_inicio, data_fim, produto_id, tamanho)
+    linhas = 0
+    inicio = time.perf_counter()
+
+    if formato == "csv":
+        f = open(caminho, "w", newline="", encoding="utf-8")
+        gravados = _escrever_csv(f, tabela, blocos)
+    else:
+        f = open(caminho, "wb")
+        filtros = {"data_inicio": data_inicio, "data_fim": data_fim, "produto_id": produto_id}
+        gravados = _escrever_colunar(f, tabela, blocos, filtros)
+
+    with f:
+        for n in gravados:
+            linhas += n
+            if mostrar:
+                decorrido = time.perf_counter() - inicio
+                print(f"\r  {linhas:,} linhas ({linhas / max(decorrido, 1e-9):,.0f} linhas/s)", end="", flush=True)
+
+    segundos = time.perf_counter() - inicio
+    tamanho_arquivo = os.path.getsize(caminho)
+
+    if mostrar:
+        print(f"\r✔ {tabela}: {linhas:,} linhas, {tamanho_arquivo / 1e6:,.1f} MB em {segundos:.1f}s "
+              f"({linhas / max(segundos, 1e-9):,.0f} linhas/s, {tamanho_arquivo / 1e6 / max(segundos, 1e-9):,.1f} MB/s) -> {caminho}")
+
+    return {"linhas": linhas, "bytes": tamanho_arquivo, "segundos": segundos}
+
+
+# ============================================================
+#                LEITURA DO FORMATO COLUNAR
+# ============================================================
+
+def _decodificar_coluna(dados, linhas, tipo):
+    dados = zlib.decompress(dados)
+    nulos, dados = dados[:linhas], dados[linhas:]
+
+    if tipo == "t":
+        tamanhos = array("I")
+        tamanhos.frombytes(dados[:linhas * tamanhos.itemsize])
+        if sys.byteorder == "big":
+            tamanhos.byteswap()
+        texto = memoryview(dados)[linhas * tamanhos.itemsize:]
+        valores, posicao = [], 0
+        for n in tamanhos:
+            valores.append(bytes(texto[posicao:posicao + n]).decode("utf-8"))
+            posicao += n
+    else:
+        numeros = array("q" if tipo == "i" else "d")
+        numeros.frombytes(dados)
+        if sys.byteorder == "big":
+            numeros.byteswap()
+        valores = numeros.tolist()
+
+    return [None if nulo else v for v, nulo in zip(valores, nulos)]
+
+def ler_colunar(caminho):
+
+    #Lê um arquivo .ecol bloco a bloco.
+    #Gera (cabeçalho, bloco); cada bloco é uma lista de tuplas, como no banco.
+
+    with open(caminho, "rb") as f:
+        if f.read(len(MAGICO_COLUNAR)) != MAGICO_COLUNAR:
+            raise ValueError(f"{caminho} não é um arquivo colunar do estoque.")
+        (tamanho,) = struct.unpack("<I", f.read(4))
+        cabecalho = json.loads(f.read(tamanho))
+        tipos = [tipo for _, tipo in cabecalho["colunas"]]
+
+        while True:
+            (linhas,) = struct.unpack("<I", f.read(4))
+            if not linhas:
+                break
+            colunas = []
+            for tipo in tipos:
+                (tamanho,) = struct.unpack("<I", f.read(4))
+                colunas.append(_decodificar_coluna(f.read(tamanho), linhas, tipo))
+            yield cabecalho, list(zip(*colunas))
@@ -0,0 +1,193 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+from datetime import datetime, timedelta  # Filtros de data das listagens
+
+from .arquivamento import fonte_historico
+from .banco import conexao_leitura
+from .dinheiro import reais
+from .instrumentacao import operacao
+
+
+# ============================================================
+#         PAGINAÇÃO POR CHAVE (KEYSET) PARA AS LISTAGENS
+# ============================================================
+
+# Linhas por página nas listagens
+TAMANHO_PAGINA = 20
+
+def paginar(select, chave, filtros=(), params=(), tamanho=TAMANHO_PAGINA, nome_operacao="paginar"):
+
+    #Gerador de páginas em ordem decrescente da chave, ex. (data, id).
+    #select: "SELECT ... FROM ..." sem WHERE/ORDER BY.
+    #chave: pares (coluna, posição da coluna na linha), ex. (("data", 3), ("id", 0)).
+    #filtros/params: condições extras do WHERE e seus valores.
+    #
+    #Cada página é buscada a partir da última (ou primeira) linha mostrada,
+    #com WHERE (data, id) < (?, ?) ... LIMIT n: só uma página fica em memória
+    #e o custo não depende de quantas páginas já foram vistas.
+    #Use next() ou send("proxima") para avançar e send("anterior") para voltar.
+    #O gerador termina quando não há mais linhas para frente.
+    #nome_operacao: nome usado pela instrumentação para cada página buscada.
+
+    cursor = conexao_leitura().cursor()
+
+    colunas = ", ".join(c for c, _ in chave)
+    marcadores = ", ".join("?" for _ in chave)
+    decrescente = ", ".join(f"{c} DESC" for c, _ in chave)
+    crescente = ", ".join(f"{c} ASC" for c, _ in chave)
+
+    def buscar(condicao=None, valores=(), ordem=decrescente):
+        where = list(filtros) + ([condicao] if condicao else [])
+        sql = select
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {ordem} LIMIT ?"
+        with operacao(nome_operacao):
+            return cursor.execute(sql, (*params, *valores, tamanho)).fetchall()
+
+    def limite(linha):
+        return tuple(linha[p] for _, p in chave)
+
+    pagina = buscar()
+    while pagina:
+        comando = yield pagina
+
+        if comando == "anterior":
+            anterior = buscar(f"({colunas}) > ({marcadores})", limite(pagina[0]), crescente)
+            anterior.reverse()
+            # Já estava na primeira página: volta a mostrar o início
+            pagina = anterior if len(anterior) == tamanho else buscar()
+        else:
+            pagina = buscar(f"({colunas}) < ({marcadores})", limite(pagina[-1]))
+
+def filtros_historico(coluna_data, coluna_produto, data_inicio=None, data_fim=None, produto_id=None):
+
+    #Monta as condições de período (datas AAAA-MM-DD, fim inclusivo) e produto.
+
+    filtros, params = [], []
+    if data_inicio:
+        filtros.append(f"{coluna_data} >= ?")
+        params.append(data_inicio)
+    if data_fim:
+        fim = datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)
+        filtros.append(f"{coluna_data} < ?")
+        params.append(fim.strftime("%Y-%m-%d"))
+    if produto_id is not None:
+        filtros.append(f"{coluna_produto} = ?")
+        params.append(produto_id)
+    return filtros, params
+
+def pedir_data(txt):
+
+    #Lê uma data AAAA-MM-DD; Enter vazio devolve None.
+
+    while True:
+        v = input(txt).strip()
+        if v == "":
+            return None
+        try:
+            datetime.strptime(v, "%Y-%m-%d")
+            return v
+        except ValueError:
+            print("Data inválida (use AAAA-MM-DD).")
+
+def pedir_filtros_historico():
+
+    #Pergunta período e produto (tudo opcional) para as listagens de histórico.
+
+    data_inicio = pedir_data("Data inicial (AAAA-MM-DD, Enter = todas): ")
+    data_fim = pedir_data("Data final (AAAA-MM-DD, Enter = todas): ")
+    while True:
+        txt = input("ID do produto (Enter = todos): ").strip()
+        if txt == "":
+            return data_inicio, data_fim, None
+        if txt.isdigit():
+            return data_inicio, data_fim, int(txt)
+        print("Valor inválido.")
+
+def mostrar_paginas(paginas, imprimir):
+
+    #Mostra as páginas de um gerador de paginar().
+    #Enter = próxima, a = anterior, s = sair. Retorna False se não havia nada.
+
+    try:
+        pagina = next(paginas)
+    except StopIteration:
+        return False
+
+    while True:
+        imprimir(pagina)
+        op = input("[Enter] próxima | a - anterior | s - sair: ").strip().lower()
+
+        if op == "s":
+            paginas.close()
+            return True
+
+        try:
+            pagina = paginas.send("anterior" if op == "a" else "proxima")
+        except StopIteration:
+            print("Fim da listagem.")
+            return True
+
+
+# ============================================================
+#            HISTÓRICO DE VENDAS E MOVIMENTAÇÕES
+# ============================================================
+
+def paginas_vendas(data_inicio=None, data_fim=None, produto_id=None, tamanho=TAMANHO_PAGINA):
+
+    #Páginas do histórico de vendas, mais recentes primeiro (inclui o arquivo morto).
+
+    filtros, params = filtros_historico("data", "produto_id", data_inicio, data_fim, produto_id)
+    return paginar(f"""
+        SELECT id, nome_produto, quantidade, data, unitario_centavos, total_centavos, forma_pagamento, consumidor
+        FROM {fonte_historico(conexao_leitura(), "vendas")}
+    """, (("data", 3), ("id", 0)), filtros, params, tamanho, "listar_vendas")
+
+def listar_vendas():
+
+    #Lista o histórico de vendas registradas, uma página por vez.
+
+    data_inicio, data_fim, produto_id = pedir_filtros_historico()
+
+    def imprimir(vendas):
+        print("\n" + "-"*110)
+        print(f"{'ID':<4} | {'Produto':<25} | {'Qtd':<4} | {'Data':<19} | {'Unitário':<10} | {'Total':<10} | {'Pgto':<8} | Consumidor")
+        print("-"*110)
+
+        for v in vendas:
+            print(f"{v[0]:<4} | {v[1]:<25} | {v[2]:<4} | {v[3]:<19} | R${reais(v[4]):<10.2f} | R${reais(v[5]):<10.2f} | {v[6]:<8} | {v[7]}")
+
+        print("-"*110)
+
+    if not mostrar_paginas(paginas_vendas(data_inicio, data_fim, produto_id), imprimir):
+        print("Nenhuma venda registrada.")
+
+def paginas_movimentacoes(data_inicio=None, data_fim=None, produto_id=None, tamanho=TAMANHO_PAGINA):
+
+    #Páginas das movimentações de estoque, mais recentes primeiro (inclui o arquivo morto).
+    #O nome vem de uma subconsulta, não de JOIN: assim, com o arquivo morto, o
+    #SQLite percorre cada parte do UNION ALL pelo índice de data, sem ordenar tudo.
+
+    filtros, params = filtros_historico("m.data", "m.produto_id", data_inicio, data_fim, produto_id)
+    filtros.append("EXISTS (SELECT 1 FROM produtos p WHERE p.id = m.produto_id)")
+    return paginar(f"""
+        SELECT m.id, (SELECT p.nome FROM produtos p WHERE p.id = m.produto_id), m.tipo, m.quantidade, m.data, m.usuario
+        FROM {fonte_historico(conexao_leitura(), "movimentacoes")} m
+    """, (("m.data", 4), ("m.id", 0)), filtros, params, tamanho, "listar_movimentacoes")
+
+def listar_movimentacoes():
+
+    #Exibe as entradas/saídas de estoque, uma página por vez.
+
+    data_inicio, data_fim, produto_id = pedir_filtros_historico()
+
+    def imprimir(movs):
+        print("\nMovimentações:")
+        for m in movs:
+            print(f"{m[0]} | {m[1]} | {m[2]} | {m[3]} un | {m[4]} | Usuário: {m[5] or 'N/A'}")
+
+    if not mostrar_paginas(paginas_movimentacoes(data_inicio, data_fim, produto_id), imprimir):
+        print("Nenhuma movimentação.")
@@ -0,0 +1,229 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import os               # Tamanho/data do arquivo (assinatura da importação)
+import csv              # Leitura de arquivos CSV na importação em lote
+import json             # Leitura de arquivos JSON Lines na importação em lote
+import time             # Medição de tempo (registros por segundo)
+from datetime import datetime  # Data/hora das movimentações
+
+from .banco import conexao
+from .instrumentacao import medir_operacao
+from .terminal import converter_centavos, converter_float, converter_int
+
+
+# ============================================================
+#     IMPORTAÇÃO EM LOTE (CSV / JSON LINES) SEM INTERAÇÃO
+# ============================================================
+
+# Linhas gravadas por transação na importação
+TAMANHO_LOTE_IMPORTACAO = 1000
+
+# Máximo de linhas rejeitadas exibidas uma a uma
+MAX_REJEITADAS_EXIBIDAS = 20
+
+def ler_registros_importacao(caminho, delimitador=","):
+
+    #Lê o arquivo em streaming, um registro (dict) por vez.
+    #.csv usa a primeira linha como cabeçalho; .jsonl/.ndjson tem um objeto JSON por linha.
+    #Gera (número da linha no arquivo, registro ou None se a linha não for JSON válido).
+
+    if caminho.lower().endswith(".csv"):
+        with open(caminho, newline="", encoding="utf-8-sig") as f:
+            leitor = csv.DictReader(f, delimiter=delimitador)
+            for registro in leitor:
+                yield leitor.line_num, registro
+    else:
+        with open(caminho, encoding="utf-8") as f:
+            for numero, linha in enumerate(f, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    registro = None
+                yield numero, registro if isinstance(registro, dict) else None
+
+def validar_registro_importacao(registro):
+
+    #Valida um registro com as mesmas regras dos prompts (pedir_int / pedir_float).
+    #Com "produto_id": entrada de estoque ("entrada", (produto_id, quantidade)).
+    #Sem "produto_id": produto novo ("produto", (nome, venda, custo, qtd, peso, marca)),
+    #com venda e custo lidos em reais ("9,90") e devolvidos em centavos.
+    #Levanta ValueError com o motivo se o registro for inválido.
+
+    if registro is None:
+        raise ValueError("linha mal formada")
+
+    def campo(nome, converter, minimo=None):
+        valor = registro.get(nome)
+        if valor is None or str(valor).strip() == "":
+            raise ValueError(f"campo '{nome}' vazio")
+        try:
+            return converter(valor, minimo)
+        except ValueError as e:
+            raise ValueError(f"campo '{nome}': {e}") from None
+
+    if str(registro.get("produto_id") or "").strip():
+        return "entrada", (campo("produto_id", converter_int, 1), campo("quantidade", converter_int, 1))
+
+    nome = str(registro.get("nome") or "").strip()
+    if not nome:
+        raise ValueError("campo 'nome' vazio")
+
+    return "produto", (
+        nome,
+        campo("valor_venda", converter_centavos, 0),
+        campo("valor_custo", converter_centavos, 0),
+        campo("quantidade", converter_int, 0),
+        campo("peso", converter_float, 0),
+        str(registro.get("marca") or "").strip(),
+    )
+
+@medir_operacao("importar_lote")
+def gravar_lote_importacao(produtos, entradas, arquivo, assinatura, processadas, usuario):
+
+    #Grava um lote numa única transação, junto com o progresso da importação,
+    #para que um reinício continue exatamente do último lote confirmado.
+    #Retorna a lista de entradas recusadas por produto inexistente.
+
+    conn = conexao()
+    cursor = conn.cursor()
+
+    data = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    recusadas = []
+
+    # IMMEDIATE: ninguém mais insere produtos até o commit, então os IDs
+    # maiores que o máximo atual são exatamente os deste lote
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        if produtos:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM produtos")
+            ultimo_id = cursor.fetchone()[0]
+
+            cursor.executemany("""
+                INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, produtos)
+
+            cursor.execute("""
+                INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+                SELECT id, 'entrada', quantidade, ?, ? FROM produtos
+                WHERE id > ? AND quantidade > 0
+            """, (data, usuario, ultimo_id))
+
+        if entradas:
+            ids = {pid for _, pid, _ in entradas}
+            marcadores = ", ".join("?" for _ in ids)
+            cursor.execute(f"SELECT id FROM produtos WHERE id IN ({marcadores})", list(ids))
+            existentes = {linha[0] for linha in cursor.fetchall()}
+
+            recusadas = [e for e in entradas if e[1] not in existentes]
+            validas = [(pid, qtd) for _, pid, qtd in entradas if pid in existentes]
+
+            cursor.executemany(
+                "UPDATE produtos SET quantidade = quantidade + ? WHERE id=?",
+                [(qtd, pid) for pid, qtd in validas],
+            )
+            cursor.executemany("""
+                INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+                VALUES (?, 'entrada', ?, ?, ?)
+            """, [(pid, qtd, data, usuario) for pid, qtd in validas])
+
+        cursor.execute("""
+            INSERT INTO importacoes (arquivo, assinatura, processadas, atualizado_em)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (arquivo) DO UPDATE SET
+                assinatura = excluded.assinatura,
+                processadas = excluded.processadas,
+                atualizado_em = excluded.atualizado_em,
+                concluida = 0
+        """, (arquivo, assinatura, processadas, data))
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return recusadas
+
+def importar_arquivo(caminho, tamanho_lote=TAMANHO_LOTE_IMPORTACAO, usuario=None, delimitador=","):
+
+    #Importa produtos novos e entradas de estoque de um CSV ou JSON Lines,
+    #gravando em lotes de "tamanho_lote" registros (um commit por lote).
+    #Se uma importação anterior do mesmo arquivo foi interrompida, continua
+    #depois do último lote confirmado. Retorna um resumo em dicionário.
+
+    conn = conexao()
+    cursor = conn.cursor()
+
+    arquivo = os.path.abspath(caminho)
+    info = os.stat(arquivo)
+    assinatura = f"{info.st_size}:{info.st_mtime_ns}"
+
+    cursor.execute("SELECT assinatura, processadas, concluida FROM importacoes WHERE arquivo=?", (arquivo,))
+    anterior = cursor.fetchone()
+    pular = 0
+
+    if anterior and anterior[0] == assinatura:
+        if anterior[2]:
+            print(f"{caminho} já foi importado ({anterior[1]} registros).")
+            return {"processadas": anterior[1], "importadas": 0, "rejeitadas": 0, "segundos": 0.0}
+        pular = anterior[1]
+        print(f"Retomando {caminho} a partir do registro {pular + 1}.")
+
+    processadas = gravadas = pular
+    importadas = rejeitadas = 0
+    produtos, entradas = [], []
+    inicio = time.perf_counter()
+
+    def rejeitar(numero, motivo):
+        nonlocal rejeitadas
+        rejeitadas += 1
+        if rejeitadas <= MAX_REJEITADAS_EXIBIDAS:
+            print(f"  linha {numero} rejeitada: {motivo}")
+
+    def gravar():
+        nonlocal importadas, gravadas, produtos, entradas
+        recusadas = gravar_lote_importacao(produtos, entradas, arquivo, assinatura, processadas, usuario)
+        for numero, pid, _ in recusadas:
+            rejeitar(numero, f"produto {pid} não encontrado")
+        importadas += len(produtos) + len(entradas) - len(recusadas)
+        produtos, entradas = [], []
+        gravadas = processadas
+
+        decorrido = time.perf_counter() - inicio
+        print(f"  {processadas} registros ({(processadas - pular) / decorrido:,.0f} registros/s)")
+
+    for indice, (numero, registro) in enumerate(ler_registros_importacao(arquivo, delimitador)):
+        if indice < pular:
+            continue
+
+        try:
+            tipo, valores = validar_registro_importacao(registro)
+        except ValueError as e:
+            rejeitar(numero, e)
+        else:
+            if tipo == "produto":
+                produtos.append(valores)
+            else:
+                entradas.append((numero, *valores))
+
+        processadas += 1
+        if processadas - gravadas >= tamanho_lote:
+            gravar()
+
+    if processadas > gravadas:
+        gravar()
+
+    cursor.execute("UPDATE importacoes SET concluida = 1 WHERE arquivo=?", (arquivo,))
+    conn.commit()
+
+    segundos = time.perf_counter() - inicio
+    if rejeitadas > MAX_REJEITADAS_EXIBIDAS:
+        print(f"  ... e mais {rejeitadas - MAX_REJEITADAS_EXIBIDAS} linhas rejeitadas.")
+    print(f"✔ Importação concluída: {importadas} importados, {rejeitadas} rejeitados "
+          f"em {segundos:.1f}s ({(processadas - pular) / max(segundos, 1e-9):,.0f} registros/s).")
+
+    return {"processadas": processadas, "importadas": importadas, "rejeitadas": rejeitadas, "segundos": segundos}
@@ -0,0 +1,283 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import sqlite3          # Cursor/conexão instrumentados são subclasses dos do sqlite3
+import os               # Lê ESTOQUE_TRACE do ambiente
+import json             # Exporta as estatísticas
+import time             # Cronômetro de alta resolução
+import threading        # Operação em andamento por thread
+import re               # Normaliza o texto dos SQL
+import contextlib       # Contexto vazio da instrumentação desligada
+import functools        # Decorador de operações medidas
+
+
+# ============================================================
+#    INSTRUMENTAÇÃO: TEMPO DE CADA SQL E LATÊNCIA POR OPERAÇÃO
+# ============================================================
+
+# Desligada por padrão (ESTOQUE_TRACE=1 liga desde o início, ou pelo menu admin).
+# Desligada, as conexões são sqlite3.Connection comuns e as operações só
+# testam esta variável: o custo é praticamente zero.
+INSTRUMENTACAO_ATIVA = os.environ.get("ESTOQUE_TRACE") == "1"
+
+# Operação em andamento em cada thread (agrupa os SQL executados)
+_operacao_atual = threading.local()
+
+# {operação: {"chamadas", "total_ms", "max_ms", "histograma": {faixa: n}, "sql": {texto: {...}}}}
+_estatisticas = {}
+_trava_estatisticas = threading.Lock()
+
+# Listas "IN (?, ?, ?)" de tamanhos diferentes contam como o mesmo comando
+_LISTA_MARCADORES = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+def _estatistica_operacao(nome):
+    est = _estatisticas.get(nome)
+    if est is None:
+        est = _estatisticas[nome] = {"chamadas": 0, "total_ms": 0.0, "max_ms": 0.0, "histograma": {}, "sql": {}}
+    return est
+
+def _somar_histograma(histograma, ms):
+
+    #Faixas em potências de 2 microssegundos: a chave i conta durações <= 2**i µs.
+
+    faixa = int(ms * 1000).bit_length()
+    histograma[faixa] = histograma.get(faixa, 0) + 1
+
+def _registrar_sql(sql, ms, linhas):
+
+    #Soma um comando às estatísticas da operação em andamento.
+    #Retorna o registro do comando, para as leituras (fetch) somarem linhas e tempo depois.
+
+    texto = _LISTA_MARCADORES.sub("(?...)", " ".join(sql.split()))
+    nome = getattr(_operacao_atual, "nome", None) or "(sem operação)"
+
+    with _trava_estatisticas:
+        comandos = _estatistica_operacao(nome)["sql"]
+        reg = comandos.get(texto)
+        if reg is None:
+            reg = comandos[texto] = {"execucoes": 0, "total_ms": 0.0, "max_ms": 0.0, "linhas": 0}
+        reg["execucoes"] += 1
+        reg["total_ms"] += ms
+        reg["max_ms"] = max(reg["max_ms"], ms)
+        reg["linhas"] += max(linhas, 0)
+    return reg
+
+class CursorInstrumentado(sqlite3.Cursor):
+
+    #Cursor que cronometra execute/executemany e conta as linhas lidas.
+
+    _registro = None
+
+    def _medir(self, metodo, sql, *args):
+        t0 = time.perf_counter()
+        try:
+            return metodo(self, sql, *args)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            self._registro = _registrar_sql(sql, ms, self.rowcount)
+
+    def execute(self, sql, parametros=()):
+        return self._medir(sqlite3.Cursor.execute, sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self._medir(sqlite3.Cursor.executemany, sql, parametros)
+
+    def executescript(self, script):
+        return self._medir(sqlite3.Cursor.executescript, script)
+
+    def _ler(self, metodo, *args):
+        t0 = time.perf_counter()
+        resultado = metodo(self, *args)
+        reg = self._registro
+        if reg is not None:
+            linhas = len(resultado) if isinstance(resultado, list) else int(resultado is not None)
+            with _trava_estatisticas:
+                reg["total_ms"] += (time.perf_counter() - t0) * 1000
+                reg["linhas"] += linhas
+        return resultado
+
+    def fetchone(self):
+        return self._ler(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        return self._ler(sqlite3.Cursor.fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self._ler(sqlite3.Cursor.fetchall)
+
+    def __next__(self):
+        linha = self._ler(sqlite3.Cursor.fetchone)
+        if linha is None:
+            raise StopIteration
+        return linha
+
+class ConexaoInstrumentada(sqlite3.Connection):
+
+    #Conexão cujos cursores são instrumentados. conn.execute & cia. do
+    #sqlite3.Connection não passam por cursor() em Python: são refeitos aqui
+    #sobre self.cursor(). commit/rollback também contam (COMMIT é o fsync).
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+    def _medir_fim(self, metodo, sql):
+        t0 = time.perf_counter()
+        try:
+            return metodo(self)
+        finally:
+            _registrar_sql(sql, (time.perf_counter() - t0) * 1000, 0)
+
+    def commit(self):
+        return self._medir_fim(sqlite3.Connection.commit, "COMMIT")
+
+    def rollback(self):
+        return self._medir_fim(sqlite3.Connection.rollback, "ROLLBACK")
+
+class _Operacao:
+
+    #Contexto que dá nome aos SQL executados dentro dele e mede sua duração total.
+    #Operações aninhadas contam só na mais externa.
+
+    __slots__ = ("nome", "anterior", "inicio")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.anterior = getattr(_operacao_atual, "nome", None)
+        if self.anterior is None:
+            _operacao_atual.nome = self.nome
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *erro):
+        if self.anterior is not None:
+            return False
+
+        ms = (time.perf_counter() - self.inicio) * 1000
+        _operacao_atual.nome = None
+        with _trava_estatisticas:
+            est = _estatistica_operacao(self.nome)
+            est["chamadas"] += 1
+            est["total_ms"] += ms
+            est["max_ms"] = max(est["max_ms"], ms)
+            _somar_histograma(est["histograma"], ms)
+        return False
+
+class _SqlDaOperacao:
+
+    #Contexto que só dá nome aos SQL executados dentro dele, sem contar uma
+    #chamada nem medir a duração: o escritor usa para pôr o SQL de cada
+    #operação da fila na conta de quem a enviou (de outra thread).
+
+    __slots__ = ("nome", "anterior")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.anterior = getattr(_operacao_atual, "nome", None)
+        _operacao_atual.nome = self.nome
+        return self
+
+    def __exit__(self, *erro):
+        _operacao_atual.nome = self.anterior
+        return False
+
+_SEM_OPERACAO = contextlib.nullcontext()
+
+def operacao_atual():
+
+    #Nome da operação em andamento nesta thread (None fora de uma).
+
+    return getattr(_operacao_atual, "nome", None)
+
+def sql_da_operacao(nome):
+
+    #with sql_da_operacao(nome): ... os SQL do bloco contam para "nome" (se ligada e com nome).
+
+    return _SqlDaOperacao(nome) if INSTRUMENTACAO_ATIVA and nome else _SEM_OPERACAO
+
+def operacao(nome):
+
+    #with operacao("registrar_venda"): ... agrupa e mede o bloco (se a instrumentação estiver ligada).
+
+    return _Operacao(nome) if INSTRUMENTACAO_ATIVA else _SEM_OPERACAO
+
+def medir_operacao(nome):
+
+    #Decorador: a função inteira conta como a operação "nome".
+
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            if not INSTRUMENTACAO_ATIVA:
+                return funcao(*args, **kwargs)
+            with _Operacao(nome):
+                return funcao(*args, **kwargs)
+        return medida
+    return decorador
+
+def _percentil(histograma, total, p):
+
+    #Limite superior (ms) da faixa do histograma onde cai o percentil p.
+
+    acumulado = 0
+    for faixa in sorted(histograma):
+        acumulado += histograma[faixa]
+        if acumulado >= total * p:
+            return (2 ** faixa) / 1000
+    return 0.0
+
+def relatorio_instrumentacao():
+
+    #Resumo das estatísticas coletadas, pronto para exibir ou gravar em JSON.
+
+    with _trava_estatisticas:
+        operacoes = {}
+        for nome, est in sorted(_estatisticas.items()):
+            n = est["chamadas"]
+            operacoes[nome] = {
+                "chamadas": n,
+                "total_ms": round(est["total_ms"], 3),
+                "media_ms": round(est["total_ms"] / n, 3) if n else None,
+                "p50_ms": min(_percentil(est["histograma"], n, 0.50), round(est["max_ms"], 3)) if n else None,
+                "p95_ms": min(_percentil(est["histograma"], n, 0.95), round(est["max_ms"], 3)) if n else None,
+                "p99_ms": min(_percentil(est["histograma"], n, 0.99), round(est["max_ms"], 3)) if n else None,
+                "max_ms": round(est["max_ms"], 3),
+                "histograma_us": {f"<={2 ** f}": c for f, c in sorted(est["histograma"].items())},
+                "sql": sorted(
+                    ({"sql": texto, **{k: round(v, 3) if isinstance(v, float) else v for k, v in reg.items()}}
+                     for texto, reg in est["sql"].items()),
+                    key=lambda r: r["total_ms"], reverse=True,
+                ),
+            }
+    return {"ativa": INSTRUMENTACAO_ATIVA, "operacoes": operacoes}
+
+def exportar_instrumentacao(caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(relatorio_instrumentacao(), f, indent=2, ensure_ascii=False)
+
+def zerar_instrumentacao():
+    with _trava_estatisticas:
+        _estatisticas.clear()
+
+def ligar_instrumentacao(ativa=True):
+
+    #Liga/desliga a coleta. As conexões desta thread são reabertas com o tipo certo.
+
+    from .banco import fechar_conexoes     # banco importa este módulo
+
+    global INSTRUMENTACAO_ATIVA
+    INSTRUMENTACAO_ATIVA = ativa
+    fechar_conexoes()
@@ -0,0 +1,292 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+from . import instrumentacao, usuarios
+from .analise import relatorio_analise
+from .backup import backup_atual, iniciar_backup
+from .cadastros import cadastrar_cliente, cadastrar_fornecedor, listar_clientes, listar_fornecedores
+from .conciliacao import conciliar_estoque
+from .exportacao import exportar_historico
+from .historico import listar_movimentacoes, listar_vendas, pedir_filtros_historico
+from .instrumentacao import exportar_instrumentacao, ligar_instrumentacao, relatorio_instrumentacao, zerar_instrumentacao
+from .previsao import relatorio_compras
+from .produtos import (adicionar_produto, contar_estoque_baixo, editar_produto, entrada_estoque,
+                       excluir_produto, listar_estoque_baixo, listar_produtos, saida_estoque)
+from .relatorios import relatorio_financeiro, relatorio_periodo, relatorio_ranking
+from .usuarios import criar_usuario, existe_usuario, pedir_senha, validar_login
+from .vendas import registrar_venda
+
+
+# ============================================================
+#     MENUS (ESTOQUE / CLIENTES / RELATÓRIOS / PRINCIPAL)
+# ============================================================
+
+def menu_estoque():
+    while True:
+        print("\n--- ESTOQUE ---")
+        print("1 - Criar produto")
+        print("2 - Editar produto")
+        print("3 - Excluir produto")
+        print("4 - Entrada de estoque")
+        print("5 - Saída de estoque")
+        print("6 - Movimentações")
+        print("7 - Estoque baixo")
+        print("0 - Voltar")
+
+        op = input("> ")
+
+        if op == "1": adicionar_produto()
+        elif op == "2": editar_produto()
+        elif op == "3": excluir_produto()
+        elif op == "4": entrada_estoque()
+        elif op == "5": saida_estoque()
+        elif op == "6": listar_movimentacoes()
+        elif op == "7": listar_estoque_baixo()
+        elif op == "0": break
+        else:
+            print("Inválido!")
+
+def menu_clientes():
+    while True:
+        print("\n--- CLIENTES / FORNECEDORES ---")
+        print("1 - Cadastrar cliente")
+        print("2 - Listar clientes")
+        print("3 - Cadastrar fornecedor")
+        print("4 - Listar fornecedores")
+        print("0 - Voltar")
+
+        op = input("> ")
+
+        if op == "1": cadastrar_cliente()
+        elif op == "2": listar_clientes()
+        elif op == "3": cadastrar_fornecedor()
+        elif op == "4": listar_fornecedores()
+        elif op == "0": break
+        else:
+            print("Inválido!")
+
+def menu_relatorios():
+    while True:
+        print("\n--- RELATÓRIOS ---")
+        print("1 - Listar produtos")
+        print("2 - Listar vendas")
+        print("3 - Financeiro")
+        print("4 - Vendas por período")
+        print("5 - Exportar vendas/movimentações (CSV ou colunar)")
+        print("6 - Análise de vendas (totais, margem e mais vendidos)")
+        print("7 - Sugestão de compras (previsão de demanda)")
+        print("8 - Ranking de produtos e curva ABC")
+        print("0 - Voltar")
+
+        op = input("> ")
+
+        if op == "1": listar_produtos()
+        elif op == "2": listar_vendas()
+        elif op == "3": relatorio_financeiro()
+        elif op == "4": relatorio_periodo()
+        elif op == "5": menu_exportar()
+        elif op == "6": relatorio_analise()
+        elif op == "7": relatorio_compras()
+        elif op == "8": relatorio_ranking()
+        elif op == "0": break
+        else:
+            print("Inválido!")
+
+def menu_exportar():
+
+    #Pergunta tabela, arquivo e filtros e exporta em blocos.
+
+    print("\nExportar: 1 - Vendas | 2 - Movimentações")
+    tabela = {"1": "vendas", "2": "movimentacoes"}.get(input("> ").strip())
+    if not tabela:
+        print("Inválido!")
+        return
+
+    caminho = input(f"Arquivo (.csv ou .ecol) [{tabela}.csv]: ").strip() or f"{tabela}.csv"
+    data_inicio, data_fim, produto_id = pedir_filtros_historico()
+    exportar_historico(tabela, caminho, None, data_inicio, data_fim, produto_id)
+
+def menu_admin():
+
+    #Menu de administração (opção 99 do menu principal, não listada).
+
+    while True:
+        estado = "ligada" if instrumentacao.INSTRUMENTACAO_ATIVA else "desligada"
+        print(f"\n--- ADMIN (instrumentação {estado}) ---")
+        print("1 - Ligar/desligar instrumentação")
+        print("2 - Latência por operação")
+        print("3 - SQL mais lentos de uma operação")
+        print("4 - Exportar estatísticas (JSON)")
+        print("5 - Zerar estatísticas")
+        print("6 - Conciliar estoque com as movimentações")
+        print("7 - Backup em segundo plano")
+        print("0 - Voltar")
+
+        op = input("> ")
+
+        if op == "1":
+            ligar_instrumentacao(not instrumentacao.INSTRUMENTACAO_ATIVA)
+        elif op == "2":
+            mostrar_latencias()
+        elif op == "3":
+            mostrar_sql_operacao(input("Operação: ").strip())
+        elif op == "4":
+            caminho = input("Arquivo [instrumentacao.json]: ").strip() or "instrumentacao.json"
+            exportar_instrumentacao(caminho)
+            print(f"✔ Exportado para {caminho}")
+        elif op == "5":
+            zerar_instrumentacao()
+            print("✔ Estatísticas zeradas.")
+        elif op == "6":
+            corrigir = input("Corrigir divergências pelo livro? (s/N): ").strip().lower() == "s"
+            conciliar_estoque(corrigir)
+        elif op == "7":
+            menu_backup()
+        elif op == "0": break
+        else:
+            print("Inválido!")
+
+def menu_backup():
+
+    #Mostra o andamento do backup em segundo plano ou o resultado do último;
+    #sem nenhum em andamento, pergunta se começa outro. As vendas continuam
+    #enquanto a cópia é feita.
+
+    backup = backup_atual()
+
+    if backup is not None and backup.em_andamento():
+        progresso = f"{100 * backup.copiadas / backup.total:.0f}%" if backup.total else "iniciando"
+        print(f"Backup em andamento: {backup.fase} ({progresso}).")
+        return
+
+    if backup is not None:
+        if backup.fase == "concluido":
+            r = backup.resultado
+            print(f"Último backup: {r['arquivo']} ({r['bytes'] / 1e6:,.1f} MB, {r['segundos']:.1f}s)")
+        else:
+            print(f"Último backup: {backup.fase} {backup.erro or ''}")
+
+    if input("Iniciar um backup agora? (s/N): ").strip().lower() == "s":
+        backup = iniciar_backup()
+        print(f"✔ Backup iniciado em segundo plano (pasta {backup.pasta}).")
+
+def mostrar_latencias():
+    operacoes = relatorio_instrumentacao()["operacoes"]
+
+    if not operacoes:
+        print("Nenhuma estatística coletada.")
+        return
+
+    print("\n" + "-"*96)
+    print(f"{'Operação':<30} | {'Chamadas':>8} | {'Média ms':>9} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'Máx ms':>8}")
+    print("-"*96)
+    for nome, op in operacoes.items():
+        if not op["chamadas"]:
+            continue
+        print(f"{nome:<30} | {op['chamadas']:>8} | {op['media_ms']:>9.3f} | {op['p50_ms']:>8.3f} | "
+              f"{op['p95_ms']:>8.3f} | {op['p99_ms']:>8.3f} | {op['max_ms']:>8.3f}")
+    print("-"*96)
+
+def mostrar_sql_operacao(nome, limite=10):
+    op = relatorio_instrumentacao()["operacoes"].get(nome)
+
+    if not op:
+        print("Operação sem estatísticas.")
+        return
+
+    for reg in op["sql"][:limite]:
+        print(f"\n{reg['total_ms']:.3f} ms em {reg['execucoes']} execução(ões), {reg['linhas']} linha(s), máx {reg['max_ms']:.3f} ms")
+        print(f"  {reg['sql'][:200]}")
+
+def menu_principal():
+
+    #Menu principal do sistema.
+
+    while True:
+        print("\n====== MENU ======")
+
+        baixo = contar_estoque_baixo()
+        if baixo:
+            print(f"⚠ {baixo} produto(s) com estoque baixo (Estoque > 7)")
+
+        print("1 - Estoque")
+        print("2 - Clientes/Fornecedores")
+        print("3 - Registrar venda")
+        print("4 - Relatórios")
+        print("0 - Sair")
+
+        op = input("> ")
+
+        if op == "1": menu_estoque()
+        elif op == "2": menu_clientes()
+        elif op == "3": registrar_venda()
+        elif op == "4": menu_relatorios()
+        elif op == "99": menu_admin()
+        elif op == "0":
+            print("Saindo...")
+            break
+        else:
+            print("Inválido!")
+
+
+# ============================================================
+#              TELA INICIAL (LOGIN / REGISTRO)
+# ============================================================
+
+def tela_inicial():
+
+    #Primeiro menu do sistema:
+    #Login
+    #Registrar conta
+    #Sair
+
+    while True:
+        print("\n===== INÍCIO =====")
+        print("1 - Login")
+        print("2 - Registrar")
+        print("3 - Sair")
+        op = input("> ").strip()
+
+        if op == "1":
+            # LOGIN
+            username = input("Username: ").strip()
+            password = pedir_senha("Senha: ")
+
+            if validar_login(username, password):
+                usuarios.current_user = username
+                print(f"Login OK! Bem-vindo(a), {username}.")
+                return
+            else:
+                print("Usuário ou senha incorretos.")
+
+        elif op == "2":
+            # REGISTRO
+            username = input("Escolha um username: ").strip()
+
+            if username == "":
+                print("Username não pode ser vazio.")
+                continue
+
+            if existe_usuario(username):
+                print("Esse username já existe.")
+                continue
+
+            s1 = pedir_senha("Senha: ")
+            s2 = pedir_senha("Confirme a senha: ")
+
+            if s1 != s2:
+                print("As senhas não conferem.")
+                continue
+
+            if criar_usuario(username, s1):
+                print("Usuário criado! Faça login.")
+            else:
+                print("Erro ao criar usuário.")
+
+        elif op == "3":
+            print("Saindo...")
+            exit()
+
+        else:
+            print("Opção inválida.")
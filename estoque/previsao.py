@@ -0,0 +1,316 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import math             # Arredondamento do ponto de pedido (Python puro)
+import time             # Medição de tempo da execução
+from datetime import date, datetime  # Dias da previsão
+
+from .arquivamento import fonte_historico
+from .banco import conexao_leitura
+from .escritor import executar_escrita
+from .instrumentacao import medir_operacao
+
+
+# ============================================================
+#   PREVISÃO DE DEMANDA E PONTO DE PEDIDO POR PRODUTO (SUAVIZAÇÃO)
+# ============================================================
+#
+# Cada produto tem uma demanda diária prevista por suavização exponencial
+# das vendas por dia (dias sem venda contam como zero):
+#
+#   nivel     = nivel + ALFA * (vendido no dia - nivel)
+#   variancia = (1 - ALFA) * variancia + ALFA * erro²
+#
+# Dias sem venda não são lidos: um intervalo de g dias zerados tem fórmula
+# fechada (o nível decai por (1 - ALFA)^g), então o custo é proporcional aos
+# pares (produto, dia) com venda, não a produtos x dias.
+#
+# As vendas são lidas já somadas por dia e produto, em ordem de dia, em
+# blocos; com numpy, cada dia de um bloco atualiza de uma vez os vetores de
+# todos os produtos que venderam nele. Sem numpy, o mesmo cálculo roda em
+# Python. O estado de cada produto fica em demanda_produtos: a próxima
+# execução lê só os dias depois de execucao_previsao.ate_dia.
+#
+# Do nível e da variância saem:
+#
+#   ponto_pedido = demanda no prazo de reposição + estoque de segurança
+#                  (FATOR_SEGURANCA desvios da demanda no prazo)
+#   estoque_alvo = ponto_pedido + demanda de DIAS_COBERTURA dias
+#
+# A sugestão de compra de um produto no ponto de pedido é estoque_alvo menos
+# o estoque atual. Com aplicar=True, ponto_pedido vira o estoque_minimo do
+# produto (o alerta de estoque baixo passa a ser o da previsão).
+
+# Peso do dia mais recente (0.1 ~ média dos últimos 19 dias)
+ALFA_DEMANDA = 0.1
+
+# Dias entre pedir e receber a mercadoria
+PRAZO_REPOSICAO = 7
+
+# Dias de venda que uma compra deve cobrir além do ponto de pedido
+DIAS_COBERTURA = 14
+
+# Desvios-padrão de estoque de segurança (1.65 ~ 95% dos prazos sem faltar)
+FATOR_SEGURANCA = 1.65
+
+# Frações de unidade abaixo disto não arredondam para cima (produto parado há
+# meses fica com demanda 0.0001, e não com ponto de pedido 1)
+FRACAO_IGNORADA = 0.05
+
+# Linhas (dia, produto) lidas por vez
+TAMANHO_BLOCO_PREVISAO = 100_000
+
+# Produtos na listagem de sugestões de compra
+LIMITE_SUGESTOES = 30
+
+# Dia de uma data do banco como date.toordinal() (julianday conta desde outra origem)
+SQL_DIA = "CAST(julianday(substr({}, 1, 10)) - 1721424.5 AS INTEGER)"
+
+class _EstadoPython:
+
+    #Estado da suavização em dicionários: produto_id -> valor.
+
+    def __init__(self, alfa, linhas):
+        self.alfa, self.beta = alfa, 1 - alfa
+        self.nivel, self.variancia, self.dia = {}, {}, {}
+        for pid, nivel, variancia, dia in linhas:
+            self.nivel[pid], self.variancia[pid], self.dia[pid] = nivel, variancia, dia
+
+    def _decair(self, pid, ate):
+
+        #Aplica os dias sem venda entre o último dia do produto e "ate" (inclusive).
+
+        g = ate - self.dia[pid]
+        if g > 0:
+            nivel, bg = self.nivel[pid], self.beta ** g
+            self.variancia[pid] = bg * self.variancia[pid] + nivel * nivel * self.beta ** (g - 1) * (1 - bg)
+            self.nivel[pid] = nivel * bg
+            self.dia[pid] = ate
+
+    def aplicar(self, bloco):
+        for dia, pid, qtd in bloco:
+            if pid not in self.nivel:
+                self.nivel[pid], self.variancia[pid], self.dia[pid] = 0.0, 0.0, dia - 1
+            else:
+                self._decair(pid, dia - 1)
+            erro = qtd - self.nivel[pid]
+            self.variancia[pid] = self.beta * self.variancia[pid] + self.alfa * erro * erro
+            self.nivel[pid] += self.alfa * erro
+            self.dia[pid] = dia
+
+    def resultado(self, ultimo, prazo, cobertura):
+
+        #Leva todos ao dia "ultimo" e gera (produto_id, nivel, variancia, dia, ponto_pedido, estoque_alvo).
+
+        for pid in self.nivel:
+            self._decair(pid, ultimo)
+        for pid, nivel in self.nivel.items():
+            variancia = self.variancia[pid]
+            ponto = math.ceil(nivel * prazo + FATOR_SEGURANCA * math.sqrt(variancia * prazo) - FRACAO_IGNORADA)
+            yield pid, nivel, variancia, ultimo, ponto, ponto + math.ceil(nivel * cobertura - FRACAO_IGNORADA)
+
+class _EstadoNumpy:
+
+    #O mesmo estado em vetores indexados pelo produto_id.
+
+    def __init__(self, np, alfa, linhas):
+        self.np = np
+        self.alfa, self.beta = alfa, 1 - alfa
+        linhas = list(linhas)
+        self.nivel = np.zeros(0)
+        self.variancia = np.zeros(0)
+        self.dia = np.zeros(0, dtype=np.int64)
+        self.ativo = np.zeros(0, dtype=bool)
+        if linhas:
+            ids = np.array([linha[0] for linha in linhas], dtype=np.int64)
+            self._crescer(int(ids.max()))
+            self.nivel[ids] = [linha[1] for linha in linhas]
+            self.variancia[ids] = [linha[2] for linha in linhas]
+            self.dia[ids] = [linha[3] for linha in linhas]
+            self.ativo[ids] = True
+
+    def _crescer(self, maior_id):
+        np = self.np
+        falta = maior_id + 1 - len(self.nivel)
+        if falta > 0:
+            falta = max(falta, len(self.nivel) // 2)
+            self.nivel = np.concatenate([self.nivel, np.zeros(falta)])
+            self.variancia = np.concatenate([self.variancia, np.zeros(falta)])
+            self.dia = np.concatenate([self.dia, np.zeros(falta, dtype=np.int64)])
+            self.ativo = np.concatenate([self.ativo, np.zeros(falta, dtype=bool)])
+
+    def _decair(self, idx, ate):
+        g = ate - self.dia[idx]
+        bg = self.beta ** g
+        nivel = self.nivel[idx]
+        # g = 0 (produto já neste dia): bg = 1 e a variância não muda
+        self.variancia[idx] = bg * self.variancia[idx] + nivel * nivel * self.beta ** (g - 1) * (1 - bg)
+        self.nivel[idx] = nivel * bg
+        self.dia[idx] = ate
+
+    def aplicar(self, bloco):
+        np = self.np
+        dados = np.array(bloco, dtype=np.int64)
+        self._crescer(int(dados[:, 1].max()))
+
+        # Um trecho por dia: dentro dele cada produto aparece uma vez só
+        cortes = np.flatnonzero(np.diff(dados[:, 0])) + 1
+        for trecho in np.split(dados, cortes):
+            dia, idx, qtd = int(trecho[0, 0]), trecho[:, 1], trecho[:, 2]
+
+            novos = idx[~self.ativo[idx]]
+            self.dia[novos] = dia - 1
+            self.ativo[novos] = True
+
+            self._decair(idx, dia - 1)
+            erro = qtd - self.nivel[idx]
+            self.variancia[idx] = self.beta * self.variancia[idx] + self.alfa * erro * erro
+            self.nivel[idx] += self.alfa * erro
+            self.dia[idx] = dia
+
+    def resultado(self, ultimo, prazo, cobertura):
+        np = self.np
+        ids = np.flatnonzero(self.ativo)
+        self._decair(ids, ultimo)
+        nivel, variancia = self.nivel[ids], self.variancia[ids]
+        ponto = np.ceil(nivel * prazo + FATOR_SEGURANCA * np.sqrt(variancia * prazo) - FRACAO_IGNORADA).astype(np.int64)
+        alvo = ponto + np.ceil(nivel * cobertura - FRACAO_IGNORADA).astype(np.int64)
+        return zip(ids.tolist(), nivel.tolist(), variancia.tolist(), [ultimo] * len(ids), ponto.tolist(), alvo.tolist())
+
+def estado_previsao():
+
+    #(ate_dia, alfa, atualizado_em) da última execução, ou None se nunca rodou.
+
+    return conexao_leitura().execute("SELECT ate_dia, alfa, atualizado_em FROM execucao_previsao WHERE id = 1").fetchone()
+
+def _vendas_por_dia(conn, inicio, fim, tamanho):
+
+    #Blocos de (dia, produto_id, quantidade vendida no dia), em ordem de dia,
+    #das vendas com inicio <= data < fim (inicio None = desde o começo).
+
+    filtros, params = ["data < ?"], [fim]
+    if inicio:
+        filtros.append("data >= ?")
+        params.append(inicio)
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT {SQL_DIA.format("data")} AS dia, produto_id, SUM(quantidade)
+            FROM {fonte_historico(conn, "vendas")}
+            WHERE {" AND ".join(filtros)}
+            GROUP BY dia, produto_id
+            ORDER BY dia
+        """, params)
+        while True:
+            bloco = cursor.fetchmany(tamanho)
+            if not bloco:
+                break
+            yield bloco
+    finally:
+        cursor.close()
+
+@medir_operacao("atualizar_previsao")
+def atualizar_previsao(ate=None, refazer=False, aplicar=False, alfa=ALFA_DEMANDA, prazo=PRAZO_REPOSICAO,
+                       cobertura=DIAS_COBERTURA, tamanho=TAMANHO_BLOCO_PREVISAO, mostrar=True):
+
+    #Atualiza a previsão com as vendas dos dias ainda não lidos, até "ate"
+    #(AAAA-MM-DD, não incluso; padrão: hoje, então só dias completos).
+    #refazer=True (ou outro alfa) recomeça do início do histórico.
+    #aplicar=True grava o ponto de pedido como estoque_minimo de cada produto.
+    #Retorna {produtos, dias, linhas, segundos, motor}.
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    inicio_tempo = time.perf_counter()
+    ate = ate or date.today().isoformat()
+
+    conn = conexao_leitura()
+    anterior = estado_previsao()
+    if refazer or anterior is None or anterior[1] != alfa:
+        desde, estado, dias = None, [], None
+    else:
+        desde = anterior[0]
+        estado = conn.execute("SELECT produto_id, nivel, variancia, dia FROM demanda_produtos").fetchall()
+        # Data anterior à última execução: nada novo (o estado não volta no tempo)
+        ate = max(ate, desde)
+        dias = date.fromisoformat(ate).toordinal() - date.fromisoformat(desde).toordinal()
+
+    calculo = _EstadoNumpy(np, alfa, estado) if np is not None else _EstadoPython(alfa, estado)
+    linhas = 0
+    if dias != 0:
+        for bloco in _vendas_por_dia(conn, desde, ate, tamanho):
+            calculo.aplicar(bloco)
+            linhas += len(bloco)
+
+    # Sem dias novos, recalcula só os pontos (prazo e cobertura podem ter mudado)
+    ultimo = date.fromisoformat(ate).toordinal() - 1
+    resultado = list(calculo.resultado(ultimo, prazo, cobertura))
+    executar_escrita(_gravar_previsao, resultado, ate, alfa, desde is None, aplicar)
+
+    segundos = time.perf_counter() - inicio_tempo
+    motor = "numpy" if np is not None else "python"
+    if mostrar:
+        lidos = "todo o histórico" if desde is None else f"{dias} dia(s) novo(s)"
+        print(f"✔ Previsão de {len(resultado)} produto(s) ({lidos}, {linhas:,} produto-dia) em {segundos:.2f}s [{motor}]")
+        if aplicar:
+            print("✔ Ponto de pedido gravado como estoque mínimo.")
+
+    return {"produtos": len(resultado), "dias": dias, "linhas": linhas, "segundos": segundos, "motor": motor}
+
+def _gravar_previsao(conn, resultado, ate, alfa, completa, aplicar):
+    cursor = conn.cursor()
+    if completa:
+        cursor.execute("DELETE FROM demanda_produtos")
+    cursor.executemany("""
+        INSERT OR REPLACE INTO demanda_produtos (produto_id, nivel, variancia, dia, ponto_pedido, estoque_alvo)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, resultado)
+    cursor.execute("""
+        INSERT OR REPLACE INTO execucao_previsao (id, ate_dia, alfa, atualizado_em) VALUES (1, ?, ?, ?)
+    """, (ate, alfa, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+
+    if aplicar:
+        cursor.execute("""
+            UPDATE produtos SET estoque_minimo = d.ponto_pedido
+            FROM demanda_produtos d
+            WHERE d.produto_id = produtos.id AND produtos.estoque_minimo != d.ponto_pedido
+        """)
+
+def sugestoes_compra(limite=LIMITE_SUGESTOES):
+
+    #Produtos no ponto de pedido ou abaixo, com a compra sugerida, maiores primeiro:
+    #(id, nome, quantidade, demanda diária, ponto_pedido, comprar).
+
+    cursor = conexao_leitura().cursor()
+    cursor.execute("""
+        SELECT p.id, p.nome, p.quantidade, d.nivel, d.ponto_pedido, d.estoque_alvo - p.quantidade AS comprar
+        FROM demanda_produtos d
+        JOIN produtos p ON p.id = d.produto_id
+        WHERE p.quantidade <= d.ponto_pedido AND d.estoque_alvo > p.quantidade
+        ORDER BY comprar DESC, p.id
+        LIMIT ?
+    """, (limite,))
+    return cursor.fetchall()
+
+def relatorio_compras():
+
+    #Relatório do menu: atualiza a previsão (só os dias novos) e lista o que comprar.
+
+    atualizar_previsao()
+    linhas = sugestoes_compra()
+
+    if not linhas:
+        print("Nenhum produto no ponto de pedido.")
+        return
+
+    print("\n" + "-"*86)
+    print(f"{'ID':<6} | {'Produto':<30} | {'Estoque':>8} | {'Dem./dia':>8} | {'Ponto':>7} | {'Comprar':>8}")
+    print("-"*86)
+    for pid, nome, qtd, demanda, ponto, comprar in linhas:
+        print(f"{pid:<6} | {nome:<30.30} | {qtd:>8} | {demanda:>8.2f} | {ponto:>7} | {comprar:>8}")
+    print("-"*86)
@@ -0,0 +1,416 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+from datetime import datetime  # Para registrar data/hora das operações
+import re               # Separa as palavras da busca de produtos
+
+from . import usuarios
+from .banco import conexao, conexao_leitura
+from .catalogo import catalogo
+from .dinheiro import reais
+from .escritor import executar_escrita
+from .instrumentacao import medir_operacao, operacao
+from .terminal import pedir_centavos, pedir_float, pedir_int
+
+
+# ============================================================
+# INSERÇÃO DE PRODUTOS PADRÃO (EXECUTA APENAS NA PRIMEIRA VEZ)
+# ============================================================
+
+def inserir_dados_padrao():
+    conn = conexao()
+    cursor = conn.cursor()
+
+    # Verifica se já tem produtos cadastrados
+    cursor.execute("SELECT COUNT(*) FROM produtos")
+    if cursor.fetchone()[0] == 0:
+
+        # Lista de produtos iniciais (preço e custo em centavos)
+        produtos_padrao = [
+            ("Arroz 5kg", 2250, 1500, 20, 5.0, "Tio João"),
+            ("Feijão 1kg", 890, 500, 35, 1.0, "Kicaldo"),
+            ("Macarrão 500g", 450, 250, 40, 0.5, "Adria"),
+            ("Açúcar 1kg", 520, 300, 30, 1.0, "União"),
+            ("Óleo 900ml", 780, 520, 25, 0.9, "Soya"),
+            ("Café 500g", 1290, 800, 15, 0.5, "Pilão"),
+            ("Leite 1L", 410, 290, 50, 1.0, "Itambé"),
+            ("Farinha 1kg", 600, 380, 28, 1.0, "Dona Benta"),
+            ("Sal 1kg", 230, 100, 60, 1.0, "Cisne"),
+            ("Bolacha 350g", 380, 200, 22, 0.35, "Marilan"),
+        ]
+
+        # Inserção múltipla de vários produtos de uma só vez
+        cursor.executemany("""
+            INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, produtos_padrao)
+
+        # Estoque inicial também entra no livro de movimentações
+        cursor.execute("""
+            INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+            SELECT id, 'entrada', quantidade, ?, NULL FROM produtos WHERE quantidade > 0
+        """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),))
+
+        conn.commit()
+        print("10 produtos padrão inseridos!")
+
+
+# ============================================================
+#            BUSCA DE PRODUTOS (NOME / MARCA, FTS5)
+# ============================================================
+
+# Máximo de produtos mostrados numa busca
+LIMITE_BUSCA = 10
+
+@medir_operacao("buscar_produtos")
+def buscar_produtos(termo, limite=LIMITE_BUSCA):
+
+    #Busca por nome/marca usando o índice FTS5, ignorando acentos.
+    #As palavras completas precisam bater inteiras e a última é tratada como
+    #prefixo ("arroz tio j" acha "Arroz 5kg / Tio João"): prefixo em toda
+    #palavra obrigaria o FTS a juntar as listas de todos os termos parecidos.
+    #Retorna (id, nome, venda_centavos, quantidade, marca), no máximo "limite".
+
+    palavras = re.findall(r"\w+", termo)
+    if not palavras:
+        return []
+
+    consulta = " AND ".join([f'"{p}"' for p in palavras[:-1]] + [f'"{palavras[-1]}"*'])
+
+    cursor = conexao_leitura().cursor()
+
+    cursor.execute("""
+        SELECT p.id, p.nome, p.venda_centavos, p.quantidade, p.marca
+        FROM produtos_busca b
+        JOIN produtos p ON p.id = b.rowid
+        WHERE produtos_busca MATCH ?
+        LIMIT ?
+    """, (consulta, limite))
+    return cursor.fetchall()
+
+def escolher_produto(txt="Produto (ID ou busca por nome/marca): ", minimo=1):
+
+    #Pede um produto: número = ID; texto = busca e mostra os encontrados
+    #para o operador digitar o ID. Substitui listar o catálogo inteiro.
+
+    while True:
+        termo = input(txt).strip()
+
+        if termo.isdigit():
+            if int(termo) >= minimo:
+                return int(termo)
+            print(f"Digite um número >= {minimo}.")
+            continue
+
+        resultados = buscar_produtos(termo)
+
+        if not resultados:
+            print("Nenhum produto encontrado.")
+            continue
+
+        for p in resultados:
+            print(f"  {p[0]:<5} | {p[1]:<25} | {p[4] or '':<15} | R$ {reais(p[2]):.2f} | Qtd: {p[3]}")
+
+
+# ============================================================
+#         LISTAGENS (PRODUTOS, VENDAS, MOVIMENTAÇÕES)
+# ============================================================
+
+@medir_operacao("listar_produtos")
+def listar_produtos():
+
+    #Exibe tabela completa de produtos (do cache do catálogo: só vai ao
+    #banco se outro terminal tiver alterado algum produto).
+
+    lista = catalogo().todos()
+
+    if not lista:
+        print("Nenhum produto.")
+        return
+
+    print("\n" + "-"*98)
+    print(f"{'ID':<3} | {'Nome':<25} | {'Venda':<8} | {'Custo':<8} | {'Qtd':<5} | {'Peso':<5} | {'Marca':<15} | ALERTA")
+    print("-"*98)
+
+    for p in lista:
+        alerta = "ESTOQUE BAIXO!" if p.quantidade <= p.estoque_minimo else ""
+        print(f"{p.id:<3} | {p.nome:<25} | R${reais(p.venda_centavos):<7.2f} | R${reais(p.custo_centavos):<7.2f} | {p.quantidade:<5} | {p.peso:<5} | {p.marca:<15} | {alerta}")
+
+    print("-"*98)
+
+@medir_operacao("contar_estoque_baixo")
+def contar_estoque_baixo():
+
+    #Quantos produtos estão no estoque mínimo ou abaixo (só lê o índice parcial).
+
+    cursor = conexao_leitura().cursor()
+
+    cursor.execute("SELECT COUNT(*) FROM produtos WHERE quantidade <= estoque_minimo")
+    return cursor.fetchone()[0]
+
+@medir_operacao("listar_estoque_baixo")
+def produtos_estoque_baixo():
+
+    #Produtos em alerta, do menor estoque para o maior.
+
+    cursor = conexao_leitura().cursor()
+
+    cursor.execute("""
+        SELECT id, nome, quantidade, estoque_minimo, marca
+        FROM produtos WHERE quantidade <= estoque_minimo
+        ORDER BY quantidade
+    """)
+    return cursor.fetchall()
+
+def listar_estoque_baixo():
+
+    #Exibe só os produtos que precisam de reposição.
+
+    lista = produtos_estoque_baixo()
+
+    if not lista:
+        print("Nenhum produto com estoque baixo.")
+        return
+
+    print("\n" + "-"*70)
+    print(f"{'ID':<5} | {'Nome':<25} | {'Qtd':<5} | {'Mínimo':<6} | Marca")
+    print("-"*70)
+
+    for p in lista:
+        print(f"{p[0]:<5} | {p[1]:<25} | {p[2]:<5} | {p[3]:<6} | {p[4]}")
+
+    print("-"*70)
+
+
+# ============================================================
+#                       CRUD DE PRODUTOS
+# ============================================================
+
+def adicionar_produto():
+
+    #Cria um novo produto no sistema.
+
+    nome = input("Nome: ")
+    venda = pedir_centavos("Valor de venda: R$ ")
+    custo = pedir_centavos("Valor de custo: R$ ")
+    qtd = pedir_int("Quantidade inicial: ", 0)
+    peso = pedir_float("Peso (kg): ", 0)
+    marca = input("Marca: ")
+    minimo = pedir_int("Estoque mínimo (alerta): ", 0)
+
+    with operacao("adicionar_produto"):
+        executar_escrita(_inserir_produto, (nome, venda, custo, qtd, peso, marca, minimo), usuarios.current_user)
+    print("✔ Produto adicionado!")
+
+def _inserir_produto(conn, dados, usuario=None):
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO produtos (nome, venda_centavos, custo_centavos, quantidade, peso, marca, estoque_minimo)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, dados)
+
+    # Quantidade inicial: movimentação de entrada, para o livro fechar com o estoque
+    if dados[3] > 0:
+        cursor.execute("""
+            INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+            VALUES (?, 'entrada', ?, ?, ?)
+        """, (cursor.lastrowid, dados[3], datetime.now().strftime("%Y-%m-%d %H:%M:%S"), usuario))
+
+def excluir_produto():
+
+    #Remove produto do banco.
+
+    pid = escolher_produto("Produto a excluir (ID ou busca): ")
+    with operacao("excluir_produto"):
+        executar_escrita(_excluir_produto, pid)
+    print("✔ Produto excluído!")
+
+def _excluir_produto(conn, pid):
+    conn.execute("DELETE FROM produtos WHERE id=?", (pid,))
+
+def editar_produto():
+    
+    #Permite editar campos de um produto.
+
+    pid = escolher_produto("Produto (ID ou busca): ")
+
+    while True:
+        print("\nEditar:")
+        print("1 - Nome")
+        print("2 - Valor venda")
+        print("3 - Valor custo")
+        print("4 - Quantidade")
+        print("5 - Peso")
+        print("6 - Marca")
+        print("7 - Estoque mínimo")
+        print("0 - Voltar")
+
+        op = input("> ")
+
+        if op == "1":
+            coluna, novo = "nome", input("Novo nome: ")
+
+        elif op == "2":
+            coluna, novo = "venda_centavos", pedir_centavos("Novo valor de venda: R$ ")
+
+        elif op == "3":
+            coluna, novo = "custo_centavos", pedir_centavos("Novo valor de custo: R$ ")
+
+        elif op == "4":
+            coluna, novo = "quantidade", pedir_int("Nova quantidade: ", 0)
+
+        elif op == "5":
+            coluna, novo = "peso", pedir_float("Novo peso: ", 0)
+
+        elif op == "6":
+            coluna, novo = "marca", input("Nova marca: ")
+
+        elif op == "7":
+            coluna, novo = "estoque_minimo", pedir_int("Novo estoque mínimo: ", 0)
+
+        elif op == "0":
+            break
+
+        else:
+            print("Inválido!")
+            continue
+
+        try:
+            with operacao("editar_produto"):
+                executar_escrita(_atualizar_produto, pid, coluna, novo, usuarios.current_user)
+        except OperacaoInvalida as e:
+            print(e)
+            return
+        print("✔ Atualizado!")
+        break
+
+def _atualizar_produto(conn, pid, coluna, novo, usuario=None):
+    if coluna != "quantidade":
+        conn.execute(f"UPDATE produtos SET {coluna}=? WHERE id=?", (novo, pid))
+        return
+
+    # Quantidade digitada à mão (contagem física): a diferença vira uma
+    # movimentação 'ajuste' com sinal, e o livro continua fechando
+    cursor = conn.cursor()
+    cursor.execute("SELECT quantidade FROM produtos WHERE id=?", (pid,))
+    atual = cursor.fetchone()
+    if atual is None:
+        raise OperacaoInvalida("Produto não encontrado.")
+
+    cursor.execute("UPDATE produtos SET quantidade=? WHERE id=?", (novo, pid))
+    if novo != atual[0]:
+        cursor.execute("""
+            INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+            VALUES (?, 'ajuste', ?, ?, ?)
+        """, (pid, novo - atual[0], datetime.now().strftime("%Y-%m-%d %H:%M:%S"), usuario))
+
+
+# ============================================================
+#                   ENTRADA E SAÍDA DE ESTOQUE
+# ============================================================
+
+class OperacaoInvalida(Exception):
+
+    #Operação de estoque recusada (produto inexistente ou estoque insuficiente).
+    #Nada é gravado quando ela é levantada.
+
+    pass
+
+@medir_operacao("entrada_estoque")
+def registrar_entrada(pid, qtd, usuario=None):
+
+    #Soma "qtd" ao estoque do produto e registra a movimentação 'entrada'.
+
+    executar_escrita(_entrada, pid, qtd, usuario)
+
+def _entrada(conn, pid, qtd, usuario):
+    cursor = conn.cursor()
+    cursor.execute("UPDATE produtos SET quantidade = quantidade + ? WHERE id=?", (qtd, pid))
+
+    if cursor.rowcount == 0:
+        raise OperacaoInvalida("Produto não encontrado.")
+
+    cursor.execute("""
+        INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+        VALUES (?, 'entrada', ?, ?, ?)
+    """, (pid, qtd, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), usuario))
+
+@medir_operacao("saida_estoque")
+def registrar_saida(pid, qtd, usuario=None):
+
+    #Tira "qtd" do estoque do produto e registra a movimentação 'saida'.
+
+    executar_escrita(_saida, pid, qtd, usuario)
+
+def _saida(conn, pid, qtd, usuario):
+    cursor = conn.cursor()
+
+    # A condição no próprio UPDATE garante que duas saídas simultâneas nunca
+    # deixem o estoque negativo, sem SELECT antes
+    cursor.execute(
+        "UPDATE produtos SET quantidade = quantidade - ? WHERE id=? AND quantidade >= ?",
+        (qtd, pid, qtd),
+    )
+
+    if cursor.rowcount == 0:
+        cursor.execute("SELECT 1 FROM produtos WHERE id=?", (pid,))
+        if cursor.fetchone() is None:
+            raise OperacaoInvalida("Produto não encontrado.")
+        raise OperacaoInvalida("Estoque insuficiente.")
+
+    cursor.execute("""
+        INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+        VALUES (?, 'saida', ?, ?, ?)
+    """, (pid, qtd, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), usuario))
+
+def entrada_estoque():
+
+    #Adiciona quantidade ao estoque de um produto.
+    #Registra movimentação.
+
+    pid = escolher_produto("Produto (entrada) - ID ou busca: ")
+
+    p = catalogo().obter(pid)
+    if not p:
+        print("Produto não encontrado.")
+        return
+    print(f"{p.nome} - Estoque: {p.quantidade}")
+
+    qtd = pedir_int("Quantidade: ", 1)
+
+    usuario = usuarios.current_user
+
+    try:
+        registrar_entrada(pid, qtd, usuario)
+    except OperacaoInvalida as e:
+        print(e)
+        return
+
+    print(f"✔ Entrada registrada pelo usuário '{usuario}'.")
+
+
+def saida_estoque():
+
+    #Remove quantidade do estoque.
+    #Registra movimentação.
+
+    pid = escolher_produto("Produto (saída) - ID ou busca: ")
+
+    p = catalogo().obter(pid)
+    if not p:
+        print("Produto não encontrado.")
+        return
+    print(f"{p.nome} - Estoque: {p.quantidade}")
+
+    qtd = pedir_int("Quantidade: ", 1)
+
+    usuario = usuarios.current_user
+
+    try:
+        registrar_saida(pid, qtd, usuario)
+    except OperacaoInvalida as e:
+        print(e)
+        return
+
+    print(f"✔ Saída registrada pelo usuário '{usuario}'.")
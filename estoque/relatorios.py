@@ -0,0 +1,372 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import heapq                            # Top-N com heap de tamanho fixo
+from datetime import date, timedelta    # Meses inteiros dentro do período
+
+from .arquivamento import fonte_historico
+from .banco import conexao, conexao_leitura
+from .dinheiro import reais
+from .esquema import INICIO_PERIODO, SQL_RESUMO_FINANCEIRO, SQL_VENDAS_AGREGADAS
+from .historico import pedir_data
+from .instrumentacao import medir_operacao
+
+
+# ============================================================
+#                    RELATÓRIO FINANCEIRO
+# ============================================================
+
+@medir_operacao("relatorio_financeiro")
+def relatorio_financeiro():
+
+    #Calcula:
+    #total vendido
+    #custo total (pelo custo gravado em cada venda)
+    #lucro estimado
+    #
+    #Lê só a linha de resumo_financeiro, mantida pelo trigger de vendas.
+    #Os valores são centavos inteiros: o total é exato, sem arredondar.
+
+    cursor = conexao_leitura().cursor()
+
+    cursor.execute("SELECT total_centavos, custo_centavos FROM resumo_financeiro WHERE id = 1")
+    total, custo = cursor.fetchone() or (0, 0)
+
+    lucro = total - custo
+
+    print("\n--- RELATÓRIO FINANCEIRO ---")
+    print(f"Total vendido: R$ {reais(total):.2f}")
+    print(f"Custo: R$ {reais(custo):.2f}")
+    print(f"Lucro estimado: R$ {reais(lucro):.2f}")
+
+@medir_operacao("reconstruir_resumo_financeiro")
+def reconstruir_resumo_financeiro(corrigir=False):
+
+    #Recalcula o resumo do zero a partir de vendas (com as arquivadas) e compara com o gravado.
+    #Com corrigir=True grava os valores recalculados.
+    #Retorna um dicionário {campo: (gravado, recalculado)} só com as diferenças.
+
+    conn = conexao()
+    cursor = conn.cursor()
+
+    campos = ("num_vendas", "itens", "total_centavos", "custo_centavos")
+    colunas = ", ".join(campos)
+    vendas = fonte_historico(conn, "vendas")
+
+    # IMMEDIATE: nenhuma venda entra entre a leitura e a gravação
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(f"SELECT {colunas} FROM resumo_financeiro WHERE id = 1")
+        gravado = cursor.fetchone() or (0, 0, 0, 0)
+
+        cursor.execute(SQL_RESUMO_FINANCEIRO.format(vendas=vendas))
+        cursor.execute(f"SELECT {colunas} FROM resumo_financeiro WHERE id = 1")
+        recalculado = cursor.fetchone()
+
+        if corrigir:
+            conn.commit()
+        else:
+            conn.rollback()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {campo: (g, r) for campo, g, r in zip(campos, gravado, recalculado) if g != r}
+
+@medir_operacao("reconstruir_vendas_agregadas")
+def reconstruir_vendas_agregadas(corrigir=False):
+
+    #Recalcula vendas_agregadas do zero e conta as linhas que diferem das gravadas.
+    #Com corrigir=True substitui a tabela pelos valores recalculados.
+
+    conn = conexao()
+    cursor = conn.cursor()
+    vendas = fonte_historico(conn, "vendas")
+
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute("DROP TABLE IF EXISTS temp.agregados_recalculados")
+        cursor.execute("CREATE TEMP TABLE agregados_recalculados AS " + SQL_VENDAS_AGREGADAS.format(vendas=vendas))
+
+        # Centavos inteiros: a comparação é exata, linha a linha
+        comparar = """
+            SELECT periodo, inicio, produto_id, forma_pagamento, num_vendas, quantidade,
+                   receita_centavos, custo_centavos
+            FROM {}
+        """
+        gravada = comparar.format("vendas_agregadas")
+        recalculada = comparar.format("temp.agregados_recalculados")
+        cursor.execute(f"""
+            SELECT (SELECT COUNT(*) FROM ({gravada} EXCEPT {recalculada}))
+                 + (SELECT COUNT(*) FROM ({recalculada} EXCEPT {gravada}))
+        """)
+        divergentes = cursor.fetchone()[0]
+
+        if corrigir and divergentes:
+            cursor.execute("DELETE FROM vendas_agregadas")
+            cursor.execute("INSERT INTO vendas_agregadas SELECT * FROM temp.agregados_recalculados")
+
+        cursor.execute("DROP TABLE temp.agregados_recalculados")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return divergentes
+
+def verificar_resumos(corrigir=False):
+
+    #Comando "resumo": confere (e, se pedido, reconstrói) os totais mantidos por trigger.
+
+    ok = True
+    diferencas = reconstruir_resumo_financeiro(corrigir)
+
+    if diferencas:
+        ok = False
+        for campo, (gravado, recalculado) in diferencas.items():
+            print(f"  {campo}: gravado {gravado} | recalculado {recalculado}")
+    else:
+        print("✔ Resumo financeiro confere com as vendas.")
+
+    divergentes = reconstruir_vendas_agregadas(corrigir)
+
+    if divergentes:
+        ok = False
+        print(f"  vendas_agregadas: {divergentes} linha(s) divergente(s)")
+    else:
+        print("✔ Agregados por período conferem com as vendas.")
+
+    if not ok:
+        print("✔ Resumos reconstruídos." if corrigir else "Resumos divergentes (use --corrigir para reconstruir).")
+    return ok
+
+
+# ============================================================
+#          VENDAS POR PERÍODO (DIA / SEMANA / MÊS)
+# ============================================================
+
+@medir_operacao("vendas_por_periodo")
+def vendas_por_periodo(periodo, data_inicio=None, data_fim=None, agrupar=None):
+
+    #Lê os agregados prontos de vendas_agregadas (não toca na tabela vendas).
+    #periodo: 'dia', 'semana' ou 'mes'.
+    #agrupar: None (total do período), 'produto' ou 'forma_pagamento'.
+    #Retorna linhas (inicio, chave, num_vendas, quantidade, receita, custo),
+    #receita e custo em centavos;
+    #chave é o nome do produto / a forma de pagamento, ou None sem agrupamento.
+
+    cursor = conexao_leitura().cursor()
+
+    filtros, params = ["a.periodo = ?"], [periodo]
+    if data_inicio:
+        # Inclui o período que contém a data inicial
+        filtros.append("a.inicio >= " + INICIO_PERIODO[periodo].format("?"))
+        params.append(data_inicio)
+    if data_fim:
+        filtros.append("a.inicio <= ?")
+        params.append(data_fim)
+
+    if agrupar == "produto":
+        chave, juncao, grupo = "COALESCE(p.nome, a.produto_id)", "LEFT JOIN produtos p ON p.id = a.produto_id", ", a.produto_id"
+    elif agrupar == "forma_pagamento":
+        chave, juncao, grupo = "a.forma_pagamento", "", ", a.forma_pagamento"
+    else:
+        chave, juncao, grupo = "NULL", "", ""
+
+    cursor.execute(f"""
+        SELECT a.inicio, {chave}, SUM(a.num_vendas), SUM(a.quantidade), SUM(a.receita_centavos), SUM(a.custo_centavos)
+        FROM vendas_agregadas a {juncao}
+        WHERE {" AND ".join(filtros)}
+        GROUP BY a.inicio{grupo}
+        ORDER BY a.inicio, SUM(a.receita_centavos) DESC
+    """, params)
+    return cursor.fetchall()
+
+def relatorio_periodo():
+
+    #Relatório de receita, unidades e margem por dia, semana ou mês.
+
+    print("\nPeríodo: 1 - Dia | 2 - Semana | 3 - Mês")
+    periodo = {"1": "dia", "2": "semana", "3": "mes"}.get(input("> ").strip())
+    if not periodo:
+        print("Inválido!")
+        return
+
+    print("Agrupar por: 1 - Total | 2 - Produto | 3 - Forma de pagamento")
+    agrupar = {"1": None, "2": "produto", "3": "forma_pagamento"}.get(input("> ").strip(), None)
+
+    data_inicio = pedir_data("Data inicial (AAAA-MM-DD, Enter = todas): ")
+    data_fim = pedir_data("Data final (AAAA-MM-DD, Enter = todas): ")
+
+    linhas = vendas_por_periodo(periodo, data_inicio, data_fim, agrupar)
+
+    if not linhas:
+        print("Nenhuma venda no período.")
+        return
+
+    print("\n" + "-"*100)
+    print(f"{'Início':<10} | {'Grupo':<25} | {'Vendas':>7} | {'Unid.':>7} | {'Receita':>13} | {'Margem':>13} | {'%':>6}")
+    print("-"*100)
+
+    for inicio, chave, num, qtd, receita, custo in linhas:
+        margem = receita - custo
+        pct = margem / receita * 100 if receita else 0
+        print(f"{inicio:<10} | {str(chave or 'Total'):<25.25} | {num:>7} | {qtd:>7} | R${reais(receita):>11.2f} | R${reais(margem):>11.2f} | {pct:>5.1f}%")
+
+    print("-"*100)
+
+
+# ============================================================
+#        RANKING DE PRODUTOS E CURVA ABC (PARETO 80/15/5)
+# ============================================================
+#
+# Soma por produto a partir de vendas_agregadas, sem tocar em vendas: os
+# meses inteiros do período vêm das linhas 'mes' e só as pontas (meses
+# incompletos) das linhas 'dia'. Anos de histórico viram algumas dezenas de
+# linhas por produto. A classe ABC de cada produto é calculada no próprio
+# SQLite (soma acumulada da receita em ordem decrescente) e os N maiores por
+# receita, unidades e margem são escolhidos com heaps de N posições enquanto
+# as linhas chegam. A memória cresce com o número de produtos (o SQLite
+# ordena uma linha por produto para a soma acumulada), não com o de vendas;
+# em Python só os heaps ficam guardados.
+
+# Produtos em cada ranking
+TOP_RANKING = 10
+
+# Fração acumulada da receita até onde vai cada classe (o resto é C)
+CLASSES_ABC = (("A", 80), ("B", 95))
+
+CRITERIOS_RANKING = ("receita", "quantidade", "margem")
+
+def _partes_periodo(data_inicio=None, data_fim=None):
+
+    #Divide [data_inicio, data_fim] (fim inclusivo; None = sem limite) em
+    #intervalos [de, ate) de vendas_agregadas: (periodo, de, ate).
+    #Meses inteiros usam 'mes'; os dias antes e depois deles, 'dia'.
+
+    inicio = date.fromisoformat(data_inicio) if data_inicio else None
+    fim = date.fromisoformat(data_fim) + timedelta(days=1) if data_fim else None
+
+    # Primeiro mês inteiro e o início do mês seguinte ao último inteiro
+    mes_de = inicio if inicio is None or inicio.day == 1 else (inicio.replace(day=28) + timedelta(days=4)).replace(day=1)
+    mes_ate = fim if fim is None else fim.replace(day=1)
+
+    if mes_de is not None and mes_ate is not None and mes_de >= mes_ate:
+        return [("dia", inicio, fim)]
+
+    partes = [("mes", mes_de, mes_ate)]
+    if inicio is not None and inicio < mes_de:
+        partes.append(("dia", inicio, mes_de))
+    if fim is not None and mes_ate < fim:
+        partes.append(("dia", mes_ate, fim))
+    return partes
+
+@medir_operacao("ranking_produtos")
+def ranking_produtos(data_inicio=None, data_fim=None, n=TOP_RANKING):
+
+    #Top n produtos por receita, unidades e margem no período, e a curva ABC.
+    #Retorna {"rankings": {criterio: [(produto_id, nome, classe, vendas, quantidade,
+    #receita, custo)]}, "classes": {classe: [produtos, receita]}, "total": receita,
+    #"produtos": n_produtos} (valores em centavos).
+
+    cursor = conexao_leitura().cursor()
+
+    consultas, params = [], []
+    for periodo, de, ate in _partes_periodo(data_inicio, data_fim):
+        filtros = ["periodo = ?"]
+        params.append(periodo)
+        if de is not None:
+            filtros.append("inicio >= ?")
+            params.append(de.isoformat())
+        if ate is not None:
+            filtros.append("inicio < ?")
+            params.append(ate.isoformat())
+        consultas.append(f"""
+            SELECT produto_id, num_vendas, quantidade, receita_centavos, custo_centavos
+            FROM vendas_agregadas WHERE {" AND ".join(filtros)}
+        """)
+
+    # Classe pela receita acumulada dos produtos à frente (inteiros: sem arredondar)
+    (limite_a, pct_a), (limite_b, pct_b) = CLASSES_ABC
+    cursor.execute(f"""
+        WITH por_produto AS (
+            SELECT produto_id, SUM(num_vendas) AS vendas, SUM(quantidade) AS quantidade,
+                   SUM(receita_centavos) AS receita, SUM(custo_centavos) AS custo
+            FROM ({" UNION ALL ".join(consultas)})
+            GROUP BY produto_id
+        ), acumulado AS (
+            SELECT *, SUM(receita) OVER (ORDER BY receita DESC, produto_id ROWS UNBOUNDED PRECEDING) - receita AS antes,
+                   SUM(receita) OVER () AS total
+            FROM por_produto
+        )
+        SELECT produto_id, vendas, quantidade, receita, custo,
+               CASE WHEN receita > 0 AND antes * 100 < total * {pct_a} THEN '{limite_a}'
+                    WHEN receita > 0 AND antes * 100 < total * {pct_b} THEN '{limite_b}'
+                    ELSE 'C' END
+        FROM acumulado
+    """, params)
+
+    # Um heap mínimo de n posições por critério; desempate pelo menor ID
+    heaps = {criterio: [] for criterio in CRITERIOS_RANKING}
+    classes = {"A": [0, 0], "B": [0, 0], "C": [0, 0]}
+
+    for pid, vendas, quantidade, receita, custo, classe in cursor:
+        classes[classe][0] += 1
+        classes[classe][1] += receita
+        linha = (pid, classe, vendas, quantidade, receita, custo)
+        for criterio, valor in (("receita", receita), ("quantidade", quantidade), ("margem", receita - custo)):
+            heap = heaps[criterio]
+            if len(heap) < n:
+                heapq.heappush(heap, (valor, -pid, linha))
+            elif (valor, -pid) > heap[0][:2]:
+                heapq.heapreplace(heap, (valor, -pid, linha))
+
+    # Nome atual só dos produtos que entraram em algum ranking
+    ids = sorted({item[2][0] for heap in heaps.values() for item in heap})
+    nomes = {}
+    if ids:
+        marcadores = ", ".join("?" for _ in ids)
+        nomes = dict(cursor.execute(f"SELECT id, nome FROM produtos WHERE id IN ({marcadores})", ids))
+
+    rankings = {}
+    for criterio, heap in heaps.items():
+        rankings[criterio] = [(pid, nomes.get(pid) or f"Produto {pid}", *resto)
+                              for _, _, (pid, *resto) in sorted(heap, reverse=True)]
+
+    return {
+        "rankings": rankings,
+        "classes": classes,
+        "total": sum(receita for _, receita in classes.values()),
+        "produtos": sum(qtd for qtd, _ in classes.values()),
+    }
+
+def relatorio_ranking():
+
+    #Relatório do menu: curva ABC do período e os maiores por receita, unidades e margem.
+
+    data_inicio = pedir_data("Data inicial (AAAA-MM-DD, Enter = todas): ")
+    data_fim = pedir_data("Data final (AAAA-MM-DD, Enter = todas): ")
+
+    resultado = ranking_produtos(data_inicio, data_fim)
+
+    if not resultado["produtos"]:
+        print("Nenhuma venda no período.")
+        return
+
+    total = resultado["total"]
+    print(f"\n--- CURVA ABC ({resultado['produtos']} produtos, receita R$ {reais(total):.2f}) ---")
+    for classe, (qtd, receita) in resultado["classes"].items():
+        pct_produtos = qtd / resultado["produtos"] * 100
+        pct_receita = receita / total * 100 if total else 0
+        print(f"Classe {classe}: {qtd:>7} produtos ({pct_produtos:5.1f}%) | R$ {reais(receita):>14.2f} ({pct_receita:5.1f}% da receita)")
+
+    titulos = {"receita": "RECEITA", "quantidade": "UNIDADES", "margem": "MARGEM"}
+    for criterio, linhas in resultado["rankings"].items():
+        print(f"\n--- TOP {len(linhas)} POR {titulos[criterio]} ---")
+        print("-"*94)
+        print(f"{'#':>3} | {'ID':<6} | {'Produto':<28} | {'ABC':^3} | {'Unid.':>8} | {'Receita':>13} | {'Margem':>13}")
+        print("-"*94)
+        for posicao, (pid, nome, classe, _, qtd, receita, custo) in enumerate(linhas, 1):
+            print(f"{posicao:>3} | {pid:<6} | {nome:<28.28} | {classe:^3} | {qtd:>8} | R${reais(receita):>11.2f} | R${reais(receita - custo):>11.2f}")
+        print("-"*94)
@@ -0,0 +1,71 @@
+from .dinheiro import para_centavos
+
+
+# ============================================================
+# FUNÇÕES UTILITÁRIAS DE INPUT (GARANTEM QUE VALORES SEJAM NÚMEROS)
+# ============================================================
+
+def converter_int(txt, minimo=None):
+
+    #Converte texto em inteiro. Levanta ValueError com a mensagem para o usuário
+    #se não for número ou se for menor que "minimo".
+
+    try:
+        v = int(str(txt).strip())
+    except ValueError:
+        raise ValueError("Valor inválido.") from None
+    if minimo is not None and v < minimo:
+        raise ValueError(f"Digite um número >= {minimo}.")
+    return v
+
+def converter_float(txt, minimo=None):
+
+    #Igual ao converter_int, mas para números com decimal.
+    #Aceita vírgula, substitui por ponto.
+
+    try:
+        v = float(str(txt).strip().replace(",", "."))
+    except ValueError:
+        raise ValueError("Valor inválido.") from None
+    if minimo is not None and v < minimo:
+        raise ValueError(f"Digite um número >= {minimo}.")
+    return v
+
+def converter_centavos(txt, minimo=None):
+
+    #Valor em reais digitado ("9,90") -> centavos (990), sem passar por float.
+    #"minimo" também em centavos.
+
+    v = para_centavos(txt)
+    if minimo is not None and v < minimo:
+        raise ValueError(f"Digite um valor >= {minimo / 100:.2f}.")
+    return v
+
+def pedir_int(txt, minimo=None):
+
+    #Lê um número inteiro do usuário e valida.
+    while True:
+        try:
+            return converter_int(input(txt), minimo)
+        except ValueError as e:
+            print(e)
+
+def pedir_float(txt, minimo=None):
+
+    #Igual ao pedir_int, mas para números com decimal.
+
+    while True:
+        try:
+            return converter_float(input(txt), minimo)
+        except ValueError as e:
+            print(e)
+
+def pedir_centavos(txt, minimo=None):
+
+    #Lê um valor em reais e devolve em centavos.
+
+    while True:
+        try:
+            return converter_centavos(input(txt), minimo)
+        except ValueError as e:
+            print(e)
@@ -0,0 +1,91 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+import sqlite3          # IntegrityError no cadastro de username repetido
+from datetime import datetime  # Data de criação do usuário
+import hashlib          # Usado para criptografar senhas
+
+from .banco import conexao_leitura
+from .escritor import executar_escrita
+from .instrumentacao import medir_operacao
+
+
+# ============================================================
+#                  SISTEMA DE SENHAS E LOGIN
+# ============================================================
+
+def pedir_senha(prompt="Senha: "):
+
+    #Pede senha
+
+    return input(prompt)
+
+def hash_password(password: str) -> str:
+
+    #Converte senha original em hash
+
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+@medir_operacao("criar_usuario")
+def criar_usuario(username: str, password: str) -> bool:
+
+    #Insere usuário no banco com senha criptografada.
+    #Retorna False se username já existir.
+
+    try:
+        ph = hash_password(password)
+        executar_escrita(_inserir_usuario, username, ph, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+def _inserir_usuario(conn, username, password_hash, criado):
+    conn.execute(
+        "INSERT INTO usuarios (username, password_hash, created_at) VALUES (?, ?, ?)",
+        (username, password_hash, criado)
+    )
+
+@medir_operacao("validar_login")
+def validar_login(username: str, password: str) -> bool:
+
+    #Verifica usuário e senha.
+
+    cursor = conexao_leitura().cursor()
+
+    ph = hash_password(password)
+    cursor.execute("SELECT password_hash FROM usuarios WHERE username=?", (username,))
+    row = cursor.fetchone()
+
+    if not row:
+        return False
+
+    return ph == row[0]
+
+def existe_usuario(username: str) -> bool:
+
+    #Retorna True se o usuário já existir.
+
+    cursor = conexao_leitura().cursor()
+
+    cursor.execute("SELECT 1 FROM usuarios WHERE username=?", (username,))
+    return cursor.fetchone() is not None
+
+
+# ============================================================
+#                      USUÁRIO LOGADO
+# ============================================================
+
+current_user = None
+
+def prompt_usuario_default(msg="Usuário (opcional): "):
+
+    #O usuário estiver logado, usado como padrão.
+
+    global current_user
+    if current_user:
+        txt = input(f"{msg}[{current_user}] (Enter para usar): ").strip()
+        return current_user if txt == "" else txt
+    else:
+        txt = input(msg).strip()
+        return txt or None
@@ -0,0 +1,172 @@
+# ============================================================
+#                           IMPORTAÇÕES
+# ============================================================
+
+from datetime import datetime  # Data/hora da venda
+
+from . import usuarios
+from .catalogo import catalogo
+from .dinheiro import reais
+from .escritor import executar_escrita
+from .esquema import CONSUMIDOR_NAO_INFORMADO
+from .instrumentacao import medir_operacao
+from .produtos import OperacaoInvalida, escolher_produto
+from .terminal import pedir_int
+
+
+# ============================================================
+#                      REGISTRO DE VENDAS
+# ============================================================
+
+class VendaInvalida(OperacaoInvalida):
+
+    #Venda recusada (produto inexistente, quantidade inválida ou estoque insuficiente).
+    #Nada é gravado quando ela é levantada.
+
+    pass
+
+@medir_operacao("registrar_venda")
+def vender_itens(itens, forma, consumidor, usuario=None):
+
+    #Registra uma venda com vários itens (carrinho) numa única transação:
+    #itens = [(produto_id, quantidade), ...]
+    #
+    #Baixa o estoque com UPDATE condicional (quantidade >= pedida) dentro de
+    #BEGIN IMMEDIATE, que já devolve nome e preços, e grava vendas e
+    #movimentações com executemany, num único commit (ou no commit do grupo,
+    #com o escritor ligado).
+    #Tudo ou nada: se algum item for inválido, levanta VendaInvalida e não grava nada.
+    #consumidor: nome de um cliente cadastrado (a venda fica ligada a ele) ou
+    #texto livre; usuario: quem vendeu, gravado nas movimentações.
+    #Retorna o valor total da venda, em centavos.
+
+    # Soma itens repetidos do mesmo produto
+    carrinho = {}
+    for pid, qtd in itens:
+        if qtd < 1:
+            raise VendaInvalida(f"Quantidade inválida para o produto {pid}.")
+        carrinho[pid] = carrinho.get(pid, 0) + qtd
+
+    if not carrinho:
+        raise VendaInvalida("Carrinho vazio.")
+
+    return executar_escrita(_vender, carrinho, forma, consumidor, usuario)
+
+def id_forma_pagamento(cursor, forma):
+
+    #Id da forma de pagamento no dicionário formas_pagamento (cria se for nova).
+
+    cursor.execute("SELECT id FROM formas_pagamento WHERE nome = ?", (forma,))
+    linha = cursor.fetchone()
+    if linha is None:
+        cursor.execute("INSERT INTO formas_pagamento (nome) VALUES (?) RETURNING id", (forma,))
+        linha = cursor.fetchone()
+    return linha[0]
+
+def identificar_consumidor(cursor, consumidor):
+
+    #(cliente_id, texto avulso) gravados na venda: o cliente cadastrado com
+    #esse nome, senão o próprio texto; "não informado" vira (None, None).
+
+    if not consumidor or consumidor == CONSUMIDOR_NAO_INFORMADO:
+        return None, None
+    cursor.execute("SELECT MIN(id) FROM clientes WHERE nome = ?", (consumidor,))
+    cliente = cursor.fetchone()[0]
+    return cliente, None if cliente is not None else consumidor
+
+def _vender(conn, carrinho, forma, consumidor, usuario):
+    cursor = conn.cursor()
+    data = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    vendas = []
+
+    # Baixa condicional: o item sem estoque suficiente não é alterado, e o
+    # estoque nunca fica negativo mesmo com outro terminal vendendo o mesmo
+    # produto. O RETURNING traz nome e preços da própria linha atualizada,
+    # sem um SELECT antes; se um item falhar, a transação desfaz o resto.
+    for pid, qtd in carrinho.items():
+        cursor.execute("""
+            UPDATE produtos SET quantidade = quantidade - ?
+            WHERE id=? AND quantidade >= ?
+            RETURNING nome, venda_centavos, custo_centavos
+        """, (qtd, pid, qtd))
+        linha = cursor.fetchone()
+
+        if linha is None:
+            cursor.execute("SELECT nome, quantidade FROM produtos WHERE id=?", (pid,))
+            atual = cursor.fetchone()
+            if atual is None:
+                raise VendaInvalida(f"Produto {pid} não encontrado.")
+            raise VendaInvalida(f"Estoque insuficiente para {atual[0]} (disponível: {atual[1]}).")
+
+        nome, valor, custo = linha
+        vendas.append((pid, nome, qtd, data, valor, valor * qtd, custo))
+
+    # Forma e consumidor viram ids (uma vez por venda, não por item)
+    forma_id = id_forma_pagamento(cursor, forma)
+    cliente_id, avulso = identificar_consumidor(cursor, consumidor)
+
+    cursor.executemany("""
+        INSERT INTO vendas_compactas (produto_id, nome_produto, quantidade, data, unitario_centavos, total_centavos,
+                                      custo_centavos, forma_id, cliente_id, consumidor)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(*v, forma_id, cliente_id, avulso) for v in vendas])
+
+    cursor.executemany("""
+        INSERT INTO movimentacoes (produto_id, tipo, quantidade, data, usuario)
+        VALUES (?, 'saida - venda', ?, ?, ?)
+    """, [(pid, qtd, data, usuario) for pid, qtd in carrinho.items()])
+
+    return sum(v[5] for v in vendas)
+
+def registrar_venda():
+
+    #Executa uma venda real (um ou mais produtos no carrinho):
+    #reduz estoque
+    #grava venda
+    #grava movimentação "saida | venda"
+
+    carrinho = {}
+
+    while True:
+        pid = escolher_produto("Produto - ID ou busca (0 = finalizar): ", 0)
+
+        if pid == 0:
+            break
+
+        p = catalogo().obter(pid)
+
+        if not p:
+            print("Produto não encontrado.")
+            continue
+
+        nome, valor = p.nome, p.venda_centavos
+        disponivel = p.quantidade - carrinho.get(pid, 0)
+
+        print(f"{nome} - Estoque: {disponivel}, Valor: R$ {reais(valor):.2f}")
+
+        qtd = pedir_int("Quantidade vendida: ", 1)
+
+        if qtd > disponivel:
+            print("Estoque insuficiente.")
+            continue
+
+        carrinho[pid] = carrinho.get(pid, 0) + qtd
+        print(f"✔ {qtd} x {nome} no carrinho ({len(carrinho)} produto(s)).")
+
+    if not carrinho:
+        print("Venda cancelada.")
+        return
+
+    forma = input("Forma de pagamento: ")
+    consumidor = input("Nome do cliente/consumidor: ").strip()
+
+    if consumidor == "":
+        consumidor = CONSUMIDOR_NAO_INFORMADO
+
+    try:
+        total = vender_itens(carrinho.items(), forma, consumidor, usuarios.current_user)
+    except VendaInvalida as e:
+        print(f"Venda não registrada: {e}")
+        return
+
+    print(f"✔ Venda registrada! Total: R$ {reais(total):.2f}")